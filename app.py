@@ -1,34 +1,40 @@
 from flask import Flask, jsonify, send_from_directory
-import mysql.connector
 import os
+from datetime import date
+from decimal import Decimal
+
+from storage import get_storage
 
 project_dir = os.path.dirname(os.path.abspath(__file__))
 app = Flask(__name__, static_url_path='', static_folder=os.path.join(project_dir, 'static'))
 
 # -------------------- DB Config --------------------
-DB_HOST = os.getenv("DB_HOST", "127.0.0.1")
-DB_PORT = int(os.getenv("DB_PORT", 3306))
-DB_USER = os.getenv("DB_USER", "phpmyadmin")
-DB_PASS = os.getenv("DB_PASS", "root")
-DB_NAME = os.getenv("DB_NAME", "oilwell_pdf_extraction")
+# DB_BACKEND=mysql (DB_HOST/DB_PORT/DB_USER/DB_PASS/DB_NAME) or sqlite (SQLITE_PATH)
+storage = get_storage()
+
+def to_json(v):
+    # typed columns: DECIMAL -> number, DATE -> YYYY-MM-DD
+    if isinstance(v, Decimal):
+        return float(v)
+    if isinstance(v, date):
+        return v.isoformat()
+    return v
 
 @app.route("/wells")
 def wells():
-    conn = mysql.connector.connect(
-        host=DB_HOST, user=DB_USER, password=DB_PASS, database=DB_NAME
-    )
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
-        SELECT wi.*, ws.*
-        FROM well_info wi
-        LEFT JOIN well_stimulation ws ON wi.pdf_name = ws.pdf_name
-        WHERE 
-            wi.latitude IS NOT NULL
-            AND wi.longitude IS NOT NULL
-    """)
-    rows = cur.fetchall()
-    conn.close()
-    return jsonify(rows)
+    conn = storage.connect(init=False)
+    try:
+        rows = storage.query(conn, """
+            SELECT wi.*, ws.*
+            FROM well_info wi
+            LEFT JOIN well_stimulation ws ON wi.pdf_name = ws.pdf_name
+            WHERE
+                wi.latitude IS NOT NULL
+                AND wi.longitude IS NOT NULL
+        """)
+    finally:
+        conn.close()
+    return jsonify([{k: to_json(v) for k, v in r.items()} for r in rows])
 
 @app.route('/')
 def home():
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Offline benchmark for the parsing half of pdf_extraction.py.
+
+Generates a synthetic well-file corpus (header blocks, stimulation tables in
+both the tabular and the label/next-line layout, OCR-style noise, filler
+pages), then times parse_header, parse_stimulation, dms_to_decimal and
+normalize_api, plus every individual header/stimulation field. Nothing is
+read from disk except the optional baseline file.
+
+Usage:
+  python bench_parsing.py                       # run and compare to baseline
+  python bench_parsing.py --docs 500 --pages 120
+  python bench_parsing.py --save-baseline       # store this run as the baseline
+  python bench_parsing.py --threshold 0.2       # fail if docs/s drops >20%
+"""
+
+import sys, json, time, random, argparse
+from pathlib import Path
+from typing import List, Dict, Callable
+
+import pdf_extraction as pe
+
+DEFAULT_BASELINE = Path(__file__).with_name("bench_baseline.json")
+
+OPERATORS  = ["ST MARY LAND & EXPLORATION COMPANY", "RIM OPERATING, INC.", "CONTINENTAL RESOURCES, INC.",
+              "WHITING OIL AND GAS CORPORATION", "OASIS PETROLEUM NORTH AMERICA LLC"]
+FORMATIONS = ["Bakken", "Three Forks", "Madison", "Red River", "Middle Bakken"]
+TREATMENTS = ["Sand Frac", "Acid", "Frac", "Slickwater Frac", "Hybrid"]
+UNITS      = ["Barrels", "Gallons", "BBLS"]
+FILLER     = ("the well was drilled to total depth casing set cement returns to surface pressure test "
+              "okay bop tested rig released operator notes daily report mud weight bit trip").split()
+
+# OCR confusions applied to noisy documents
+OCR_SWAPS = {"0": "O", "O": "0", "1": "l", "l": "1", "5": "S", "S": "5", "8": "B", ":": ";", "'": "`"}
+
+
+# ============================== Corpus ==============================
+
+def _dms(rng: random.Random, deg_lo: int, deg_hi: int, hemi: str) -> str:
+    return f"{rng.randint(deg_lo, deg_hi)}° {rng.randint(0, 59)}' {rng.uniform(0, 59.99):.2f}\" {hemi}"
+
+
+def _filler_lines(rng: random.Random, n: int) -> List[str]:
+    return [" ".join(rng.choice(FILLER) for _ in range(rng.randint(6, 14))) for _ in range(n)]
+
+
+def header_page(rng: random.Random) -> str:
+    api = f"33-{rng.randint(1, 105):03d}-{rng.randint(0, 99999):05d}"
+    if rng.random() < 0.3:
+        api = api.replace("-", "")
+    lines = [
+        f"Well Operator: {rng.choice(OPERATORS)}",
+        f"Well Name: {rng.choice(['BASIC GAME AND FISH', 'CORPS OF ENGINEERS', 'LEWIS FEDERAL'])} {rng.randint(1, 44)}-{rng.randint(1, 36)}",
+        f"API #: {api}",
+        f"Enseco Job#: S{rng.randint(1000, 9999)}",
+        f"Job Type: {rng.choice(['MWD', 'Gyro', 'Survey'])}",
+        f"County, State: {rng.choice(['MCKENZIE', 'WILLIAMS', 'MOUNTRAIL'])} County, ND",
+        f"Well Surface Hole Location (SHL): {rng.randint(100, 2500)}' FNL & {rng.randint(100, 2500)}' FWL",
+        f"Latitude: {_dms(rng, 47, 48, 'N') if rng.random() < 0.7 else f'{rng.uniform(47, 49):.5f}'}",
+        f"Longitude: {_dms(rng, 102, 104, 'W') if rng.random() < 0.7 else f'{-rng.uniform(102, 104):.5f}'}",
+        f"Datum: {rng.choice(['NAD83', 'NAD27', 'WGS84'])}",
+    ]
+    rng.shuffle(lines)
+    return "\n".join(_filler_lines(rng, 5) + lines + _filler_lines(rng, 10))
+
+
+def stim_values(rng: random.Random) -> Dict[str, str]:
+    top = rng.randint(9000, 11500)
+    return {
+        "date": f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/{rng.randint(2008, 2020)}",
+        "formation": rng.choice(FORMATIONS),
+        "top": str(top), "bottom": str(top + rng.randint(5000, 11000)), "stages": str(rng.randint(10, 60)),
+        "volume": f"{rng.randint(10000, 400000):,}", "units": rng.choice(UNITS),
+        "treatment": rng.choice(TREATMENTS), "acid": str(rng.randint(0, 28)),
+        "lbs": f"{rng.randint(500000, 9000000):,}", "psi": str(rng.randint(5000, 10000)),
+        "rate": f"{rng.uniform(20, 90):.1f}",
+    }
+
+
+def stim_page_tabular(rng: random.Random) -> str:
+    v = stim_values(rng)
+    return "\n".join(_filler_lines(rng, 8) + [
+        "Date Stimulated  Stimulated Formation  Top (Ft)  Bottom (Ft)  Stimulation Stages  Volume  Volume Units",
+        f"{v['date']}  {v['formation']}  {v['top']}  {v['bottom']}  {v['stages']}  {v['volume']}  {v['units']}",
+        f"Type Treatment  {v['treatment']}",
+        f"Acid %  {v['acid']}",
+        f"Lbs Proppant  {v['lbs']}",
+        f"Maximum Treatment Pressure (PSI)  {v['psi']}",
+        f"Maximum Treatment Rate (BBLS/Min)  {v['rate']}",
+        "Details",
+        f"{rng.randint(20, 100)} mesh {rng.randint(20, 40)}/{rng.randint(40, 70)} white sand",
+    ] + _filler_lines(rng, 8))
+
+
+def stim_page_nextline(rng: random.Random) -> str:
+    v = stim_values(rng)
+    pairs = [
+        ("Date Stimulated", v["date"]), ("Stimulated Formation", v["formation"]),
+        ("Top (Ft)", v["top"]), ("Bottom (Ft)", v["bottom"]), ("Stimulation Stages", v["stages"]),
+        ("Volume", v["volume"]), ("Volume Units", v["units"]), ("Type Treatment", v["treatment"]),
+        ("Acid %", v["acid"]), ("Lbs Proppant", v["lbs"]),
+        ("Maximum Treatment Pressure (PSI)", v["psi"]), ("Maximum Treatment Rate (BBLS/Min)", v["rate"]),
+        ("Details", f"{rng.randint(20, 100)} mesh sand"),
+    ]
+    lines = [x for pair in pairs for x in pair]
+    return "\n".join(_filler_lines(rng, 8) + lines + _filler_lines(rng, 8))
+
+
+def ocr_noise(rng: random.Random, text: str, rate: float = 0.02) -> str:
+    out = []
+    for ch in text:
+        r = rng.random()
+        if r < rate and ch in OCR_SWAPS:
+            out.append(OCR_SWAPS[ch])
+        elif r < rate * 1.5:
+            out.append(ch + " ")
+        elif r < rate * 1.8:
+            continue
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def make_document(rng: random.Random, n_pages: int) -> List[str]:
+    pages = [header_page(rng), "\n".join(_filler_lines(rng, 40))]
+    stim_at = rng.randint(2, max(2, n_pages - 1))
+    for i in range(2, n_pages):
+        if i == stim_at:
+            pages.append(stim_page_tabular(rng) if rng.random() < 0.5 else stim_page_nextline(rng))
+        else:
+            pages.append("\n".join(_filler_lines(rng, 40)))
+    if rng.random() < 0.3:
+        pages = [ocr_noise(rng, p) for p in pages]
+    return pages
+
+
+def make_corpus(n_docs: int, n_pages: int, seed: int) -> List[List[str]]:
+    rng = random.Random(seed)
+    return [make_document(rng, rng.randint(max(3, n_pages // 2), n_pages)) for _ in range(n_docs)]
+
+
+# ============================== Timing ==============================
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    """Best-of-`repeat` wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+HEADER_FIELDS = {
+    "operator": pe.RX_OPERATOR, "well_name": pe.RX_WELLNAME, "api": pe.RX_API, "enseco_job": pe.RX_ENSECO,
+    "job_type": pe.RX_JOBTYPE, "county_state": pe.RX_COUNTY_STATE, "shl": pe.RX_SHL,
+    "latitude": pe.RX_LAT, "longitude": pe.RX_LON, "datum": pe.RX_DATUM,
+}
+
+
+def run_bench(corpus: List[List[str]], repeat: int) -> Dict[str, object]:
+    n = len(corpus)
+    res: Dict[str, object] = {"docs": n, "pages": sum(len(d) for d in corpus)}
+
+    def parse_all():
+        for i, pages in enumerate(corpus):
+            pe.parse_header(pages, f"W{i}.pdf")
+            pe.parse_stimulation(pages, f"W{i}.pdf")
+
+    total = _time(parse_all, repeat)
+    res["docs_per_sec"] = n / total
+    res["parse_header_ms"] = _time(lambda: [pe.parse_header(p, "x") for p in corpus], repeat) / n * 1e3
+    res["parse_stimulation_ms"] = _time(lambda: [pe.parse_stimulation(p, "x") for p in corpus], repeat) / n * 1e3
+
+    # scalar helpers on values pulled out of the corpus
+    lats = [pe.first_or_none(pe.RX_LAT, "\n".join(p[:2])) for p in corpus]
+    apis = [pe.first_or_none(pe.RX_API, "\n".join(p[:2])) for p in corpus]
+    lats = [x for x in lats if x] or ["48° 6' 0.00\" N"]
+    apis = [x for x in apis if x] or ["33-053-02102"]
+    k = max(1, 20000 // len(lats))
+    res["dms_to_decimal_us"] = _time(lambda: [pe.dms_to_decimal(x) for _ in range(k) for x in lats], repeat) / (k * len(lats)) * 1e6
+    k = max(1, 20000 // len(apis))
+    res["normalize_api_us"] = _time(lambda: [pe.normalize_api(x) for _ in range(k) for x in apis], repeat) / (k * len(apis)) * 1e6
+
+    # per-field: header regexes over the first two pages
+    head_texts = ["\n".join(p[:2]) for p in corpus]
+    fields: Dict[str, float] = {}
+    for name, rx in HEADER_FIELDS.items():
+        fields[f"header.{name}"] = _time(lambda rx=rx: [pe.first_or_none(rx, t) for t in head_texts], repeat) / n * 1e6
+
+    # per-field: stimulation label scan once, then each field's resolver
+    stim_texts = []
+    for p in corpus:
+        later = "\n".join(p[2:]) if len(p) > 2 else ""
+        stim_texts.append(later if later.strip() else "\n".join(p))
+    fields["stim.scan"] = _time(lambda: [pe.LabelScan(pe.PageText(t)) for t in stim_texts], repeat) / n * 1e6
+    scans = [pe.LabelScan(pe.PageText(t)) for t in stim_texts]
+    for attr, key, fallback, lead, cleaner in pe.STIM_FIELDS:
+        fields[f"stim.{attr}"] = _time(
+            lambda a=(key, fallback, lead, cleaner): [pe.resolve_field(s, *a) for s in scans], repeat) / n * 1e6
+    res["fields_us"] = fields
+    return res
+
+
+def print_report(res: Dict[str, object], baseline: Dict[str, object] = None) -> None:
+    print(f"[BENCH] {res['docs']} docs / {res['pages']} pages")
+    print(f"  docs/sec:              {res['docs_per_sec']:10.1f}"
+          + (f"   (baseline {baseline['docs_per_sec']:.1f})" if baseline else ""))
+    print(f"  parse_header:          {res['parse_header_ms']:10.3f} ms/doc")
+    print(f"  parse_stimulation:     {res['parse_stimulation_ms']:10.3f} ms/doc")
+    print(f"  dms_to_decimal:        {res['dms_to_decimal_us']:10.3f} us/call")
+    print(f"  normalize_api:         {res['normalize_api_us']:10.3f} us/call")
+    print("  per field (us/doc):")
+    for name, us in sorted(res["fields_us"].items(), key=lambda kv: -kv[1]):
+        print(f"    {name:36s} {us:10.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser("Benchmark pdf_extraction parsing on a synthetic corpus")
+    ap.add_argument("--docs", type=int, default=200, help="Documents in the synthetic corpus")
+    ap.add_argument("--pages", type=int, default=80, help="Max pages per document")
+    ap.add_argument("--seed", type=int, default=560)
+    ap.add_argument("--repeat", type=int, default=3, help="Timing repeats (best-of)")
+    ap.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE))
+    ap.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed docs/sec drop vs baseline (0.25 = 25%%)")
+    ap.add_argument("--json", action="store_true", help="Print the raw result as JSON")
+    args = ap.parse_args()
+
+    corpus = make_corpus(args.docs, args.pages, args.seed)
+    res = run_bench(corpus, args.repeat)
+
+    base_path = Path(args.baseline)
+    baseline = None
+    if base_path.exists() and not args.save_baseline:
+        baseline = json.loads(base_path.read_text(encoding="utf-8"))
+
+    if args.json:
+        print(json.dumps(res, indent=2))
+    else:
+        print_report(res, baseline)
+
+    if args.save_baseline:
+        base_path.write_text(json.dumps(res, indent=2) + "\n", encoding="utf-8")
+        print(f"[OK] baseline saved -> {base_path}")
+        return
+
+    if baseline is None:
+        print("[INFO] no baseline; run with --save-baseline to create one")
+        return
+    floor = baseline["docs_per_sec"] * (1.0 - args.threshold)
+    if res["docs_per_sec"] < floor:
+        print(f"[FAIL] docs/sec {res['docs_per_sec']:.1f} < {floor:.1f} "
+              f"({args.threshold:.0%} below baseline {baseline['docs_per_sec']:.1f})", file=sys.stderr)
+        sys.exit(1)
+    print(f"[OK] within {args.threshold:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Offline benchmark / check for web_scraping.py against scrape_fixture.py.
+
+Starts the fixture site on a free local port, scrapes a synthetic well list
+with each fetch mode (plain HTTP, HTTP with browser fallback, browser only)
+and reports wells/min plus every row that differs from the fixture's
+expected output. Exits non-zero on any mismatch. The browser modes need
+Playwright's Chromium (`playwright install chromium`).
+
+Usage:
+  python bench_scraping.py                        # 60 wells, all modes
+  python bench_scraping.py --wells 200 --modes http,auto --delay 30
+"""
+
+import sys, time, asyncio, argparse
+from typing import List, Tuple
+
+import web_scraping as ws
+from scrape_fixture import FixtureServer, expected_row, needs_browser
+
+
+def make_wells(n: int) -> List[Tuple[str, str]]:
+    return [(f"FIXTURE {i // 7 + 1}-{i % 7 + 1}H", f"33-053-{i:05d}") for i in range(n)]
+
+
+def check(df, wells, mode: str) -> List[str]:
+    errors = []
+    for (name, api), row in zip(wells, df.to_dict("records")):
+        want = expected_row(name, api)
+        if mode == "http" and needs_browser(api):       # JavaScript-rendered: out of reach without a browser
+            want = ws.blank_row(name, api)
+        diff = {k: (row.get(k), v) for k, v in want.items() if row.get(k) != v}
+        if diff:
+            errors.append(f"{api}: " + ", ".join(f"{k} got {g!r} want {w!r}" for k, (g, w) in diff.items()))
+    return errors
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark web_scraping fetch modes against a local fixture site")
+    ap.add_argument("--wells", type=int, default=60, help="synthetic wells to scrape (default 60)")
+    ap.add_argument("--modes", default="http,auto,browser", help=f"comma list of {','.join(ws.FETCH_MODES)}")
+    ap.add_argument("--concurrency", type=int, default=ws.CONCURRENCY)
+    ap.add_argument("--delay", type=float, default=20.0, help="fixture latency per response in ms (default 20)")
+    args = ap.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    bad = [m for m in modes if m not in ws.FETCH_MODES]
+    if bad:
+        ap.error(f"unknown mode(s): {', '.join(bad)}")
+
+    wells = make_wells(args.wells)
+    failed = False
+    with FixtureServer(delay_ms=args.delay) as srv:
+        print(f"[FIXTURE] {srv.base_url}, {len(wells)} wells, {args.delay:.0f} ms per response")
+        for mode in modes:
+            print(f"\n=== fetch={mode} ===")
+            t0 = time.perf_counter()
+            try:
+                df = asyncio.run(ws.run_to_dataframe(wells, concurrency=args.concurrency, rate=0, retries=0,
+                                                     fetch=mode, base_url=srv.base_url))
+            except Exception as e:   # no Chromium installed, etc.
+                print(f"[SKIP] fetch={mode}: {type(e).__name__}: {e}")
+                continue
+            secs = time.perf_counter() - t0
+            errors = check(df, wells, mode)
+            print(f"[BENCH] fetch={mode}: {len(wells)} wells in {secs:.2f}s "
+                  f"({len(wells) / secs * 60:.0f} wells/min), mismatches={len(errors)}")
+            for e in errors[:10]:
+                print(f"  {e}")
+            failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Append-only manifest of PDFs handled by pdf_extraction.py --incremental.
+
+One JSON object per line: path, size, mtime, sha256, status, error, ts.
+The last line for a path wins, so a crash can at worst lose the line for
+the PDF that was in flight, and that PDF is simply redone on the next run.
+Status "ok" and "empty" count as finished; "error" is retried.
+"""
+
+import os, json, time
+from pathlib import Path
+from typing import Optional, Dict, Any, Set
+
+from page_cache import file_sha256
+
+DONE_STATUSES = ("ok", "empty")
+
+
+class Manifest:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._fh = None
+        self.load()
+
+    def load(self) -> None:
+        self.records.clear()
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue   # torn last line after a crash
+                if rec.get("path"):
+                    self.records[rec["path"]] = rec
+
+    def is_current(self, pdf: Path) -> bool:
+        """True if `pdf` finished in an earlier run and has not changed since."""
+        rec = self.records.get(str(pdf))
+        if not rec or rec.get("status") not in DONE_STATUSES:
+            return False
+        st = pdf.stat()
+        if rec.get("size") == st.st_size and rec.get("mtime") == st.st_mtime:
+            return True
+        # touched but maybe not edited: fall back to the content hash
+        if rec.get("size") == st.st_size and rec.get("sha256") == file_sha256(pdf):
+            self.record(pdf, rec["status"], sha256=rec["sha256"])
+            return True
+        return False
+
+    def done_names(self) -> Set[str]:
+        return {Path(p).name for p, r in self.records.items() if r.get("status") in DONE_STATUSES}
+
+    def record(self, pdf: Path, status: str, sha256: Optional[str] = None, error: Optional[str] = None) -> None:
+        st = pdf.stat()
+        rec = {
+            "path": str(pdf), "size": st.st_size, "mtime": st.st_mtime,
+            "sha256": sha256 or file_sha256(pdf), "status": status,
+            "error": error, "ts": time.time(),
+        }
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self.records[rec["path"]] = rec
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
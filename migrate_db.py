@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Versioned, in-place schema migrations for well_header / well_stimulation.
+
+  1  original schema: every stimulation field stored as text
+  2  well_stimulation numerics as DECIMAL/INT and date_simulated as DATE;
+     indexes on operator, lat/lon, date, formation and treatment type; on
+     MySQL a spatial POINT column (location) on well_header
+
+Version 2 converts the stimulation columns in place: each gets a typed
+shadow column, rows are backfilled in keyset batches (one commit per batch)
+through the loader's normalizer, then the old columns are dropped and the
+shadows renamed. Values that do not parse become NULL. An interrupted run
+can simply be started again.
+
+Usage:
+  python migrate_db.py                      # upgrade to the latest version
+  python migrate_db.py --status             # print the current version only
+  python migrate_db.py --backend sqlite --sqlite-path oilwells.db --batch-size 5000
+"""
+
+import argparse, time
+from typing import Callable, Dict
+
+import normalize
+from storage import get_storage, BACKENDS, Storage, SCHEMA_VERSION, STIM_COLS, TYPED_STIM_COLS, HASH_COL, row_hash
+
+SHADOW = "__v2"
+
+
+def migrate_v2(storage: Storage, conn, batch_size: int) -> None:
+    table = "well_stimulation"
+    p = storage.param
+    cur = conn.cursor()
+
+    cols = storage.table_columns(conn, table)
+    for c in TYPED_STIM_COLS:
+        if c not in cols and c + SHADOW in cols:       # interrupted between DROP and RENAME
+            cur.execute(f"ALTER TABLE {table} RENAME COLUMN {c}{SHADOW} TO {c}")
+    cols = storage.table_columns(conn, table)
+    for c in TYPED_STIM_COLS:
+        if c + SHADOW not in cols:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {c}{SHADOW} {storage.STIM_TYPES[c]}")
+    conn.commit()
+
+    sets = ", ".join(f"{c}{SHADOW} = {p}" for c in TYPED_STIM_COLS)
+    update = f"UPDATE {table} SET {sets}, volume_units = {p}, {HASH_COL} = {p} WHERE pdf_name = {p}"
+    select = f"SELECT {', '.join(STIM_COLS)} FROM {table} WHERE pdf_name > {p} ORDER BY pdf_name LIMIT {batch_size}"
+    last, done, bad = "", 0, {}
+    t0 = time.perf_counter()
+    while True:
+        rows = storage.query(conn, select, (last,))
+        if not rows:
+            break
+        out, counts, _ = normalize.normalize_stim_frame(normalize.frame(rows))
+        params = [tuple(r[c] for c in TYPED_STIM_COLS) + (r["volume_units"], row_hash(table, r), r["pdf_name"])
+                  for r in normalize.records(out)]
+        cur.executemany(update, params)
+        conn.commit()
+        for k, v in counts.items():
+            if k.endswith("_bad"):
+                bad[k] = bad.get(k, 0) + v
+        last = rows[-1]["pdf_name"]
+        done += len(rows)
+        print(f"[MIGRATE] {table}: {done} rows backfilled ({time.perf_counter() - t0:.1f}s)")
+
+    for c in TYPED_STIM_COLS:
+        cur.execute(f"ALTER TABLE {table} DROP COLUMN {c}")
+        cur.execute(f"ALTER TABLE {table} RENAME COLUMN {c}{SHADOW} TO {c}")
+    cur.close()
+    conn.commit()
+    storage.ensure_v2_extras(conn)
+    nulls = ", ".join(f"{k}={v}" for k, v in bad.items() if v)
+    if nulls:
+        print(f"[MIGRATE] values that did not parse and are now NULL: {nulls}")
+
+
+# version -> migration that brings the previous version up to it
+MIGRATIONS: Dict[int, Callable[[Storage, object, int], None]] = {
+    2: migrate_v2,
+}
+
+
+def migrate(storage: Storage, conn, batch_size: int = 1000) -> int:
+    version = storage.schema_version(conn)
+    while version < SCHEMA_VERSION:
+        target = version + 1
+        print(f"[MIGRATE] {storage.describe()}: version {version} -> {target}")
+        MIGRATIONS[target](storage, conn, max(1, batch_size))
+        storage.set_schema_version(conn, target)
+        version = target
+    return version
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Upgrade the well tables to the latest schema version")
+    ap.add_argument("--status", action="store_true", help="print the current schema version and exit")
+    ap.add_argument("--batch-size", type=int, default=1000, help="rows per backfill batch/commit (default 1000)")
+    ap.add_argument("--backend", choices=BACKENDS, default=None, help="storage backend (default: $DB_BACKEND or mysql)")
+    ap.add_argument("--sqlite-path", default=None, help="database file for --backend sqlite (default: $SQLITE_PATH)")
+    args = ap.parse_args()
+
+    storage = get_storage(args.backend, args.sqlite_path)
+    conn = storage.connect()
+    try:
+        version = storage.schema_version(conn)
+        if args.status:
+            print(f"[STATUS] {storage.describe()}: schema version {version} (latest {SCHEMA_VERSION})")
+            return
+        version = migrate(storage, conn, args.batch_size)
+        print(f"[OK] {storage.describe()}: schema version {version}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
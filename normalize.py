@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Column-wise normalization of loader batches (pdf_to_db.py and the db sink).
+
+A batch of row dicts becomes one DataFrame and every step runs on whole
+columns with pandas string methods / NumPy:
+
+  columns      BOM/space/case clean-up of the keys, pdf_name aliases
+  coordinates  decimal and DMS (48° 3' 12.5") lat/lon -> float degrees:
+               blanks and na/n/a/null/none are missing, unicode dashes
+               read as minus, thousands commas and surrounding quotes are
+               dropped; a value with °, ' or " is degrees [minutes
+               [seconds]] signed by the degrees
+  numerics     stimulation numbers without thousands separators or unit
+               suffixes ("3,134,553 lbs" -> "3134553"); volumes given in
+               gallons are converted to barrels
+  dates        date_simulated as MM/DD/YYYY, MM/DD/YY, MM-DD-YYYY, MM-DD-YY
+               or ISO -> YYYY-MM-DD
+
+Missing and unparseable values are counted per column in the same pass.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+NA_TOKENS = ("", "na", "n/a", "null", "none")
+PDF_NAME_ALIASES = ("pdf", "filename", "file_name", "pdfname")
+
+DMS_RX = r'^\s*([+-]?\d+)(?:[°\s]+(\d+))?(?:[\'\s]+([\d.]+))?"?\s*$'
+NUM_RX = r'^([+-]?(?:\d+(?:\.\d*)?|\.\d+))\s*(.*?)\.?$'
+
+GAL_PER_BBL = 42.0
+
+# accepted unit suffix -> factor into the unit the column is named after
+STIM_NUMERIC_UNITS: Dict[str, Dict[str, float]] = {
+    "acid_pct":                    {"": 1.0, "%": 1.0, "pct": 1.0, "percent": 1.0},
+    "lbs_proppant":                {"": 1.0, "lbs": 1.0, "lb": 1.0, "#": 1.0},
+    "top_ft":                      {"": 1.0, "ft": 1.0, "feet": 1.0, "'": 1.0},
+    "bottom_ft":                   {"": 1.0, "ft": 1.0, "feet": 1.0, "'": 1.0},
+    "stimulation_stages":          {"": 1.0, "stages": 1.0, "stage": 1.0},
+    "volume":                      {"": 1.0, "bbl": 1.0, "bbls": 1.0, "barrels": 1.0,
+                                    "gal": 1 / GAL_PER_BBL, "gals": 1 / GAL_PER_BBL,
+                                    "gallons": 1 / GAL_PER_BBL},
+    "max_pressure_psi":            {"": 1.0, "psi": 1.0, "#": 1.0},
+    "max_treatment_rate_bbls_min": {"": 1.0, "bpm": 1.0, "bbls/min": 1.0, "bbl/min": 1.0,
+                                    "gpm": 1 / GAL_PER_BBL},
+}
+INTEGER_COLS = ("stimulation_stages",)
+DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%m-%d-%y", "%Y-%m-%d")
+VOLUME_UNITS = {"barrels": 1.0, "bbl": 1.0, "bbls": 1.0,
+                "gallons": 1 / GAL_PER_BBL, "gal": 1 / GAL_PER_BBL, "gals": 1 / GAL_PER_BBL}
+
+
+def frame(rows: Iterable[dict]) -> pd.DataFrame:
+    """Row dicts -> object-dtype DataFrame (columns in first-seen order)."""
+    return pd.DataFrame.from_records(list(rows)).astype(object)
+
+
+def records(df: pd.DataFrame) -> List[dict]:
+    """DataFrame -> row dicts with NaN/NA turned back into None."""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keys: drop BOM, strip, lower, spaces -> underscores; pdf_name is filled
+    from the first non-empty alias column when the batch has none, then stripped.
+    """
+    df = df.copy()
+    df.columns = [str(c or "").lstrip("\ufeff").strip().lower().replace(" ", "_") for c in df.columns]
+    df = df.loc[:, ~df.columns.duplicated(keep="last")]
+    if "pdf_name" not in df.columns:
+        aliases = [a for a in PDF_NAME_ALIASES if a in df.columns]
+        if not aliases:
+            return df
+        names = df[aliases].apply(_str)
+        df["pdf_name"] = names.mask(names.eq("")).bfill(axis=1).iloc[:, 0]
+    names = _str(df["pdf_name"]).str.strip()
+    df["pdf_name"] = names.where(names.notna(), None)
+    return df
+
+
+def _str(values: pd.Series) -> pd.Series:
+    """Any column -> object Series of str, missing values as NaN."""
+    s = values.astype("string").astype(object)
+    return s.where(s.notna(), np.nan)
+
+
+def _num(values: pd.Series) -> pd.Series:
+    return pd.to_numeric(values.astype(object), errors="coerce").astype(np.float64)
+
+
+def _text(values: pd.Series) -> pd.Series:
+    """Stripped strings with NA tokens as NaN and unicode dashes as '-'."""
+    s = _str(values).str.strip()
+    s = s.mask(s.str.lower().isin(NA_TOKENS))
+    return s.str.replace("[−–—]", "-", regex=True)
+
+
+def _blank(values: pd.Series) -> pd.Series:
+    return _str(values).str.strip().fillna("").eq("")
+
+
+def parse_coordinates(values: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    Lat or lon column -> (float degrees, missing mask, bad mask). `missing`
+    is None / blank input; `bad` is non-empty input that did not parse.
+    """
+    s = _text(values).str.replace(",", "", regex=False).str.strip("\"'")
+    out = _num(s)
+
+    dms = s.str.contains("[°'\"]", regex=True).fillna(False).astype(bool)
+    if dms.any():
+        parts = s[dms].str.extract(DMS_RX).apply(_num)
+        deg = parts[0]
+        mag = deg.abs() + parts[1].fillna(0.0) / 60.0 + parts[2].fillna(0.0) / 3600.0
+        val = np.where(deg < 0, -mag, mag)
+        out[dms] = pd.Series(val, index=parts.index).where(deg.notna(), out[dms])
+
+    raw = values.astype(object)
+    missing = _blank(values)
+    bad = ~(raw.isna() | raw.eq("")) & out.isna()
+    return out, missing, bad
+
+
+def parse_numbers(values: pd.Series, units: Dict[str, float]) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    Numeric text column -> (float value in the column's unit, unit suffix as
+    written, bad mask). Thousands separators are dropped; a suffix not in
+    `units` makes the value bad.
+    """
+    s = _text(values).str.replace(",", "", regex=False).str.lower()
+    parts = s.str.extract(NUM_RX)
+    suffix = parts[1].fillna("").str.strip()
+    out = _num(parts[0]) * _num(suffix.map(units))
+    bad = s.notna() & out.isna()
+    return out, suffix, bad
+
+
+def format_numbers(values: pd.Series) -> pd.Series:
+    """Floats -> compact strings for the VARCHAR stim columns ('3134553', '0.15'); NaN -> None."""
+    txt = values.round(6).astype(str).str.replace(r"\.0$", "", regex=True)
+    return txt.where(values.notna(), None).astype(object)
+
+
+def parse_dates(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Date text column -> (ISO 'YYYY-MM-DD' strings or None, bad mask); first matching DATE_FORMATS entry wins."""
+    s = _text(values).str.replace(r"\s+", "", regex=True)
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    for fmt in DATE_FORMATS:
+        todo = out.isna() & s.notna()
+        if not todo.any():
+            break
+        out[todo] = pd.to_datetime(s[todo], format=fmt, errors="coerce")
+    bad = s.notna() & out.isna()
+    return out.dt.strftime("%Y-%m-%d").astype(object).where(out.notna(), None), bad
+
+
+def normalize_header_frame(df: pd.DataFrame, lat_col: Optional[str] = "latitude",
+                           lon_col: Optional[str] = "longitude") -> Tuple[pd.DataFrame, Dict[str, int], pd.Series]:
+    """
+    Header batch -> (normalized frame with float latitude/longitude, counts
+    for lat/lon none/bad, mask of rows with a bad coordinate). `lat_col` /
+    `lon_col` name the raw (pre-normalization) columns.
+    """
+    empty = pd.Series([None] * len(df), index=df.index, dtype=object)
+    lat, lat_none, lat_bad = parse_coordinates(df[lat_col] if lat_col in df.columns else empty)
+    lon, lon_none, lon_bad = parse_coordinates(df[lon_col] if lon_col in df.columns else empty)
+    out = normalize_columns(df)
+    out["latitude"] = lat.astype(object)
+    out["longitude"] = lon.astype(object)
+    counts = {"rows": len(df), "lat_none": int(lat_none.sum()), "lon_none": int(lon_none.sum()),
+              "lat_bad": int(lat_bad.sum()), "lon_bad": int(lon_bad.sum())}
+    return out, counts, lat_bad | lon_bad
+
+
+def normalize_stim_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, int], pd.Series]:
+    """
+    Stim batch -> (normalized frame without rows lacking a pdf_name, counts of
+    kept rows and of bad values per numeric/date column as '<col>_bad', mask
+    of kept rows with any bad value). Bad values become None.
+    """
+    out = normalize_columns(df)
+    if "pdf_name" not in out.columns:
+        return out.iloc[0:0], {"rows": 0}, pd.Series([], dtype=bool)
+    out = out[out["pdf_name"].fillna("").ne("")].copy()
+    counts = {"rows": len(out)}
+    any_bad = pd.Series(False, index=out.index)
+    for col, units in STIM_NUMERIC_UNITS.items():
+        if col not in out.columns:
+            continue
+        val, suffix, bad = parse_numbers(out[col], units)
+        if col in INTEGER_COLS:
+            bad |= val.notna() & val.ne(val.round())
+            val = val.where(~bad)
+        if col == "volume" and "volume_units" in out.columns:
+            unit_factor = _num(_str(out["volume_units"]).str.strip().str.lower().map(VOLUME_UNITS))
+            convert = suffix.eq("") & unit_factor.notna()
+            val = val.where(~convert, val * unit_factor)
+            stated = suffix.ne("") | convert
+            out["volume_units"] = out["volume_units"].where(~(stated & val.notna()), "Barrels")
+        elif col == "volume":
+            out["volume_units"] = np.where(suffix.ne("") & val.notna(), "Barrels", None)
+        out[col] = format_numbers(val)
+        counts[f"{col}_bad"] = int(bad.sum())
+        any_bad |= bad
+    if "date_simulated" in out.columns:
+        out["date_simulated"], bad = parse_dates(out["date_simulated"])
+        counts["date_simulated_bad"] = int(bad.sum())
+        any_bad |= bad
+    return out, counts, any_bad
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+On-disk cache of the per-page text lists returned by extract_pages_text.
+
+Entries are content-addressed: the key is built from the PDF's SHA-256 plus
+the extraction options (dpi, prefer_ocr, ...), so renaming a file still hits
+and editing it misses. Each entry is a two-line JSON file (metadata, then
+pages). A small ref file per (PDF path, options) records which entry that
+path last resolved to, which is what --reparse-only walks. Size is capped;
+least-recently-used entries are evicted first (a hit touches mtime).
+"""
+
+import os, json, time, hashlib
+from pathlib import Path
+from typing import Optional, List, Dict, Iterator, Any
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = ".page_cache"
+DEFAULT_MAX_MB = 2048
+
+# per-process running estimate of cache size, so puts don't rescan the tree
+_approx_bytes: Dict[str, int] = {}
+
+
+def file_sha256(path: Path, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class PageTextCache:
+    def __init__(self, root: Path, max_mb: int = DEFAULT_MAX_MB):
+        self.root = Path(root)
+        self.max_bytes = int(max_mb) * 1024 * 1024
+
+    # ---------- keys / paths ----------
+    @staticmethod
+    def key(sha: str, **opts) -> str:
+        blob = json.dumps({"v": CACHE_VERSION, "sha": sha, **opts}, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _ref_path(self, pdf_path: Path, opts: Dict[str, Any]) -> Path:
+        blob = json.dumps({"path": str(pdf_path), **opts}, sort_keys=True)
+        return self.root / "refs" / (hashlib.sha1(blob.encode("utf-8")).hexdigest() + ".json")
+
+    def _write_ref(self, pdf_path: Path, key: str, opts: Dict[str, Any]) -> None:
+        ref = self._ref_path(pdf_path, opts)
+        ref.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ref.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"path": str(pdf_path), "key": key, "opts": opts, "created": time.time()}, f)
+        os.replace(tmp, ref)
+
+    def _entry_files(self) -> Iterator[os.DirEntry]:
+        if not self.root.is_dir():
+            return
+        for sub in os.scandir(self.root):
+            if not sub.is_dir() or len(sub.name) != 2:
+                continue
+            for e in os.scandir(sub.path):
+                if e.name.endswith(".json"):
+                    yield e
+
+    # ---------- get / put ----------
+    def get(self, sha: str, pdf_path: Optional[Path] = None, **opts) -> Optional[List[str]]:
+        key = self.key(sha, **opts)
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                f.readline()
+                pages = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)   # LRU touch
+            if pdf_path is not None:
+                self._write_ref(pdf_path, key, opts)
+        except OSError:
+            pass
+        return pages
+
+    def put(self, sha: str, pages: List[str], pdf_path: Optional[Path] = None, **opts) -> None:
+        key = self.key(sha, **opts)
+        path = self._entry_path(key)
+        meta = {
+            "version": CACHE_VERSION, "key": key, "sha256": sha, "opts": opts,
+            "pdf_name": pdf_path.name if pdf_path else None,
+            "created": time.time(),
+        }
+        data = (json.dumps(meta, ensure_ascii=False) + "\n" +
+                json.dumps(pages, ensure_ascii=False) + "\n").encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        if pdf_path is not None:
+            self._write_ref(pdf_path, key, opts)
+
+        root = str(self.root)
+        if root not in _approx_bytes:
+            _approx_bytes[root] = self.size_bytes()
+        else:
+            _approx_bytes[root] += len(data)
+        if _approx_bytes[root] > self.max_bytes:
+            _approx_bytes[root] = self.evict()
+
+    # ---------- maintenance ----------
+    def size_bytes(self) -> int:
+        total = 0
+        for e in self._entry_files():
+            try:
+                total += e.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def evict(self, low_water: float = 0.9) -> int:
+        """Drop least-recently-used entries until under low_water * cap. Returns new size."""
+        entries = []
+        for e in self._entry_files():
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, e.path))
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * low_water)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass   # another worker got there first
+        return total
+
+    def iter_refs(self) -> Iterator[Dict[str, Any]]:
+        refs = self.root / "refs"
+        if not refs.is_dir():
+            return
+        for e in os.scandir(refs):
+            if not e.name.endswith(".json"):
+                continue
+            try:
+                with open(e.path, "r", encoding="utf-8") as f:
+                    yield json.load(f)
+            except (OSError, ValueError):
+                continue
+
+    def load_pages(self, ref: Dict[str, Any]) -> Optional[List[str]]:
+        path = self._entry_path(ref["key"])
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                f.readline()
+                pages = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return pages
+
+    def latest_for_folder(self, folder: Path, **opts) -> List[Dict[str, Any]]:
+        """
+        Refs for PDFs under `folder` whose options match `opts` and whose entry
+        is still cached, sorted the same way process_folder sorts PDFs. Files
+        that no longer exist are left out.
+        """
+        folder = Path(folder).resolve()
+        keep = []
+        for ref in self.iter_refs():
+            p = ref.get("path")
+            if not p or ref.get("opts") != opts or folder not in Path(p).parents:
+                continue
+            if Path(p).exists() and self._entry_path(ref["key"]).exists():
+                keep.append(ref)
+        return sorted(keep, key=lambda r: Path(r["path"]))
@@ -10,13 +10,26 @@ Usage:
   python extract_to_csv.py /path/to/pdfs \
     --out-header well_header.csv \
     --out-stim well_stimulation.csv \
-    --dpi 300 --prefer-ocr
+    --dpi 300 --prefer-ocr --workers 4
+
+  # after editing a regex, rebuild both CSVs from cached page text only
+  python extract_to_csv.py /path/to/pdfs --reparse-only
 """
 
-import sys, re, csv
+import sys, re, json, time, signal
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterator, Iterable, Tuple, Union
+
+from page_cache import PageTextCache, file_sha256, DEFAULT_CACHE_DIR, DEFAULT_MAX_MB
+from manifest import Manifest
+from sinks import Sink, CsvSink, SINKS, make_sinks
 
 # -------- Optional PDF/OCR deps (safe imports) --------
 try:
@@ -25,12 +38,66 @@ except Exception:
     pdfplumber = None
 
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     import pytesseract
 except Exception:
     convert_from_path = None
+    pdfinfo_from_path = None
     pytesseract = None
 
+try:
+    from preprocess import preprocess_image, parse_steps
+except Exception:
+    preprocess_image = None
+    parse_steps = None
+
+
+# ============================== Instrumentation ==============================
+
+class StageTimer:
+    """
+    Wall time per stage and a few counters for one PDF. Plain dicts only, so
+    it pickles back from worker processes. Stages: hash, cache, pdfplumber,
+    select, render, preprocess, ocr, parse (and write, added by the runner).
+    Passing `page` also books the time under that page in `pages`.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.pages: Dict[int, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str, page: Optional[int] = None):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+            self.stages[name] = self.stages.get(name, 0.0) + dt
+            if page is not None:
+                per = self.pages.setdefault(page, {})
+                per[name] = per.get(name, 0.0) + dt
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+
+@contextmanager
+def _stage(timer: Optional[StageTimer], name: str, page: Optional[int] = None):
+    if timer is None:
+        yield
+    else:
+        with timer.stage(name, page):
+            yield
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
 
 # ============================== Utilities ==============================
 
@@ -46,10 +113,336 @@ def _norm(s: str) -> str:
     return re.sub(r"[ \t]+", " ", s).strip()
 
 
-def extract_pages_text(pdf_path: Path, dpi: int = 300, prefer_ocr: bool = False) -> List[str]:
-    """Return per-page text. Prefer text-layer unless --prefer-ocr is set."""
-    pages: List[str] = []
+RX_CID = re.compile(r"\(cid:\d+\)")
+MIN_PAGE_ALNUM = 20      # fewer alphanumerics than this and a text layer is not worth trusting
+MIN_ALNUM_RATIO = 0.5    # share of non-space chars that must be letters/digits
+
+
+def is_junk_text(s: str) -> bool:
+    """True if a text-layer page is empty or garbage (unmapped glyphs, stray symbols)."""
+    s = RX_CID.sub("", s or "")
+    chars = [ch for ch in s if not ch.isspace()]
+    if not chars:
+        return True
+    alnum = sum(ch.isalnum() for ch in chars)
+    return alnum < MIN_PAGE_ALNUM or alnum / len(chars) < MIN_ALNUM_RATIO
+
+
+# Pages rasterized per pdftoppm call. Only this many page images are alive at
+# once, so peak memory per worker does not grow with document length.
+OCR_WINDOW = 2
+
+# Adaptive DPI: OCR at a low DPI first and only re-render pages whose mean
+# tesseract word confidence (0-100) comes back below this.
+DEFAULT_LOW_DPI = 150
+DEFAULT_MIN_CONF = 60.0
+
+# Page selection: parse_header only reads the first HEADER_PAGES pages and
+# parse_stimulation only cares about pages carrying one of these labels, so
+# other scanned pages are classified from a cheap SCOUT_DPI reading and never
+# get the full-quality OCR pass. Kept loose on purpose: a false positive costs
+# one OCR pass, a false negative loses a field.
+HEADER_PAGES = 2
+DEFAULT_SCOUT_DPI = 100
+RX_STIM_PAGE = re.compile(r"stimul|proppant|treatment|acid\s*%|volume\s*units", re.I)
+
+# Header ROI: on scanned header pages, find the label lines on a ROI_DETECT_DPI
+# copy, OCR only that band at full DPI, and OCR the whole page after all if
+# any of HEADER_ROI_FIELDS is still missing.
+ROI_DETECT_DPI = 100
+ROI_PAD = 0.03           # of page height, above and below the label band
+# matched per OCR line, in the "Label:" form the header fields take on the form; bare words such as
+# "well" or "job" occur all over a page and would stretch the band to the whole page
+RX_HEADER_LABEL = re.compile(
+    r"\bWell\s+(?:Operator|Name)\b|\bEnseco\s+Job\b|\bJob\s+Type\b|\bCounty\s*,\s*State\b"
+    r"|\bSurface\s+Hole\s+Location\b|\b(?:Operator|API\s*(?:#|No\.?)?|Latitude|Longitude|Datum)\s*[:：\-]", re.I)
+HEADER_ROI_FIELDS = ("operator", "well_name", "api", "latitude", "longitude", "datum")
+
+
+@dataclass
+class OcrOptions:
+    """Everything that changes the extracted text; cache_key() feeds the page cache."""
+    dpi: int = 300
+    prefer_ocr: bool = False
+    low_dpi: Optional[int] = None      # set = adaptive mode
+    min_conf: float = DEFAULT_MIN_CONF
+    scout_dpi: Optional[int] = None    # set = only fully OCR header/stimulation pages
+    header_roi: bool = False
+    preprocess: Tuple[str, ...] = ()   # PREPROCESS_STEPS to run before tesseract
+
+    def cache_key(self) -> Dict[str, object]:
+        opts: Dict[str, object] = {"dpi": self.dpi, "prefer_ocr": self.prefer_ocr}
+        if self.low_dpi:
+            opts.update(low_dpi=self.low_dpi, min_conf=self.min_conf)
+        if self.scout_dpi:
+            opts.update(scout_dpi=self.scout_dpi)
+        if self.header_roi:
+            opts.update(header_roi=True)
+        if self.preprocess:
+            opts.update(preprocess=list(self.preprocess))
+        return opts
+
+    def extract_kwargs(self) -> Dict[str, object]:
+        return {"dpi": self.dpi, "prefer_ocr": self.prefer_ocr,
+                "low_dpi": self.low_dpi, "min_conf": self.min_conf, "scout_dpi": self.scout_dpi,
+                "header_roi": self.header_roi, "preprocess": self.preprocess}
+
+
+def page_count(pdf_path: Path) -> int:
+    try:
+        return int(pdfinfo_from_path(str(pdf_path))["Pages"])
+    except Exception as e:
+        sys.stderr.write(f"[WARN] page count failed for {pdf_path.name}: {e}\n")
+        return 0
+
+
+def iter_page_images(pdf_path: Path, page_numbers: Iterable[int], dpi: int = 300,
+                     window: int = OCR_WINDOW, timer: Optional[StageTimer] = None,
+                     preprocess: Tuple[str, ...] = ()) -> Iterator[Tuple[int, "object"]]:
+    """
+    Yield (page_no, PIL image) for the given 1-based pages, rendering runs of
+    consecutive pages at most `window` at a time. Each page's image is closed
+    as soon as the consumer moves on to the next page, so callers must not
+    keep references.
+    With `preprocess` steps the cleaned image is yielded instead, or None for
+    a page found blank ('skip-blank'); callers treat None as empty text.
+    """
+    pages = sorted(set(page_numbers))
+    i = 0
+    while i < len(pages):
+        j = i
+        while j + 1 < len(pages) and pages[j + 1] == pages[j] + 1 and j + 1 - i < window:
+            j += 1
+        first, last = pages[i], pages[j]
+        i = j + 1
+        try:
+            with _stage(timer, "render"):
+                imgs = convert_from_path(str(pdf_path), dpi=dpi, first_page=first, last_page=last)
+            if timer is not None:
+                timer.count("bytes_read", _file_size(pdf_path))
+        except Exception as e:
+            sys.stderr.write(f"[WARN] render failed for {pdf_path.name} p{first}-{last}: {e}\n")
+            continue
+        try:
+            for k, page_no in enumerate(range(first, last + 1)[:len(imgs)]):
+                img = imgs[k]
+                try:
+                    if not (preprocess and preprocess_image):
+                        yield page_no, img
+                        continue
+                    with _stage(timer, "preprocess", page_no):
+                        prepped = preprocess_image(img, preprocess)
+                    if prepped is None:
+                        if timer is not None:
+                            timer.count("blank_pages")
+                        yield page_no, None
+                        continue
+                    try:
+                        yield page_no, prepped
+                    finally:
+                        prepped.close()
+                finally:
+                    img.close()
+                    imgs[k] = None
+        finally:
+            # pages the consumer never reached (it stopped early)
+            for img in imgs:
+                if img is not None:
+                    img.close()
+            del imgs
+
+
+def ocr_with_confidence(img) -> Tuple[str, float]:
+    """
+    One tesseract pass returning (text, mean word confidence). The text is
+    rebuilt from image_to_data: words joined per line, a blank line between
+    paragraphs, like image_to_string. No words at all counts as confidence 0.
+    """
+    data = pytesseract.image_to_data(img, lang="eng", output_type=pytesseract.Output.DICT)
+    lines: List[str] = []
+    words: List[str] = []
+    confs: List[float] = []
+    prev_line = prev_par = None
+    for i, word in enumerate(data["text"]):
+        try:
+            conf = float(data["conf"][i])
+        except (TypeError, ValueError):
+            conf = -1.0
+        if conf < 0 or not (word or "").strip():
+            continue
+        par = (data["block_num"][i], data["par_num"][i])
+        line = par + (data["line_num"][i],)
+        if line != prev_line and words:
+            lines.append(" ".join(words))
+            words = []
+            if par != prev_par:
+                lines.append("")
+        words.append(word)
+        confs.append(conf)
+        prev_line, prev_par = line, par
+    if words:
+        lines.append(" ".join(words))
+    return "\n".join(lines), (sum(confs) / len(confs) if confs else 0.0)
+
+
+def ocr_pages(pdf_path: Path, page_numbers: Iterable[int], dpi: int = 300,
+              timer: Optional[StageTimer] = None, low_dpi: Optional[int] = None,
+              min_conf: float = DEFAULT_MIN_CONF, preprocess: Tuple[str, ...] = ()) -> Dict[int, str]:
+    """
+    OCR the given 1-based pages, streaming the rendering. Missing keys = failed pages.
+    With `low_dpi`, every page is first read at that DPI and only pages whose
+    mean word confidence is under `min_conf` are rendered again at `dpi`.
+    """
+    out: Dict[int, str] = {}
+    low: Dict[int, str] = {}
+    todo = list(page_numbers)
+    if low_dpi and low_dpi < dpi:
+        for page_no, img in iter_page_images(pdf_path, todo, low_dpi, timer=timer, preprocess=preprocess):
+            if img is None:
+                out[page_no] = ""
+                continue
+            try:
+                with _stage(timer, "ocr", page_no):
+                    text, conf = ocr_with_confidence(img)
+            except Exception as e:
+                sys.stderr.write(f"[WARN] OCR failed for {pdf_path.name} p{page_no} @{low_dpi}dpi: {e}\n")
+                continue
+            if conf >= min_conf:
+                out[page_no] = _norm(text)
+            else:
+                low[page_no] = _norm(text)
+        todo = [n for n in todo if n not in out]
+        if timer is not None:
+            timer.count("ocr_pages", len(out) + len(low))
+            timer.count("ocr_escalated", len(low))
+
+    for page_no, img in iter_page_images(pdf_path, todo, dpi, timer=timer, preprocess=preprocess):
+        if img is None:
+            out[page_no] = ""
+            continue
+        try:
+            with _stage(timer, "ocr", page_no):
+                out[page_no] = _norm(pytesseract.image_to_string(img, lang="eng") or "")
+            if timer is not None and page_no not in low:
+                timer.count("ocr_pages")
+        except Exception as e:
+            sys.stderr.write(f"[WARN] OCR failed for {pdf_path.name} p{page_no}: {e}\n")
+    # escalated pages that failed at full DPI keep their low-DPI reading
+    for page_no, text in low.items():
+        if not out.get(page_no, "").strip():
+            out[page_no] = text
+    return out
+
 
+def select_pages(pdf_path: Path, need: List[int], layer: List[str], scout_dpi: int = DEFAULT_SCOUT_DPI,
+                 timer: Optional[StageTimer] = None,
+                 preprocess: Tuple[str, ...] = ()) -> Tuple[List[int], Dict[int, str]]:
+    """
+    Split the pages that would be OCRed into (pages worth full OCR, scout text
+    for the rest). Header pages always qualify. Any other page is classified
+    from its text layer when that is usable, else from a SCOUT_DPI reading; a
+    stimulation page also pulls in the next page, since a label at the foot of
+    one page can have its value at the top of the next.
+    """
+    rest = [n for n in need if n > HEADER_PAGES]
+    keep = set(n for n in need if n <= HEADER_PAGES)
+    scout: Dict[int, str] = {}
+    with _stage(timer, "select"):
+        from_layer = {n for n in rest if n <= len(layer) and not is_junk_text(layer[n - 1])}
+        texts = {n: layer[n - 1] for n in from_layer}
+        scan = [n for n in rest if n not in from_layer]
+        for page_no, img in iter_page_images(pdf_path, scan, scout_dpi, preprocess=preprocess):
+            if img is None:
+                texts[page_no] = scout[page_no] = ""
+                continue
+            try:
+                texts[page_no] = scout[page_no] = _norm(pytesseract.image_to_string(img, lang="eng") or "")
+            except Exception as e:
+                sys.stderr.write(f"[WARN] scout OCR failed for {pdf_path.name} p{page_no}: {e}\n")
+        for n, text in texts.items():
+            if RX_STIM_PAGE.search(text):
+                keep.update((n, n + 1))
+        # pages the scout pass could not read are not safe to skip
+        keep.update(n for n in rest if n not in texts)
+    selected = [n for n in need if n in keep]
+    if timer is not None:
+        timer.count("pages_skipped", len(need) - len(selected))
+    return selected, {n: t for n, t in scout.items() if n not in keep}
+
+
+def header_roi_box(img, dpi: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    (left, top, right, bottom) of the full-width band holding the header label
+    lines, found by word boxes on a ROI_DETECT_DPI copy. None if no label is seen.
+    """
+    scale = min(1.0, ROI_DETECT_DPI / float(dpi))
+    small = img.resize((max(1, int(img.width * scale)), max(1, int(img.height * scale)))) if scale < 1 else img
+    try:
+        data = pytesseract.image_to_data(small, lang="eng", output_type=pytesseract.Output.DICT)
+    finally:
+        if small is not img:
+            small.close()
+    lines: Dict[Tuple[int, int, int], List[int]] = {}
+    for i, word in enumerate(data["text"]):
+        if word and word.strip():
+            lines.setdefault((data["block_num"][i], data["par_num"][i], data["line_num"][i]), []).append(i)
+    tops, bottoms = [], []
+    for idx in lines.values():
+        if RX_HEADER_LABEL.search(" ".join(data["text"][i] for i in idx)):
+            tops.append(min(data["top"][i] for i in idx))
+            bottoms.append(max(data["top"][i] + data["height"][i] for i in idx))
+    if not tops:
+        return None
+    pad = int(img.height * ROI_PAD)
+    top = max(0, int(min(tops) / scale) - pad)
+    bottom = min(img.height, int(max(bottoms) / scale) + pad)
+    return (0, top, img.width, bottom)
+
+
+def ocr_header_roi(pdf_path: Path, page_numbers: Iterable[int], dpi: int = 300,
+                   timer: Optional[StageTimer] = None, preprocess: Tuple[str, ...] = ()) -> Dict[int, str]:
+    """OCR only the header band of each page (whole page if no band is found)."""
+    out: Dict[int, str] = {}
+    for page_no, img in iter_page_images(pdf_path, page_numbers, dpi, timer=timer, preprocess=preprocess):
+        if img is None:
+            out[page_no] = ""
+            continue
+        try:
+            with _stage(timer, "ocr", page_no):
+                box = header_roi_box(img, dpi)
+                crop = img.crop(box) if box else img
+                try:
+                    out[page_no] = _norm(pytesseract.image_to_string(crop, lang="eng") or "")
+                finally:
+                    if crop is not img:
+                        crop.close()
+            if timer is not None:
+                timer.count("roi_pages")
+        except Exception as e:
+            sys.stderr.write(f"[WARN] header ROI OCR failed for {pdf_path.name} p{page_no}: {e}\n")
+    return out
+
+
+def header_complete(pages: List[str]) -> bool:
+    row = parse_header(pages, "")
+    return all(getattr(row, f) is not None for f in HEADER_ROI_FIELDS)
+
+
+def extract_pages_text(pdf_path: Path, dpi: int = 300, prefer_ocr: bool = False,
+                       timer: Optional[StageTimer] = None, low_dpi: Optional[int] = None,
+                       min_conf: float = DEFAULT_MIN_CONF, scout_dpi: Optional[int] = None,
+                       header_roi: bool = False, preprocess: Tuple[str, ...] = ()) -> List[str]:
+    """
+    Return per-page text, deciding page by page. By default the text layer is
+    used wherever it is usable and only empty/junk pages are rendered and OCRed;
+    with --prefer-ocr every page is OCRed and the text layer fills any blanks.
+    `low_dpi` / `min_conf` turn on adaptive DPI (see ocr_pages); `scout_dpi`
+    limits full OCR to header/stimulation pages (see select_pages), the other
+    pages keep their scout reading. `header_roi` OCRs only the label band of
+    scanned header pages, falling back to the full page when a header field
+    is left unresolved. `preprocess` cleans every rendered page first (see
+    preprocess.py).
+    """
     def try_pdfplumber() -> List[str]:
         if not pdfplumber:
             return []
@@ -60,25 +453,57 @@ def extract_pages_text(pdf_path: Path, dpi: int = 300, prefer_ocr: bool = False)
             sys.stderr.write(f"[WARN] pdfplumber failed for {pdf_path.name}: {e}\n")
             return []
 
-    def try_ocr() -> List[str]:
-        if not (convert_from_path and pytesseract):
-            return []
-        try:
-            imgs = convert_from_path(str(pdf_path), dpi=dpi)
-            return [_norm(pytesseract.image_to_string(img, lang="eng") or "") for img in imgs]
-        except Exception as e:
-            sys.stderr.write(f"[WARN] OCR failed for {pdf_path.name}: {e}\n")
-            return []
+    with _stage(timer, "pdfplumber"):
+        layer = try_pdfplumber()
+    if timer is not None and pdfplumber:
+        timer.count("bytes_read", _file_size(pdf_path))
+    if not (convert_from_path and pytesseract):
+        return layer
 
-    if prefer_ocr:
-        pages = try_ocr()
-        if not any(p.strip() for p in pages):
-            pages = try_pdfplumber()
+    n_pages = len(layer) or page_count(pdf_path)
+    if prefer_ocr or not layer:
+        need = list(range(1, n_pages + 1))
     else:
-        pages = try_pdfplumber()
-        if not any(p.strip() for p in pages):
-            pages = try_ocr()
-
+        need = [i + 1 for i, text in enumerate(layer) if is_junk_text(text)]
+    if not need:
+        return layer
+
+    def merge(ocr: Dict[int, str]) -> List[str]:
+        pages = []
+        for n in range(1, n_pages + 1):
+            text = layer[n - 1] if n <= len(layer) else ""
+            o = ocr.get(n, "")
+            if prefer_ocr:
+                # text layer fills pages where OCR came back blank
+                pages.append(o if o.strip() else text)
+            else:
+                pages.append(o or text)
+        return pages
+
+    skipped: Dict[int, str] = {}
+    if scout_dpi:
+        need, skipped = select_pages(pdf_path, need, layer, scout_dpi, timer=timer, preprocess=preprocess)
+    ocr: Dict[int, str] = {}
+    # parse_stimulation reads the header pages too when nothing follows them,
+    # so short documents get full header pages rather than just the label band
+    head = [n for n in need if n <= HEADER_PAGES] if header_roi and n_pages > HEADER_PAGES else []
+    band_only: List[int] = []
+    if head:
+        ocr.update(ocr_header_roi(pdf_path, head, dpi, timer=timer, preprocess=preprocess))
+        if header_complete(merge(ocr)):
+            band_only = head
+            need = [n for n in need if n not in head]
+        elif timer is not None:
+            timer.count("roi_fallback")
+    ocr.update(ocr_pages(pdf_path, need, dpi, timer=timer, low_dpi=low_dpi, min_conf=min_conf,
+                         preprocess=preprocess))
+    ocr.update(skipped)
+    pages = merge(ocr)
+    if band_only and not "".join(pages[HEADER_PAGES:]).strip():
+        # later pages came back blank: same fallback, OCR the header pages in full after all
+        ocr.update(ocr_pages(pdf_path, band_only, dpi, timer=timer, low_dpi=low_dpi, min_conf=min_conf,
+                             preprocess=preprocess))
+        pages = merge(ocr)
     return pages
 
 
@@ -93,35 +518,120 @@ def clean_num(s: Optional[str]) -> Optional[str]:
     return s.strip() or None
 
 
-def value_inline(label_regex: str, text: str) -> Optional[str]:
+# same line boundaries as str.splitlines()
+RX_LINEBREAK = re.compile("\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+ODD_LINEBREAKS = ("\r", "\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+
+
+class PageText:
+    """
+    Page (or concatenated pages) text with a line-offset index, built once on
+    first use. Line lookups from an offset are a bisect plus slices of the
+    lines actually read, instead of text[offset:].splitlines(), and give the
+    same lines splitlines() would.
+    """
+
+    __slots__ = ("text", "_starts", "_ends")
+
+    def __init__(self, text: str):
+        self.text = text
+        self._starts: Optional[List[int]] = None
+        self._ends: Optional[List[int]] = None
+
+    def _index(self) -> None:
+        text = self.text
+        if not any(ch in text for ch in ODD_LINEBREAKS):
+            # common case: "\n" only, let str.split do the walking
+            starts, ends, pos = [], [], 0
+            for line in text.split("\n"):
+                starts.append(pos)
+                pos += len(line)
+                ends.append(pos)
+                pos += 1
+            ends.pop()
+        else:
+            starts, ends = [0], []
+            for m in RX_LINEBREAK.finditer(text):
+                ends.append(m.start())
+                starts.append(m.end())
+        ends.append(len(text))
+        if starts[-1] == len(self.text) and len(starts) > 1:
+            # trailing line break: splitlines() yields no empty last line
+            starts.pop(); ends.pop()
+        self._starts, self._ends = starts, ends
+
+    def iter_lines(self, pos: int, limit: Optional[int] = None) -> Iterator[str]:
+        """Lines of text[pos:limit] as splitlines() would yield them, without copying the tail."""
+        n = len(self.text)
+        limit = n if limit is None else min(limit, n)
+        if pos >= limit:
+            return
+        if self._starts is None:
+            self._index()
+        starts, ends = self._starts, self._ends
+        i = bisect_right(starts, pos) - 1
+        if pos > ends[i]:
+            # offset sits inside a line break: the slice starts with an empty line
+            yield ""
+            i += 1
+            if i >= len(starts) or starts[i] >= limit:
+                return
+            pos = starts[i]
+        while i < len(starts):
+            a = max(starts[i], pos)
+            if a >= limit:
+                return
+            yield self.text[a:min(ends[i], limit)]
+            i += 1
+
+    def next_nonempty_line(self, pos: int) -> Optional[str]:
+        """First non-blank (stripped) line at or after offset `pos`."""
+        for line in self.iter_lines(pos):
+            line = line.strip()
+            if line:
+                return line
+        return None
+
+    def line_and_next(self, pos: int) -> Tuple[str, str]:
+        """Rest of the line at `pos` and the line after it ("" when missing)."""
+        it = self.iter_lines(pos)
+        return next(it, ""), next(it, "")
+
+
+def as_page_text(text: Union[str, PageText]) -> PageText:
+    return text if isinstance(text, PageText) else PageText(text)
+
+
+@lru_cache(maxsize=256)
+def _rx(pattern: str, flags: int = re.I) -> re.Pattern:
+    """Compile once per (pattern, flags); the helpers below take label regexes as strings."""
+    return re.compile(pattern, flags)
+
+
+def value_inline(label_regex: str, text: Union[str, PageText]) -> Optional[str]:
     """
     Capture value on the SAME line after label.
     e.g. 'Maximum Treatment Pressure (PSI)  9679'
     """
-    pat = re.compile(label_regex + r"\s*[:\-]?\s*([^\n\r]+)", re.I)
-    m = pat.search(text)
+    pat = _rx(label_regex + r"\s*[:\-]?\s*([^\n\r]+)")
+    m = pat.search(as_page_text(text).text)
     return m.group(1).strip() if m else None
 
-def value_next_line(label_regex: str, text: str) -> Optional[str]:
+def value_next_line(label_regex: str, text: Union[str, PageText]) -> Optional[str]:
     """
     Capture value on the NEXT non-empty line after a label line.
     e.g.
       Volume Units
       Barrels
     """
+    pt = as_page_text(text)
     # find the label line
-    lab = re.compile(label_regex + r"\s*$", re.I | re.M)
-    m = lab.search(text)
+    lab = _rx(label_regex + r"\s*$", re.I | re.M)
+    m = lab.search(pt.text)
     if not m:
         return None
-    # slice from end of label line
-    tail = text[m.end():]
-    # first non-empty line
-    for line in tail.splitlines():
-        line = line.strip()
-        if line:
-            return line
-    return None
+    # first non-empty line from end of label line
+    return pt.next_nonempty_line(m.end())
 
 
 def dms_to_decimal(dms: Optional[str]) -> Optional[float]:
@@ -158,52 +668,55 @@ def first_or_none(pattern: re.Pattern, text: str) -> Optional[str]:
 
 # --------- tolerant helpers for "label on one line, value on next" ---------
 NUM = r"([0-9][0-9,]*(?:\.[0-9]+)?)"  # number with commas/decimals
+RX_NUM = re.compile(NUM)
+RX_LINE = re.compile(r"([^\r\n]+)")
+RX_RULE = re.compile(r"[-_]{3,}")
 
-def value_after(label_regex: str, text: str, numlike: bool = False) -> Optional[str]:
+def value_after(label_regex: str, text: Union[str, PageText], numlike: bool = False) -> Optional[str]:
     """
     Find label (case-insensitive), then capture value on the same line
     or the next line. If numlike=True, only capture a number-looking token.
     """
-    lab = re.compile(label_regex, re.I)
-    for m in lab.finditer(text):
-        tail = text[m.end():]
-        lines = tail.splitlines()
-        same = lines[0] if lines else ""
-        nxt  = lines[1] if len(lines) > 1 else ""
+    pt = as_page_text(text)
+    lab = _rx(label_regex)
+    for m in lab.finditer(pt.text):
+        same, nxt = pt.line_and_next(m.end())
 
         if numlike:
-            m1 = re.search(NUM, same)
+            m1 = RX_NUM.search(same)
             if m1: return m1.group(1)
-            m2 = re.search(NUM, nxt)
+            m2 = RX_NUM.search(nxt)
             if m2: return m2.group(1)
         else:
-            m1 = re.search(r"([^\r\n]+)", same)
+            m1 = RX_LINE.search(same)
             if m1:
                 v = m1.group(1).strip()
                 if v: return v
             if nxt:
-                m2 = re.match(r"([^\r\n]+)", nxt)
+                m2 = RX_LINE.match(nxt)
                 if m2:
                     v2 = m2.group(1).strip()
                     if v2: return v2
     return None
 
+RX_NOT_NUM = re.compile(r"[^\d.]")
+
 def clean_num(s: Optional[str]) -> Optional[str]:
     if not s: return None
-    return re.sub(r"[^\d.]", "", s)
+    return RX_NOT_NUM.sub("", s)
 
-def first_block_after(label_regex: str, text: str, max_chars: int = 300) -> Optional[str]:
+def first_block_after(label_regex: str, text: Union[str, PageText], max_chars: int = 300) -> Optional[str]:
     """
     Grab several lines after a 'Details' like label, stopping at blank/line of dashes.
     """
-    m = re.search(label_regex + r"[:#]?\s*([\s\S]{0," + str(max_chars) + r"})", text, re.I)
+    pt = as_page_text(text)
+    m = _rx(label_regex + r"[:#]?\s*").search(pt.text)
     if not m: return None
-    block = m.group(1)
     out_lines = []
-    for ln in block.splitlines():
+    for ln in pt.iter_lines(m.end(), m.end() + max_chars):
         s = ln.strip()
         if not s: break
-        if re.fullmatch(r"[-_]{3,}", s): break
+        if RX_RULE.fullmatch(s): break
         out_lines.append(s)
     return "\n".join(out_lines) if out_lines else None
 
@@ -236,6 +749,144 @@ RX_VOLUME_BLOCK = re.compile(r"\bVolume\s*\n\s*([0-9][0-9,\.]*)\s*$\s*^Volume\s*
 RX_DETAILS       = re.compile(r"\bDetails\b[:#]?\s*([^\n\r]+(?:\n[^\n\r]+){0,5})", re.I)
 
 
+# ============================== Label scanner (Stimulation) ==============================
+#
+# parse_stimulation used to run value_inline/value_next_line/first_or_none per
+# field, i.e. two or three full-text regex searches each. Instead, the text is
+# scanned once for the leading word of every label; each label regex is then
+# tried only at those positions (anchored .match), and every field is resolved
+# from the recorded hits. Anchored matches at the same positions in the same
+# order give exactly what the old .search calls returned.
+
+# leading word -> labels that start with it (a label may only start with its lead)
+STIM_LABELS = {
+    "date": {
+        "table":        r"Date\s*Stimulated\s+Stimulated\s*Formation\s+Top\s*\(Ft\)\s+Bottom\s*\(Ft\)\s+Stimulation\s*Stages\s+Volume\s+Volume\s*Units",
+        "date":         r"Date\s*Stimulated",
+    },
+    "stimulat": {
+        "formation":    r"Stimulated\s*Formation",
+        "stages":       r"Stimulation\s*Stages",
+    },
+    "type":    {"treatment": r"Type\s*Treatment"},
+    "acid":    {"acid":      r"Acid\s*%"},
+    "lbs":     {"lbs":       r"Lbs\s*Proppant"},
+    "top":     {"top":       r"Top\s*\(Ft\)"},
+    "bottom":  {"bottom":    r"Bottom\s*\(Ft\)"},
+    "volume": {
+        "volume":       r"\bVolume\b",
+        "volume_units": r"Volume\s*Units",
+    },
+    "maximum": {
+        "pressure":     r"Maximum\s*Treatment\s*Pressure\s*\(PSI\)",
+        "rate":         r"Maximum\s*Treatment\s*Rate\s*\(BBLS/?Min\)",
+    },
+    "details": {"details":   r"\bDetails\b"},
+}
+
+# zero-width so overlapping leads are all reported; only used when str.lower()
+# positions can't be trusted to line up with re.I matching (see LabelScan)
+RX_LEAD = re.compile("(?=" + "|".join(f"(?P<{w}>{w})" for w in STIM_LABELS) + ")", re.I)
+FOLD_SPECIAL = ("\u0130", "\u0131", "\u017f")   # İ ı ſ: re.I folds these to i/s, str.lower() does not
+LABEL_RX = {lead: tuple((key, re.compile(rx, re.I)) for key, rx in labels.items())
+            for lead, labels in STIM_LABELS.items()}
+RX_INLINE_TAIL   = re.compile(r"\s*[:\-]?\s*([^\n\r]+)")   # same tail as value_inline
+RX_EOL_TAIL      = re.compile(r"\s*$", re.M)                # same tail as value_next_line
+RX_DATE_TOKEN    = re.compile(r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}")
+RX_COLS_2SP      = re.compile(r"\s{2,}")
+RX_COLS_PIPE     = re.compile(r"\s{1,}\|\s{1,}|\s{3,}")
+RX_NOT_UNIT      = re.compile(r"[^A-Za-z/]")
+
+
+class LabelScan:
+    """Every stimulation label hit in `text`, collected in a single pass."""
+
+    def __init__(self, text: Union[str, PageText]):
+        self.page = as_page_text(text)
+        self.text = text = self.page.text
+        self.leads: Dict[str, List[int]] = {lead: [] for lead in STIM_LABELS}
+        self.hits: Dict[str, List[int]] = {key: [] for labels in STIM_LABELS.values() for key in labels}
+
+        low = text.lower()
+        if text.isascii() or (len(low) == len(text) and not any(ch in text for ch in FOLD_SPECIAL)):
+            # fast path: C-level substring scans over one lowercased copy
+            for lead, positions in self.leads.items():
+                pos = low.find(lead)
+                while pos != -1:
+                    positions.append(pos)
+                    pos = low.find(lead, pos + 1)
+        else:
+            for m in RX_LEAD.finditer(text):
+                self.leads[m.lastgroup].append(m.start())
+
+        for lead, positions in self.leads.items():
+            for key, rx in LABEL_RX[lead]:
+                hits = self.hits[key]
+                for pos in positions:
+                    h = rx.match(text, pos)
+                    if h:
+                        hits.append(h.end())
+
+    def first(self, pattern: re.Pattern, lead: str) -> Optional[re.Match]:
+        """pattern.search(text) for a pattern that can only start at `lead`."""
+        for pos in self.leads[lead]:
+            m = pattern.match(self.text, pos)
+            if m:
+                return m
+        return None
+
+    def inline(self, key: str) -> Optional[str]:
+        """value_inline(label, text) for the label `key`."""
+        for end in self.hits[key]:
+            m = RX_INLINE_TAIL.match(self.text, end)
+            if m:
+                return m.group(1).strip()
+        return None
+
+    def next_line(self, key: str) -> Optional[str]:
+        """value_next_line(label, text) for the label `key`."""
+        for end in self.hits[key]:
+            m = RX_EOL_TAIL.match(self.text, end)
+            if m:
+                return self.page.next_nonempty_line(m.end())
+        return None
+
+
+def _date_token(v: Optional[str]) -> Optional[str]:
+    if not v:
+        return v
+    m = RX_DATE_TOKEN.search(v)
+    return m.group(0) if m else v
+
+
+# Simple fields resolve as: inline value, else next-line value, else the
+# fallback regex; then the cleaner. Combined fields (top/bottom/stages row,
+# volume block) and Details are handled in parse_stimulation.
+#   StimRow attr,                   label key,    fallback,      lead,       cleaner
+STIM_FIELDS = (
+    ("date_simulated",              "date",       RX_DATE_STIM,  "date",     _date_token),
+    ("stimulated_formation",        "formation",  RX_FORMATION,  "stimulat", None),
+    ("type_treatment",              "treatment",  RX_TYPE_TREAT, "type",     None),
+    ("acid_pct",                    "acid",       RX_ACID_PCT,   "acid",     clean_num),
+    ("lbs_proppant",                "lbs",        RX_LBS_PROP,   "lbs",      clean_num),
+    ("top_ft",                      "top",        None,          None,       clean_num),
+    ("bottom_ft",                   "bottom",     None,          None,       clean_num),
+    ("stimulation_stages",          "stages",     None,          None,       clean_num),
+    ("volume",                      "volume",     None,          None,       clean_num),
+    ("max_pressure_psi",            "pressure",   RX_PRESS_PSI,  "maximum",  clean_num),
+    ("max_treatment_rate_bbls_min", "rate",       RX_MAX_RATE,   "maximum",  clean_num),
+)
+
+
+def resolve_field(scan: LabelScan, key: str, fallback: Optional[re.Pattern] = None,
+                  lead: Optional[str] = None, cleaner=None) -> Optional[str]:
+    val = scan.inline(key) or scan.next_line(key)
+    if not val and fallback is not None:
+        m = scan.first(fallback, lead)
+        val = m.group(1).strip() if m else None
+    return cleaner(val) if cleaner else val
+
+
 # ============================== Data Models ==============================
 
 @dataclass
@@ -320,7 +971,7 @@ def _find_1line(pat: re.Pattern, t: str):
     return m.group(1).strip() if m else None
 
 def _find_nextline(label: str, t: str):
-    pat = re.compile(rf"{re.escape(label)}\s*\n\s*([0-9,.\-A-Za-z/ ]+)", re.I)
+    pat = _rx(rf"{re.escape(label)}\s*\n\s*([0-9,.\-A-Za-z/ ]+)")
     m = pat.search(t)
     return m.group(1).strip() if m else None
 
@@ -344,123 +995,60 @@ def parse_stimulation(pages: List[str], pdf_name: str) -> StimRow:
     later = "\n".join(pages[2:]) if len(pages) > 2 else ""
     full = later if later.strip() else "\n".join(pages)
 
-    t = full
+    t = PageText(full)
+    scan = LabelScan(t)
 
     out = StimRow(pdf_name=pdf_name)
 
     # Date Stimulated  Stimulated Formation  Top (Ft)  Bottom (Ft)  Stimulation Stages  Volume  Volume Units
-    header_pat = re.compile(
-        r"Date\s*Stimulated\s+Stimulated\s*Formation\s+Top\s*\(Ft\)\s+Bottom\s*\(Ft\)\s+Stimulation\s*Stages\s+Volume\s+Volume\s*Units",
-        re.I
-    )
-    m = header_pat.search(t)
-    if m:
-        after = t[m.end():]
-        vals_line = None
-        for line in after.splitlines():
-            s = line.strip()
-            if not s:
-                continue
-            vals_line = s
-            break
+    if scan.hits["table"]:
+        vals_line = t.next_nonempty_line(scan.hits["table"][0])
 
         if vals_line:
-            cols = re.split(r"\s{2,}", vals_line)
+            cols = RX_COLS_2SP.split(vals_line)
             if len(cols) < 7:
-                cols = re.split(r"\s{1,}\|\s{1,}|\s{3,}", vals_line)
+                cols = RX_COLS_PIPE.split(vals_line)
 
             # date, formation, top, bottom, stages, volume, units
             if len(cols) >= 7:
-                out.date_simulated       = re.search(r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}", cols[0]).group(0) if re.search(r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}", cols[0]) else cols[0].strip()
+                m = RX_DATE_TOKEN.search(cols[0])
+                out.date_simulated       = m.group(0) if m else cols[0].strip()
                 out.stimulated_formation = cols[1].strip()
                 out.top_ft               = clean_num(cols[2])
                 out.bottom_ft            = clean_num(cols[3])
                 out.stimulation_stages   = clean_num(cols[4])
                 out.volume               = clean_num(cols[5])
                 # 单位只留字母
-                units = re.sub(r"[^A-Za-z/]", "", cols[6]).strip()
+                units = RX_NOT_UNIT.sub("", cols[6]).strip()
                 out.volume_units         = units or None
 
-    if not out.date_simulated:
-        out.date_simulated = (
-            value_inline(r"Date\s*Stimulated", t) or
-            value_next_line(r"Date\s*Stimulated", t) or
-            first_or_none(RX_DATE_STIM, t)
-        )
-        if out.date_simulated:
-            m = re.search(r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}", out.date_simulated)
-            out.date_simulated = m.group(0) if m else out.date_simulated
-
-    if not out.stimulated_formation:
-        out.stimulated_formation = (
-            value_inline(r"Stimulated\s*Formation", t) or
-            value_next_line(r"Stimulated\s*Formation", t) or
-            first_or_none(RX_FORMATION, t)
-        )
-
-    if not out.type_treatment:
-        out.type_treatment = (
-            value_inline(r"Type\s*Treatment", t) or
-            value_next_line(r"Type\s*Treatment", t) or
-            first_or_none(RX_TYPE_TREAT, t)
-        )
-
-    if not out.acid_pct:
-        out.acid_pct = clean_num(
-            value_inline(r"Acid\s*%", t) or value_next_line(r"Acid\s*%", t) or first_or_none(RX_ACID_PCT, t)
-        )
-
-    if not out.lbs_proppant:
-        out.lbs_proppant = clean_num(
-            value_inline(r"Lbs\s*Proppant", t) or value_next_line(r"Lbs\s*Proppant", t) or first_or_none(RX_LBS_PROP, t)
-        )
-
-    if not out.top_ft:
-        out.top_ft = clean_num(value_inline(r"Top\s*\(Ft\)", t) or value_next_line(r"Top\s*\(Ft\)", t))
-    if not out.bottom_ft:
-        out.bottom_ft = clean_num(value_inline(r"Bottom\s*\(Ft\)", t) or value_next_line(r"Bottom\s*\(Ft\)", t))
-    if not out.stimulation_stages:
-        out.stimulation_stages = clean_num(value_inline(r"Stimulation\s*Stages", t) or value_next_line(r"Stimulation\s*Stages", t))
+    for attr, key, fallback, lead, cleaner in STIM_FIELDS:
+        if not getattr(out, attr):
+            setattr(out, attr, resolve_field(scan, key, fallback, lead, cleaner))
 
     if not (out.top_ft and out.bottom_ft and out.stimulation_stages):
-        m = RX_TOP_BOT_STAGE.search(t)
+        m = scan.first(RX_TOP_BOT_STAGE, "top")
         if m:
             a, b, c = [clean_num(x) for x in m.groups()]
             out.top_ft = out.top_ft or a
             out.bottom_ft = out.bottom_ft or b
             out.stimulation_stages = out.stimulation_stages or c
 
-    # Volume & Units
-    if not out.volume:
-        out.volume = clean_num(value_inline(r"\bVolume\b", t) or value_next_line(r"\bVolume\b", t))
+    # Volume Units (the volume block can also supply the volume)
     if not out.volume_units:
-        vu = value_inline(r"Volume\s*Units", t) or value_next_line(r"Volume\s*Units", t)
+        vu = scan.inline("volume_units") or scan.next_line("volume_units")
         if vu:
-            vu = re.sub(r"[^A-Za-z/]", "", vu).strip()
+            vu = RX_NOT_UNIT.sub("", vu).strip()
             out.volume_units = vu or None
         if not out.volume_units:
-            m = RX_VOLUME_BLOCK.search(t)
+            m = scan.first(RX_VOLUME_BLOCK, "volume")
             if m:
                 out.volume = clean_num(out.volume or m.group(1))
                 out.volume_units = m.group(2)
 
-    # Pressure/Rate
-    if not out.max_pressure_psi:
-        out.max_pressure_psi = clean_num(
-            value_inline(r"Maximum\s*Treatment\s*Pressure\s*\(PSI\)", t) or
-            value_next_line(r"Maximum\s*Treatment\s*Pressure\s*\(PSI\)", t) or
-            first_or_none(RX_PRESS_PSI, t)
-        )
-    if not out.max_treatment_rate_bbls_min:
-        out.max_treatment_rate_bbls_min = clean_num(
-            value_inline(r"Maximum\s*Treatment\s*Rate\s*\(BBLS/?Min\)", t) or
-            value_next_line(r"Maximum\s*Treatment\s*Rate\s*\(BBLS/?Min\)", t) or
-            first_or_none(RX_MAX_RATE, t)
-        )
-
     # Details
     if not out.details:
-        det = value_next_line(r"\bDetails\b", t)
+        det = scan.next_line("details")
         if det and len(det) < 400:
             out.details = det
 
@@ -468,42 +1056,392 @@ def parse_stimulation(pages: List[str], pdf_name: str) -> StimRow:
 
 
 
-# ============================== Runner ==============================
+# ============================== Workers ==============================
 
-def process_folder(folder: Path, out_header: Path, out_stim: Path, dpi: int = 300, prefer_ocr: bool = False):
-    pdfs = sorted(folder.rglob("*.pdf"))
-    if not pdfs:
-        print("No PDFs found.")
+class PdfTimeout(Exception):
+    pass
+
+
+@contextmanager
+def _time_limit(seconds: Optional[float]):
+    """Raise PdfTimeout if the body runs longer than `seconds` (POSIX only)."""
+    if not seconds or not hasattr(signal, "SIGALRM"):
+        yield
         return
 
-    # Prepare writers
-    header_fields = list(asdict(HeaderRow(pdf_name="__dummy__")).keys())
-    stim_fields   = list(asdict(StimRow(pdf_name="__dummy__")).keys())
+    def _on_alarm(signum, frame):
+        raise PdfTimeout(f"timed out after {seconds:g}s")
 
-    with open(out_header, "w", newline="", encoding="utf-8") as f_h, \
-         open(out_stim,   "w", newline="", encoding="utf-8") as f_s:
+    old = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, old)
 
-        w_h = csv.DictWriter(f_h, fieldnames=header_fields)
-        w_s = csv.DictWriter(f_s, fieldnames=stim_fields)
-        w_h.writeheader()
-        w_s.writeheader()
 
+@dataclass
+class ExtractResult:
+    pdf_name: str
+    status: str                   # "ok" | "empty" | "error"
+    header: Optional[dict] = None
+    stim: Optional[dict] = None
+    error: Optional[str] = None
+    sha256: Optional[str] = None
+    trace: Optional[dict] = None  # per-stage timings / counters, see StageTimer
+
+
+def _parse_pages(pdf_name: str, pages: List[str], timer: Optional[StageTimer] = None) -> ExtractResult:
+    if not any(p.strip() for p in pages):
+        return ExtractResult(pdf_name, "empty")
+    with _stage(timer, "parse"):
+        header_row = parse_header(pages, pdf_name)
+        stim_row   = parse_stimulation(pages, pdf_name)
+    return ExtractResult(pdf_name, "ok", asdict(header_row), asdict(stim_row))
+
+
+def _trace(pdf_name: str, res: ExtractResult, timer: StageTimer, t0: float, n_pages: int) -> dict:
+    return {
+        "pdf_name": pdf_name, "status": res.status,
+        "wall_s": time.perf_counter() - t0,
+        "stages": timer.stages,
+        "pages": n_pages,
+        "ocr_pages": timer.counts.get("ocr_pages", 0),
+        "ocr_escalated": timer.counts.get("ocr_escalated", 0),
+        "pages_skipped": timer.counts.get("pages_skipped", 0),
+        "roi_pages": timer.counts.get("roi_pages", 0),
+        "roi_fallback": bool(timer.counts.get("roi_fallback")),
+        "blank_pages": timer.counts.get("blank_pages", 0),
+        "page_s": timer.pages,
+        "bytes_read": timer.counts.get("bytes_read", 0),
+        "cache_hit": bool(timer.counts.get("cache_hit")),
+    }
+
+
+def extract_one(pdf: Path, opts: OcrOptions, timeout: Optional[float] = None,
+                cache: Optional[PageTextCache] = None, hash_pdf: bool = False) -> ExtractResult:
+    """
+    Extract and parse a single PDF. Never raises, so one bad file cannot sink a batch.
+    The content hash is computed when the cache needs it or `hash_pdf` asks
+    for it (the manifest), and handed back in `sha256`.
+    """
+    t0 = time.perf_counter()
+    timer = StageTimer()
+    pages: List[str] = []
+    sha = None
+    try:
+        with _time_limit(timeout):
+            cached = None
+            if cache is not None or hash_pdf:
+                with timer.stage("hash"):
+                    sha = file_sha256(pdf)
+                timer.count("bytes_read", _file_size(pdf))
+            if cache is not None:
+                with timer.stage("cache"):
+                    cached = cache.get(sha, pdf_path=pdf, **opts.cache_key())
+            if cached is not None:
+                pages = cached
+                timer.count("cache_hit")
+            else:
+                pages = extract_pages_text(pdf, timer=timer, **opts.extract_kwargs())
+                if cache is not None and any(p.strip() for p in pages):
+                    try:
+                        with timer.stage("cache"):
+                            cache.put(sha, pages, pdf_path=pdf, **opts.cache_key())
+                    except OSError as e:
+                        sys.stderr.write(f"[WARN] cache write failed for {pdf.name}: {e}\n")
+            res = _parse_pages(pdf.name, pages, timer)
+            res.sha256 = sha
+    except Exception as e:
+        res = ExtractResult(pdf.name, "error", error=f"{type(e).__name__}: {e}", sha256=sha)
+    res.trace = _trace(pdf.name, res, timer, t0, len(pages))
+    return res
+
+
+def iter_reparse(folder: Path, cache: PageTextCache, opts: OcrOptions) -> Iterator[ExtractResult]:
+    """Re-run the parsers over cached page text for `folder`; no PDF is opened."""
+    for ref in cache.latest_for_folder(folder, **opts.cache_key()):
+        name = Path(ref["path"]).name
+        t0 = time.perf_counter()
+        timer = StageTimer()
+        with timer.stage("cache"):
+            pages = cache.load_pages(ref)
+        if pages is None:
+            res = ExtractResult(name, "error", error="cache entry unreadable")
+        else:
+            timer.count("cache_hit")
+            try:
+                res = _parse_pages(name, pages, timer)
+            except Exception as e:
+                res = ExtractResult(name, "error", error=f"{type(e).__name__}: {e}")
+        res.trace = _trace(name, res, timer, t0, len(pages or []))
+        yield res
+
+
+def iter_extract(pdfs: List[Path], opts: OcrOptions,
+                 workers: int = 1, timeout: Optional[float] = None,
+                 cache: Optional[PageTextCache] = None, hash_pdf: bool = False) -> Iterator[ExtractResult]:
+    """
+    Yield one ExtractResult per PDF, in the same order as `pdfs`.
+    With workers > 1 the PDFs are spread over a process pool; results are
+    still handed back in input order. At most 2 x workers PDFs are queued
+    at a time, and if the consumer stops (an error, or closing the
+    generator) the queued ones are cancelled instead of OCRed. If a worker
+    process dies, every PDF that was still in flight is retried once alone
+    in a fresh process, so only the PDFs that crash on their own are
+    reported as errors, and the pool is rebuilt for the rest.
+    """
+    if workers <= 1:
         for pdf in pdfs:
-            print(f"[INFO] {pdf.name}")
-            pages = extract_pages_text(pdf, dpi=dpi, prefer_ocr=prefer_ocr)
-            if not any(p.strip() for p in pages):
-                print(f"[WARN] No text extracted: {pdf.name}", file=sys.stderr)
-                continue
+            yield extract_one(pdf, opts, timeout, cache, hash_pdf)
+        return
 
-            header_row = parse_header(pages, pdf.name)
-            stim_row   = parse_stimulation(pages, pdf.name)
+    window = 2 * workers
+    i = 0
+    while i < len(pdfs):
+        ex = ProcessPoolExecutor(max_workers=workers)
+        pending = deque()
+        nxt, crashed, done = i, False, False
+        try:
+            try:
+                while i < len(pdfs):
+                    while nxt < len(pdfs) and len(pending) < window:
+                        pending.append(ex.submit(extract_one, pdfs[nxt], opts, timeout, cache, hash_pdf))
+                        nxt += 1
+                    res = pending[0].result()
+                    pending.popleft()
+                    yield res
+                    i += 1
+                done = True
+            except BrokenProcessPool:     # from result() or from submit() on a pool that already broke
+                crashed = True
+        finally:
+            # on a consumer error / generator close, drop the queued PDFs instead of OCRing them first
+            ex.shutdown(wait=done, cancel_futures=not done)
+        if not crashed:
+            break
 
-            w_h.writerow(asdict(header_row))
-            w_s.writerow(asdict(stim_row))
+        sys.stderr.write(f"[WARN] worker pool crashed; retrying {len(pending)} in-flight PDF(s) one at a time\n")
+        for fut in pending:
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                yield fut.result()        # finished before the crash
+            else:
+                yield _extract_isolated(pdfs[i], opts, timeout, cache, hash_pdf)
+            i += 1
 
-    print(f"[DONE] {len(pdfs)} PDFs processed.")
-    print(f"  - well_header CSV:      {out_header}")
-    print(f"  - well_stimulation CSV: {out_stim}")
+
+def _extract_isolated(pdf: Path, opts: OcrOptions, timeout: Optional[float],
+                      cache: Optional[PageTextCache], hash_pdf: bool) -> ExtractResult:
+    """extract_one in a process of its own; a crash there is this PDF's fault."""
+    with ProcessPoolExecutor(max_workers=1) as solo:
+        try:
+            return solo.submit(extract_one, pdf, opts, timeout, cache, hash_pdf).result()
+        except BrokenProcessPool:
+            return ExtractResult(pdf.name, "error", error="worker process crashed")
+
+
+# ============================== Profiling ==============================
+
+PROFILE_STAGES = ("hash", "cache", "pdfplumber", "select", "render", "preprocess", "ocr", "parse", "write")
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an unsorted list (q in 0..100)."""
+    if not values:
+        return 0.0
+    vs = sorted(values)
+    k = max(0, min(len(vs) - 1, int(round(q / 100.0 * len(vs) + 0.5)) - 1))
+    return vs[k]
+
+
+def print_profile(traces: List[dict], slowest: int = 10) -> None:
+    """End-of-run summary of per-PDF traces: per-stage distribution plus the slowest documents."""
+    if not traces:
+        print("[REPORT] profile: nothing processed")
+        return
+    wall = [t["wall_s"] for t in traces]
+    print(f"[REPORT] profile: {len(traces)} PDFs, {sum(wall):.2f}s total worker time")
+    print(f"  {'stage':12s} {'docs':>6s} {'total s':>10s} {'p50 ms':>10s} {'p95 ms':>10s} {'share':>7s}")
+    names = [n for n in PROFILE_STAGES if any(n in t["stages"] for t in traces)]
+    names += sorted({n for t in traces for n in t["stages"]} - set(names))
+    grand = sum(sum(t["stages"].values()) for t in traces) or 1.0
+    for name in names:
+        vals = [t["stages"][name] for t in traces if name in t["stages"]]
+        tot = sum(vals)
+        print(f"  {name:12s} {len(vals):6d} {tot:10.3f} {_percentile(vals, 50) * 1e3:10.1f} "
+              f"{_percentile(vals, 95) * 1e3:10.1f} {tot / grand:7.1%}")
+    print(f"  {'wall':12s} {len(wall):6d} {sum(wall):10.3f} {_percentile(wall, 50) * 1e3:10.1f} "
+          f"{_percentile(wall, 95) * 1e3:10.1f}")
+    pages = sum(t["pages"] for t in traces)
+    ocr = sum(t["ocr_pages"] for t in traces)
+    esc = sum(t["ocr_escalated"] for t in traces)
+    skipped = sum(t["pages_skipped"] for t in traces)
+    hits = sum(1 for t in traces if t["cache_hit"])
+    mb = sum(t["bytes_read"] for t in traces) / (1024 * 1024)
+    print(f"  pages: {pages}   OCR pages: {ocr} ({esc} escalated, {skipped} skipped)   "
+          f"cache hits: {hits}   read: {mb:.1f} MB")
+    per_page: Dict[str, List[float]] = {}
+    for t in traces:
+        for page in t.get("page_s", {}).values():
+            for name, secs in page.items():
+                per_page.setdefault(name, []).append(secs)
+    for name in ("preprocess", "ocr"):
+        vals = per_page.get(name)
+        if vals:
+            print(f"  per page {name:10s} n={len(vals):<6d} p50 {_percentile(vals, 50) * 1e3:8.1f} ms"
+                  f"   p95 {_percentile(vals, 95) * 1e3:8.1f} ms")
+    blank = sum(t.get("blank_pages", 0) for t in traces)
+    if blank:
+        print(f"  blank pages skipped by preprocessing: {blank}")
+    print(f"  slowest {min(slowest, len(traces))}:")
+    for t in sorted(traces, key=lambda t: -t["wall_s"])[:slowest]:
+        top = max(t["stages"].items(), key=lambda kv: kv[1])[0] if t["stages"] else "-"
+        print(f"    {t['wall_s']:8.3f}s  {t['pdf_name']}  ({t['status']}, {t['pages']} pages, "
+              f"{t['ocr_pages']} OCR, mostly {top})")
+
+
+# ============================== Runner ==============================
+
+def process_folder(folder: Path, out_header: Path, out_stim: Path, opts: Optional[OcrOptions] = None,
+                   workers: int = 1, timeout: Optional[float] = None,
+                   cache: Optional[PageTextCache] = None, reparse_only: bool = False,
+                   manifest: Optional[Manifest] = None,
+                   trace_path: Optional[Path] = None, profile: bool = False,
+                   sinks: Optional[List[Sink]] = None):
+    """
+    Extract every PDF under `folder` and hand the rows to `sinks` (default:
+    the two CSVs). With a `manifest` (--incremental) only new or changed PDFs
+    are processed; their rows are appended as they finish, so an interrupted
+    run resumes where it stopped, and the CSVs are re-sorted at the end.
+    `trace_path` gets one JSON line of stage timings per PDF; `profile` prints
+    a summary of them at the end.
+    """
+    opts = opts or OcrOptions()
+    pdfs = sorted(folder.rglob("*.pdf"))
+    header_fields = list(asdict(HeaderRow(pdf_name="__dummy__")).keys())
+    stim_fields   = list(asdict(StimRow(pdf_name="__dummy__")).keys())
+    if sinks is None:
+        sinks = [CsvSink(out_header, out_stim, header_fields, stim_fields)]
+
+    todo = pdfs
+    append = False
+    if reparse_only:
+        if cache is None:
+            print("[ERR] --reparse-only needs the page cache (drop --no-cache).", file=sys.stderr)
+            return
+        cached = cache.latest_for_folder(folder, **opts.cache_key())
+        print(f"[INFO] reparse-only: {len(cached)} of {len(pdfs)} PDFs have cached text")
+        results = iter_reparse(folder, cache, opts)
+        total = len(cached)
+        manifest = None
+    else:
+        if not pdfs:
+            print("No PDFs found.")
+            return
+        if manifest is not None:
+            order: Dict[str, int] = {}
+            for i, pdf in enumerate(pdfs):
+                order.setdefault(pdf.name, i)
+            todo = [pdf for pdf in pdfs if not manifest.is_current(pdf)]
+            print(f"[INFO] incremental: {len(pdfs) - len(todo)} unchanged, {len(todo)} new or changed")
+            keep = manifest.done_names() - {pdf.name for pdf in todo}
+            keep_order = {n: i for n, i in order.items() if n in keep}
+            for sink in sinks:
+                sink.compact(keep_order)
+            append = True
+        results = iter_extract(todo, opts, workers=workers, timeout=timeout, cache=cache,
+                               hash_pdf=manifest is not None)
+        total = len(todo)
+
+    failed = 0
+    ocr_total = escalated = skipped = roi_docs = roi_fallback = 0
+    traces: List[dict] = []
+    # PDFs written to the sinks but not yet flushed, hence not yet in the manifest
+    pending: List[Tuple[Path, ExtractResult]] = []
+    batch = min(sink.batch_size for sink in sinks)
+
+    def flush_pending():
+        for sink in sinks:
+            sink.flush()
+        for pdf, r in pending:
+            manifest.record(pdf, r.status, sha256=r.sha256, error=r.error)
+        pending.clear()
+
+    f_t = open(trace_path, "w", encoding="utf-8") if trace_path else None
+    for sink in sinks:
+        sink.open(append=append)
+    completed = False
+    try:
+        for i, res in enumerate(results):
+            print(f"[INFO] {res.pdf_name}")
+            if res.status == "error":
+                failed += 1
+                print(f"[WARN] Extraction failed: {res.pdf_name}: {res.error}", file=sys.stderr)
+            elif res.status == "empty":
+                print(f"[WARN] No text extracted: {res.pdf_name}", file=sys.stderr)
+            else:
+                t0 = time.perf_counter()
+                for sink in sinks:
+                    sink.write(res.header, res.stim)
+                if res.trace is not None:
+                    res.trace["stages"]["write"] = time.perf_counter() - t0
+
+            if manifest is not None:
+                # rows must be durable in every sink before the manifest says this PDF is done
+                pending.append((todo[i], res))
+                if len(pending) >= batch:
+                    flush_pending()
+
+            if res.trace is not None:
+                ocr_total += res.trace["ocr_pages"]
+                escalated += res.trace["ocr_escalated"]
+                skipped += res.trace["pages_skipped"]
+                roi_docs += 1 if res.trace["roi_pages"] else 0
+                roi_fallback += 1 if res.trace["roi_fallback"] else 0
+                if f_t is not None:
+                    f_t.write(json.dumps(res.trace) + "\n")
+                if profile:
+                    traces.append(res.trace)
+        if manifest is not None:
+            flush_pending()
+        completed = True
+    finally:
+        # on an error, close without flushing: a second flush would mask it (or write a failed batch twice)
+        for sink in sinks:
+            try:
+                sink.close(flush=completed)
+            except Exception as e:
+                if completed:
+                    raise
+                print(f"[WARN] closing {sink.name} sink: {type(e).__name__}: {e}", file=sys.stderr)
+        if f_t is not None:
+            f_t.close()
+
+    if manifest is not None:
+        manifest.close()
+        done = manifest.done_names()
+        final_order = {n: i for n, i in order.items() if n in done}
+        for sink in sinks:
+            sink.compact(final_order)
+
+    print(f"[DONE] {total} PDFs processed ({failed} failed).")
+    if opts.low_dpi:
+        print(f"[REPORT] adaptive DPI: {escalated} of {ocr_total} OCR pages escalated "
+              f"from {opts.low_dpi} to {opts.dpi} dpi (min confidence {opts.min_conf:g})")
+    if opts.scout_dpi:
+        print(f"[REPORT] page selection: {skipped} pages left at {opts.scout_dpi} dpi scout text, "
+              f"{ocr_total} fully OCRed")
+    if opts.header_roi:
+        print(f"[REPORT] header ROI: {roi_docs} PDFs OCRed by header band, "
+              f"{roi_fallback} fell back to full-page OCR")
+    for sink in sinks:
+        for line in sink.describe():
+            print(line)
+    if trace_path:
+        print(f"  - trace:                {trace_path}")
+    if profile:
+        print_profile(traces)
 
 
 # ============================== CLI ==============================
@@ -516,8 +1454,48 @@ def main():
     p.add_argument("--out-stim",   type=str, default="well_stimulation.csv", help="Output CSV for stimulation fields")
     p.add_argument("--dpi",        type=int, default=300, help="OCR render DPI if OCR is used")
     p.add_argument("--prefer-ocr", action="store_true", help="Prefer OCR first (default prefers text-layer)")
+    p.add_argument("--adaptive-dpi", action="store_true",
+                   help="OCR at --low-dpi first; re-render at --dpi only pages below --min-conf")
+    p.add_argument("--low-dpi",    type=int, default=DEFAULT_LOW_DPI, help="First-pass DPI for --adaptive-dpi")
+    p.add_argument("--min-conf",   type=float, default=DEFAULT_MIN_CONF,
+                   help="Mean tesseract word confidence (0-100) below which a page is escalated")
+    p.add_argument("--select-pages", action="store_true",
+                   help="Fully OCR only header pages and pages with stimulation labels (found by a scout pass)")
+    p.add_argument("--scout-dpi",  type=int, default=DEFAULT_SCOUT_DPI, help="DPI of the --select-pages scout pass")
+    p.add_argument("--header-roi", action="store_true",
+                   help="OCR only the label band of scanned header pages (full page if a field is missing)")
+    p.add_argument("--preprocess", type=str, default="",
+                   help="Clean page images before OCR: 'all' or a comma list of "
+                        "gray,binarize,deskew,crop,skip-blank (needs numpy)")
+    p.add_argument("--workers",    type=int, default=1, help="Number of worker processes (default 1 = sequential)")
+    p.add_argument("--timeout",    type=float, default=600, help="Per-PDF time limit in seconds, 0 = none (default: 600)")
+    p.add_argument("--cache-dir",  type=str, default=DEFAULT_CACHE_DIR, help="Page-text cache directory")
+    p.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_MB, help="Page-text cache size cap (LRU eviction)")
+    p.add_argument("--no-cache",   action="store_true", help="Do not read or write the page-text cache")
+    p.add_argument("--reparse-only", action="store_true", help="Rebuild CSVs from cached page text without opening PDFs")
+    p.add_argument("--incremental", action="store_true", help="Only process new/changed PDFs and merge into existing CSVs")
+    p.add_argument("--manifest",   type=str, default=None,
+                   help="Manifest for --incremental (default: extract_manifest.jsonl next to --out-header)")
+    p.add_argument("--sink",       type=str, default="csv",
+                   help=f"Comma list of outputs: {', '.join(SINKS)} (db = batched upserts into well_header / well_stimulation)")
+    p.add_argument("--db-batch",   type=int, default=500, help="Rows per upsert transaction for --sink db")
+    p.add_argument("--backend",    type=str, default=None,
+                   help="Storage backend for --sink db: mysql or sqlite (default: $DB_BACKEND or mysql)")
+    p.add_argument("--sqlite-path", type=str, default=None, help="Database file for --backend sqlite")
+    p.add_argument("--trace",      type=str, default=None, help="Write per-PDF stage timings as JSON lines to this file")
+    p.add_argument("--profile",    action="store_true", help="Print a per-stage timing summary at the end of the run")
     args = p.parse_args()
 
+    steps: Tuple[str, ...] = ()
+    if args.preprocess:
+        if parse_steps is None:
+            print("[WARN] --preprocess needs numpy and Pillow; OCR will use raw page images.", file=sys.stderr)
+        else:
+            try:
+                steps = parse_steps(args.preprocess)
+            except ValueError as e:
+                p.error(str(e))
+
     folder = Path(args.folder).expanduser().resolve()
     out_header = Path(args.out_header).expanduser().resolve()
     out_stim   = Path(args.out_stim).expanduser().resolve()
@@ -525,7 +1503,34 @@ def main():
     out_header.parent.mkdir(parents=True, exist_ok=True)
     out_stim.parent.mkdir(parents=True, exist_ok=True)
 
-    process_folder(folder, out_header, out_stim, dpi=args.dpi, prefer_ocr=args.prefer_ocr)
+    header_fields = list(asdict(HeaderRow(pdf_name="__dummy__")).keys())
+    stim_fields   = list(asdict(StimRow(pdf_name="__dummy__")).keys())
+    names = [n.strip().lower() for n in args.sink.split(",") if n.strip()]
+    try:
+        storage = None
+        if "db" in names:
+            from storage import get_storage
+            storage = get_storage(args.backend, args.sqlite_path)
+        sinks = make_sinks(names, out_header, out_stim, header_fields, stim_fields,
+                           db_batch=args.db_batch, storage=storage)
+    except ValueError as e:
+        p.error(str(e))
+
+    cache = None if args.no_cache else PageTextCache(Path(args.cache_dir).expanduser().resolve(), args.cache_max_mb)
+    manifest = None
+    if args.incremental:
+        mpath = Path(args.manifest).expanduser().resolve() if args.manifest else out_header.parent / "extract_manifest.jsonl"
+        manifest = Manifest(mpath)
+
+    opts = OcrOptions(dpi=args.dpi, prefer_ocr=args.prefer_ocr,
+                      low_dpi=args.low_dpi if args.adaptive_dpi else None, min_conf=args.min_conf,
+                      scout_dpi=args.scout_dpi if args.select_pages else None,
+                      header_roi=args.header_roi, preprocess=steps)
+    process_folder(folder, out_header, out_stim, opts,
+                   workers=args.workers, timeout=args.timeout,
+                   cache=cache, reparse_only=args.reparse_only, manifest=manifest,
+                   trace_path=Path(args.trace).expanduser().resolve() if args.trace else None,
+                   profile=args.profile, sinks=sinks)
 
 
 if __name__ == "__main__":
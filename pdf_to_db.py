@@ -1,26 +1,19 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os, csv, argparse, sys, re, tempfile
-from decimal import Decimal, InvalidOperation
-from typing import Dict, Any, Tuple, Optional, List
+import os, csv, argparse, sys, re, time, queue, threading, zlib
+from itertools import islice, chain
+from typing import Dict, Any, Tuple, Optional, List, Iterable, Iterator
 
-from dotenv import load_dotenv
-load_dotenv()
+import normalize
+from storage import get_storage, BACKENDS, HASH_COL, SCHEMA_VERSION, with_hash
 
-DB_HOST = os.getenv("DB_HOST", "127.0.0.1")
-DB_PORT = int(os.getenv("DB_PORT", 3306))
-DB_USER = os.getenv("DB_USER", "phpmyadmin")
-DB_PASS = os.getenv("DB_PASS", "root")
-DB_NAME = os.getenv("DB_NAME", "oilwell_pdf_extraction")
+# backend from DB_BACKEND (mysql by default); main() can switch it with --backend
+STORAGE = get_storage()
 
 LAT_KEY_HINTS = ("lat", "latitude", "lat (dec)", "y (lat)")
 LON_KEY_HINTS = ("lon", "long", "longitude", "lng", "x (lon)")
 
-def _ensure_mysql():
-    import mysql.connector  # noqa: F401
-    return True
-
 def commas_outside_quotes(s: str) -> int:
     cnt, inq = 0, False
     for ch in s:
@@ -30,22 +23,24 @@ def commas_outside_quotes(s: str) -> int:
             cnt += 1
     return cnt
 
-def clean_stim_csv(src_path: str) -> str:
-    with open(src_path, "r", encoding="utf-8-sig", newline="") as f:
-        lines = f.read().splitlines()
-
-    if not lines:
-        return src_path
-
-    header = lines[0]
+def repair_stim_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Stim CSV lines -> one line per record. Lines that do not start a new
+    W12345.pdf row are continuation lines of details and are joined with a
+    literal \\n. Works on any line iterator, so the file is never held in memory.
+    """
+    lines = iter(lines)
+    header = next(lines, None)
+    if header is None:
+        return
+    header = header.rstrip("\r\n")
+    yield header
     expected_commas = header.count(",")
     row_start = re.compile(r'^[^,"]+\.pdf,')   # e.g. W12345.pdf,
 
-    out_lines = [header]
     buf = ""
-
-    for raw in lines[1:]:
-        line = raw
+    for raw in lines:
+        line = raw.rstrip("\r\n")
         if not buf:
             if row_start.match(line):
                 buf = line
@@ -53,24 +48,26 @@ def clean_stim_csv(src_path: str) -> str:
                 continue
         else:
             if row_start.match(line) and commas_outside_quotes(buf) >= expected_commas:
-                out_lines.append(buf)
+                yield buf
                 buf = line
             else:
                 # 合并为 details 的续行
                 buf += "\\n" + line
 
         if buf and commas_outside_quotes(buf) >= expected_commas:
-            out_lines.append(buf)
+            yield buf
             buf = ""
 
     if buf:
-        out_lines.append(buf)
+        yield buf
 
-    tmp = tempfile.NamedTemporaryFile("w", delete=False, encoding="utf-8", newline="")
-    with tmp as w:
-        for l in out_lines:
-            w.write(l + "\n")
-    return tmp.name
+def batched(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, max(1, size)))
+        if not chunk:
+            return
+        yield chunk
 
 def normalize_keys_and_alias(row: dict) -> dict:
     """
@@ -106,33 +103,6 @@ def find_col_name(header_keys: List[str], kind: str) -> Optional[str]:
             return k
     return None
 
-def to_decimal(val) -> Optional[Decimal]:
-    if val is None:
-        return None
-    s = str(val).strip()
-    if s == "" or s.lower() in {"na", "n/a", "null", "none"}:
-        return None
-    s = (s.replace("−", "-").replace("–", "-").replace("—", "-"))
-    s = s.replace(",", "").strip('"').strip("'")
-
-    if "°" in s or "'" in s or '"' in s:
-        m = re.match(r'^\s*([+-]?\d+)(?:[°\s]+(\d+))?(?:[\'\s]+([\d.]+))?"?\s*$', s)
-        if m:
-            deg = float(m.group(1))
-            minutes = float(m.group(2)) if m.group(2) else 0.0
-            seconds = float(m.group(3)) if m.group(3) else 0.0
-            sign = -1 if deg < 0 else 1
-            valf = abs(deg) + minutes/60.0 + seconds/3600.0
-            valf *= sign
-            try:
-                return Decimal(str(valf))
-            except InvalidOperation:
-                return None
-    try:
-        return Decimal(s)
-    except InvalidOperation:
-        return None
-
 def open_and_sniff(path: str):
     try:
         f = open(path, newline="", encoding="utf-8-sig")
@@ -154,94 +124,156 @@ def open_and_sniff(path: str):
 
 # ----------------- DB -----------------
 def init_db(conn):
-    cur = conn.cursor()
-    cur.execute(
-        f"CREATE DATABASE IF NOT EXISTS {DB_NAME} "
-        f"CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"
-    )
-    cur.execute(f"USE {DB_NAME}")
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS well_header (
-            pdf_name   VARCHAR(255) PRIMARY KEY,
-            operator   VARCHAR(255),
-            well_name  VARCHAR(255),
-            api        VARCHAR(32),
-            enseco_job VARCHAR(64),
-            job_type   VARCHAR(128),
-            county_state VARCHAR(256),
-            shl        TEXT,
-            latitude   DECIMAL(12,9),
-            longitude  DECIMAL(12,9),
-            datum      VARCHAR(128)
-        )
-    """)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS well_stimulation (
-            pdf_name VARCHAR(255) PRIMARY KEY,
-            date_simulated VARCHAR(32),
-            stimulated_formation VARCHAR(128),
-            type_treatment VARCHAR(128),
-            acid_pct VARCHAR(32),
-            lbs_proppant VARCHAR(32),
-            top_ft VARCHAR(32),
-            bottom_ft VARCHAR(32),
-            stimulation_stages VARCHAR(32),
-            volume VARCHAR(32),
-            volume_units VARCHAR(32),
-            max_pressure_psi VARCHAR(32),
-            max_treatment_rate_bbls_min VARCHAR(32),
-            details TEXT,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-            CONSTRAINT fk_stim_pdf FOREIGN KEY (pdf_name) REFERENCES well_header(pdf_name)
-                ON DELETE CASCADE ON UPDATE CASCADE
-        )
-    """)
-    cur.close()
-    conn.commit()
+    STORAGE.init_schema(conn)
+
+def connect():
+    """Open a connection with the schema in place and the database selected."""
+    return STORAGE.connect()
 
 def upsert_header(conn, row):
-    sql = """
-    INSERT INTO well_header
-      (pdf_name, operator, well_name, api, enseco_job, job_type,
-       county_state, shl, latitude, longitude, datum)
-    VALUES
-      (%(pdf_name)s, %(operator)s, %(well_name)s, %(api)s, %(enseco_job)s, %(job_type)s,
-       %(county_state)s, %(shl)s, %(latitude)s, %(longitude)s, %(datum)s)
-    ON DUPLICATE KEY UPDATE
-      operator=VALUES(operator), well_name=VALUES(well_name), api=VALUES(api),
-      enseco_job=VALUES(enseco_job), job_type=VALUES(job_type),
-      county_state=VALUES(county_state), shl=VALUES(shl),
-      latitude=VALUES(latitude), longitude=VALUES(longitude), datum=VALUES(datum);
-    """
-    cur = conn.cursor()
-    cur.execute(sql, row); cur.close()
+    STORAGE.upsert_many(conn, "well_header", [row])
 
 def upsert_stimulation(conn, row):
-    sql = """
-    INSERT INTO well_stimulation
-      (pdf_name, date_simulated, stimulated_formation, type_treatment, acid_pct,
-       lbs_proppant, top_ft, bottom_ft, stimulation_stages,
-       volume, volume_units, max_pressure_psi, max_treatment_rate_bbls_min, details)
-    VALUES
-      (%(pdf_name)s, %(date_simulated)s, %(stimulated_formation)s, %(type_treatment)s, %(acid_pct)s,
-       %(lbs_proppant)s, %(top_ft)s, %(bottom_ft)s, %(stimulation_stages)s,
-       %(volume)s, %(volume_units)s, %(max_pressure_psi)s, %(max_treatment_rate_bbls_min)s, %(details)s)
-    ON DUPLICATE KEY UPDATE
-      date_simulated=VALUES(date_simulated),
-      stimulated_formation=VALUES(stimulated_formation),
-      type_treatment=VALUES(type_treatment),
-      acid_pct=VALUES(acid_pct),
-      lbs_proppant=VALUES(lbs_proppant),
-      top_ft=VALUES(top_ft),
-      bottom_ft=VALUES(bottom_ft),
-      stimulation_stages=VALUES(stimulation_stages),
-      volume=VALUES(volume), volume_units=VALUES(volume_units),
-      max_pressure_psi=VALUES(max_pressure_psi),
-      max_treatment_rate_bbls_min=VALUES(max_treatment_rate_bbls_min),
-      details=VALUES(details);
+    STORAGE.upsert_many(conn, "well_stimulation", [row])
+
+def upsert_header_many(conn, rows: List[Dict[str, Any]]):
+    STORAGE.upsert_many(conn, "well_header", rows)
+
+def upsert_stimulation_many(conn, rows: List[Dict[str, Any]]):
+    STORAGE.upsert_many(conn, "well_stimulation", rows)
+
+def changed_rows(conn, table: str, rows: List[Dict[str, Any]], counts: Dict[str, int]) -> List[Dict[str, Any]]:
+    """
+    Keep only rows that are new or whose row_hash differs from the stored one
+    (fetched for the whole batch in one query); tallies inserted/updated/unchanged.
+    """
+    rows = [with_hash(table, r) for r in rows]
+    stored = STORAGE.existing_hashes(conn, table, list({r["pdf_name"] for r in rows}))
+    out = []
+    for r in rows:
+        name, h = r["pdf_name"], r[HASH_COL]
+        if name not in stored:
+            counts["inserted"] += 1
+        elif stored[name] == h:
+            counts["unchanged"] += 1
+            continue
+        else:
+            counts["updated"] += 1
+        stored[name] = h
+        out.append(r)
+    return out
+
+def load_batches(conn, table: str, batches: Iterable[List[Dict[str, Any]]], commit_every: int = 10,
+                 verbose: bool = False, skip_unchanged: bool = True) -> Tuple[int, float, Dict[str, int]]:
     """
-    cur = conn.cursor()
-    cur.execute(sql, row); cur.close()
+    Upsert each batch into `table` with one executemany (one multi-row
+    INSERT on MySQL), committing every `commit_every` batches and once at the
+    end. Unchanged rows are not written unless `skip_unchanged` is off.
+    Returns (rows, seconds, inserted/updated/unchanged counts).
+    """
+    commit_every = max(1, commit_every)
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    t0 = time.perf_counter()
+    done = batches_done = 0
+    for chunk in batches:
+        done += len(chunk)
+        if skip_unchanged:
+            chunk = changed_rows(conn, table, chunk, counts)
+        STORAGE.upsert_many(conn, table, chunk)
+        batches_done += 1
+        if batches_done % commit_every == 0:
+            conn.commit()
+            if verbose:
+                dt = time.perf_counter() - t0
+                print(f"[PROGRESS] {table}: {done} rows ({done / dt if dt else 0:.0f} rows/s)")
+    conn.commit()
+    return done, time.perf_counter() - t0, counts
+
+def shard_of(pdf_name: str, n: int) -> int:
+    """Stable writer index for a pdf_name, so one key always goes through the same writer."""
+    return zlib.crc32((pdf_name or "").encode("utf-8")) % n
+
+def parallel_load(pool, table: str, batches: Iterable[List[Dict[str, Any]]], writers: int,
+                  commit_every: int = 10, skip_unchanged: bool = True) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Split each batch by shard_of(pdf_name) across `writers` threads, each
+    upserting its share on its own pooled connection and committing every
+    `commit_every` of its batches and at the end. Queues are bounded, so
+    reading stays at most a few batches ahead of the slowest writer. Returns
+    per-writer stats (rows, busy seconds, inserted/updated/unchanged) and the
+    wall time; the first writer error is re-raised.
+    """
+    commit_every = max(1, commit_every)
+    queues = [queue.Queue(maxsize=4) for _ in range(writers)]
+    stats = [{"rows": 0, "seconds": 0.0, "inserted": 0, "updated": 0, "unchanged": 0} for _ in range(writers)]
+    errors: List[BaseException] = []
+
+    def writer(k: int) -> None:
+        st, done = stats[k], False
+        try:
+            with pool.connection() as conn:
+                n = 0
+                while True:
+                    chunk = queues[k].get()
+                    if chunk is None:
+                        done = True
+                        break
+                    if errors:          # another writer failed: just drain
+                        continue
+                    t0 = time.perf_counter()
+                    st["rows"] += len(chunk)
+                    if skip_unchanged:
+                        chunk = changed_rows(conn, table, chunk, st)
+                    STORAGE.upsert_many(conn, table, chunk)
+                    n += 1
+                    if n % commit_every == 0:
+                        conn.commit()
+                    st["seconds"] += time.perf_counter() - t0
+                t0 = time.perf_counter()
+                conn.commit()
+                st["seconds"] += time.perf_counter() - t0
+        except BaseException as e:
+            errors.append(e)
+            while not done and queues[k].get() is not None:
+                pass
+
+    threads = [threading.Thread(target=writer, args=(k,), name=f"{table}-writer-{k}", daemon=True)
+               for k in range(writers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    try:
+        for batch in batches:
+            if errors:
+                break
+            parts: List[List[Dict[str, Any]]] = [[] for _ in range(writers)]
+            for row in batch:
+                parts[shard_of(row["pdf_name"], writers)].append(row)
+            for k, part in enumerate(parts):
+                if part:
+                    queues[k].put(part)
+    finally:
+        for q in queues:
+            q.put(None)
+        for t in threads:
+            t.join()
+    if errors:
+        raise errors[0]
+    return stats, time.perf_counter() - t0
+
+def report_writers(table: str, stats: List[Dict[str, Any]], wall: float, skip_unchanged: bool) -> None:
+    for k, st in enumerate(stats):
+        changes = f"; {change_summary(st)}" if skip_unchanged else ""
+        print(f"[WRITER {k}] {table}: {rate(st['rows'], st['seconds'])} busy{changes}")
+    print(f"[PARALLEL] {table}: {rate(sum(st['rows'] for st in stats), wall)} wall with {len(stats)} writers")
+
+def change_summary(counts: Dict[str, int]) -> str:
+    if not counts:
+        return "all rows written"
+    return f"inserted={counts['inserted']}, updated={counts['updated']}, unchanged={counts['unchanged']}"
+
+def rate(n: int, seconds: float) -> str:
+    return f"{n} rows in {seconds:.2f}s ({n / seconds if seconds else 0:.0f} rows/s)"
 
 def write_bad_rows(path: str, rows: List[Dict[str, Any]]):
     if not rows:
@@ -256,11 +288,54 @@ def write_bad_rows(path: str, rows: List[Dict[str, Any]]):
         for r in rows: w.writerow(r)
     print(f"[DIAG] bad rows exported -> {path}")
 
-def process_header_csv(path: str, limit: Optional[int], verbose: bool) -> Tuple[List[Dict[str, Any]], Dict[str,int], List[Dict[str,Any]]]:
+def normalize_header_rows(rows: Iterable[Dict[str, Any]], lat_col: Optional[str] = "latitude",
+                          lon_col: Optional[str] = "longitude", stats: Optional[Dict[str, int]] = None,
+                          bad_rows: Optional[List[Dict[str, Any]]] = None, start: int = 2) -> List[Dict[str, Any]]:
+    """
+    Header rows (CSV dicts or asdict(HeaderRow)) -> upsert-ready dicts with
+    float lat/lon, normalized column-wise as one batch (normalize.py). Counts
+    are added to `stats`; rows whose lat/lon could not be read are copied
+    into `bad_rows` with their line number.
+    """
+    df = normalize.frame(rows)
+    if df.empty:
+        return []
+    out, counts, bad = normalize.normalize_header_frame(df, lat_col, lon_col)
+    if stats is not None:
+        for k, v in counts.items():
+            stats[k] = stats.get(k, 0) + v
+    if bad_rows is not None and bad.any():
+        flagged = out[bad].copy()
+        flagged["_line"] = bad.to_numpy().nonzero()[0] + start
+        bad_rows.extend(normalize.records(flagged))
+    return normalize.records(out)
+
+def normalize_stim_rows(rows: Iterable[Dict[str, Any]], stats: Optional[Dict[str, int]] = None,
+                        bad_rows: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    Stim rows -> upsert-ready dicts; rows without a pdf_name are dropped.
+    Numeric fields lose thousands separators and unit suffixes (gallons become
+    barrels); values that do not parse are stored as NULL, counted in `stats`
+    as '<col>_bad' and their raw rows copied into `bad_rows`.
+    """
+    df = normalize.frame(rows)
+    if df.empty:
+        return []
+    out, counts, bad = normalize.normalize_stim_frame(df)
+    if stats is not None:
+        for k, v in counts.items():
+            stats[k] = stats.get(k, 0) + v
+    if bad_rows is not None and bad.any():
+        bad_rows.extend(normalize.records(df.loc[bad[bad].index]))
+    return normalize.records(out)
+
+def stim_bad_summary(stats: Dict[str, int]) -> str:
+    return ", ".join(f"{k}={v}" for k, v in stats.items() if k.endswith("_bad") and v)
+
+def iter_header_csv(path: str, limit: Optional[int], verbose: bool, batch_size: int,
+                    stats: Dict[str, int], bad_rows: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    """Header CSV -> normalized batches of `batch_size` rows; `stats` / `bad_rows` fill up as it is consumed."""
     f, reader = open_and_sniff(path)
-    bad_rows = []
-    stats = {"rows":0, "lat_none":0, "lon_none":0, "lat_bad":0, "lon_bad":0}
-    rows_out = []
     with f:
         header = reader.fieldnames or []
         lat_col = find_col_name(header, "lat")
@@ -268,88 +343,103 @@ def process_header_csv(path: str, limit: Optional[int], verbose: bool) -> Tuple[
         if verbose:
             print(f"[HEADERS] {header}")
             print(f"[MATCH] latitude col -> {lat_col}; longitude col -> {lon_col}")
-        for i, row in enumerate(reader, start=2):
-            if limit and stats["rows"] >= limit: break
-            stats["rows"] += 1
-
-            lat_raw = row.get(lat_col) if lat_col else None
-            lon_raw = row.get(lon_col) if lon_col else None
-            lat = to_decimal(lat_raw)
-            lon = to_decimal(lon_raw)
-
-            if lat_raw is None or str(lat_raw).strip()=="":
-                stats["lat_none"] += 1
-            if lon_raw is None or str(lon_raw).strip()=="":
-                stats["lon_none"] += 1
-            if lat_raw not in (None,"") and lat is None:
-                stats["lat_bad"] += 1
-            if lon_raw not in (None,"") and lon is None:
-                stats["lon_bad"] += 1
-
-            row = normalize_keys_and_alias(row)
-            row["latitude"] = lat
-            row["longitude"] = lon
-
-            rows_out.append(row)
-
-            if (lat_raw not in (None,"") and lat is None) or (lon_raw not in (None,"") and lon is None):
-                r = dict(row)
-                r["_line"] = i
-                bad_rows.append(r)
-    return rows_out, stats, bad_rows
-
-def process_stim_csv(path: str, limit: Optional[int]) -> Tuple[List[Dict[str, Any]], Dict[str,int]]:
-    cleaned = clean_stim_csv(path) 
-    stats = {"rows":0}
-    rows_out = []
-    with open(cleaned, "r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        for _i, row in enumerate(reader, start=2):
-            if limit and stats["rows"] >= limit: break
-            row = normalize_keys_and_alias(row)
-            if not row.get("pdf_name"):
-                continue
-            stats["rows"] += 1
-            rows_out.append(row)
-    return rows_out, stats
-
-def run(header_csv: str, stim_csv: str, dry_run: bool, limit: Optional[int], verbose: bool):
+        line = 2
+        for chunk in batched(islice(reader, limit or None), batch_size):
+            yield normalize_header_rows(chunk, lat_col, lon_col, stats, bad_rows, start=line)
+            line += len(chunk)
+
+def iter_stim_csv(path: str, limit: Optional[int], batch_size: int,
+                  stats: Dict[str, int], bad_rows: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    """Stim CSV -> continuation lines repaired on the fly -> normalized batches of `batch_size` rows."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(repair_stim_lines(f))
+        for chunk in batched(islice(reader, limit or None), batch_size):
+            rows = normalize_stim_rows(chunk, stats, bad_rows)
+            if rows:
+                yield rows
+
+def report_header(stats: Dict[str, int], bad_rows: List[Dict[str, Any]]) -> None:
+    print(f"[REPORT] well_header: rows={stats['rows']}, "
+          f"lat_none={stats['lat_none']}, lon_none={stats['lon_none']}, "
+          f"lat_bad={stats['lat_bad']}, lon_bad={stats['lon_bad']}")
+    write_bad_rows("bad_rows_header.csv", bad_rows)
+
+def report_stim(stats: Dict[str, int], bad_rows: List[Dict[str, Any]]) -> None:
+    bad_summary = stim_bad_summary(stats)
+    print(f"[REPORT] well_stimulation: rows={stats['rows']}" + (f", {bad_summary}" if bad_summary else ""))
+    write_bad_rows("bad_rows_stim.csv", bad_rows)
+
+def run(header_csv: str, stim_csv: str, dry_run: bool, limit: Optional[int], verbose: bool,
+        batch_size: int = 1000, commit_every: int = 10, bulk: bool = False, force: bool = False,
+        writers: int = 1):
     if not os.path.exists(header_csv):
         print(f"[ERR] header CSV not found: {header_csv}"); sys.exit(1)
     if not os.path.exists(stim_csv):
         print(f"[ERR] stim CSV not found: {stim_csv}"); sys.exit(1)
 
-    # header
-    header_rows, h_stats, h_bad = process_header_csv(header_csv, limit, verbose)
-    print(f"[REPORT] well_header: rows={h_stats['rows']}, "
-          f"lat_none={h_stats['lat_none']}, lon_none={h_stats['lon_none']}, "
-          f"lat_bad={h_stats['lat_bad']}, lon_bad={h_stats['lon_bad']}")
-    write_bad_rows("bad_rows_header.csv", h_bad)
-
-    # stim
-    stim_rows, s_stats = process_stim_csv(stim_csv, limit)
-    print(f"[REPORT] well_stimulation: rows={s_stats['rows']}")
+    # both CSVs are streamed: rows are read, normalized and written batch by batch
+    h_stats = {"rows":0, "lat_none":0, "lon_none":0, "lat_bad":0, "lon_bad":0}
+    s_stats = {"rows":0}
+    h_bad, s_bad = [], []
+    header_batches = iter_header_csv(header_csv, limit, verbose, batch_size, h_stats, h_bad)
+    stim_batches = iter_stim_csv(stim_csv, limit, batch_size, s_stats, s_bad)
 
     if dry_run:
+        for _ in header_batches: pass
+        report_header(h_stats, h_bad)
+        for _ in stim_batches: pass
+        report_stim(s_stats, s_bad)
         print("[OK] Dry-run completed. No database writes.")
         return
 
-    _ensure_mysql()
-    import mysql.connector
-    conn = mysql.connector.connect(
-        host=DB_HOST, port=DB_PORT, user=DB_USER, password=DB_PASS
-    )
+    if writers > STORAGE.max_writers:
+        print(f"[WARN] {STORAGE.name} allows {STORAGE.max_writers} concurrent writer(s); using {STORAGE.max_writers}")
+        writers = STORAGE.max_writers
+
+    conn = connect()
     try:
-        init_db(conn)
-        conn.database = DB_NAME
-
-        ok_h = ok_s = 0
-        for row in header_rows:
-            upsert_header(conn, row); ok_h += 1
-        for row in stim_rows:
-            upsert_stimulation(conn, row); ok_s += 1
-        conn.commit()
-        print(f"[OK] DB import done. header={ok_h}, stim={ok_s}")
+        version = STORAGE.schema_version(conn)
+        if version < SCHEMA_VERSION:
+            print(f"[WARN] schema version {version} < {SCHEMA_VERSION}; run python migrate_db.py for typed, indexed tables")
+        # headers first and committed: well_stimulation has a foreign key on well_header
+        if bulk:
+            for table, batches, stats, report, bad in (
+                    ("well_header", header_batches, h_stats, report_header, h_bad),
+                    ("well_stimulation", stim_batches, s_stats, report_stim, s_bad)):
+                counts = {} if force else {"inserted": 0, "updated": 0, "unchanged": 0}
+                phases = STORAGE.bulk_load(conn, table, chain.from_iterable(batches),
+                                           skip_unchanged=not force, counts=counts or None)
+                report(stats, bad)
+                print(f"[BULK] {table}: " + ", ".join(f"{k}={v:.2f}s" for k, v in phases.items())
+                      + f"; {rate(stats['rows'], sum(phases.values()))}; {change_summary(counts)}")
+            print(f"[OK] DB bulk import done ({STORAGE.describe()}). header={h_stats['rows']}, stim={s_stats['rows']}")
+            return
+        if writers > 1:
+            # all headers (every shard) are committed before any stim row is written: fk_stim_pdf
+            pool = STORAGE.pool(writers)
+            try:
+                w_h, t_h = parallel_load(pool, "well_header", header_batches, writers, commit_every, not force)
+                report_header(h_stats, h_bad)
+                report_writers("well_header", w_h, t_h, not force)
+                w_s, t_s = parallel_load(pool, "well_stimulation", stim_batches, writers, commit_every, not force)
+                report_stim(s_stats, s_bad)
+                report_writers("well_stimulation", w_s, t_s, not force)
+            finally:
+                pool.close()
+            print(f"[OK] DB import done ({STORAGE.describe()}, {writers} writers).")
+            return
+        n_h, t_h, c_h = load_batches(conn, "well_header", header_batches, commit_every, verbose, not force)
+        report_header(h_stats, h_bad)
+        n_s, t_s, c_s = load_batches(conn, "well_stimulation", stim_batches, commit_every, verbose, not force)
+        report_stim(s_stats, s_bad)
+        if force:
+            c_h = c_s = {}
+        print(f"[OK] DB import done ({STORAGE.describe()}). "
+              f"header={rate(n_h, t_h)}, stim={rate(n_s, t_s)}")
+        print(f"[CHANGES] well_header: {change_summary(c_h)}; well_stimulation: {change_summary(c_s)}")
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         conn.close()
 
@@ -359,9 +449,24 @@ def main():
     ap.add_argument("--stim", required=True)
     ap.add_argument("--dry-run", action="store_true", help="parse & validate only, no DB writes")
     ap.add_argument("--limit", type=int, default=None, help="process only first N rows")
-    ap.add_argument("--verbose", action="store_true")
+    ap.add_argument("--verbose", action="store_true", help="also print matched columns and load progress")
+    ap.add_argument("--batch-size", type=int, default=1000, help="rows per multi-row upsert (default 1000)")
+    ap.add_argument("--commit-every", type=int, default=10, help="commit after this many batches (default 10)")
+    ap.add_argument("--bulk", action="store_true",
+                    help="load through staging tables (LOAD DATA LOCAL INFILE on MySQL) and merge set-based")
+    ap.add_argument("--force", action="store_true",
+                    help="write every row, even those whose row_hash shows them unchanged")
+    ap.add_argument("--writers", type=int, default=1,
+                    help="parallel writer connections; rows are sharded by pdf_name (default 1)")
+    ap.add_argument("--backend", choices=BACKENDS, default=None, help="storage backend (default: $DB_BACKEND or mysql)")
+    ap.add_argument("--sqlite-path", default=None, help="database file for --backend sqlite (default: $SQLITE_PATH)")
     args = ap.parse_args()
-    run(args.header, args.stim, args.dry_run, args.limit, args.verbose)
+    if args.writers > 1 and args.bulk:
+        ap.error("--writers applies to the batched upsert path, not --bulk")
+    global STORAGE
+    STORAGE = get_storage(args.backend, args.sqlite_path)
+    run(args.header, args.stim, args.dry_run, args.limit, args.verbose, args.batch_size, args.commit_every,
+        args.bulk, args.force, args.writers)
 
 if __name__ == "__main__":
     main()
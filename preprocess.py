@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Page-image cleanup run before tesseract (pdf_extraction.py --preprocess).
+
+Steps, always applied in this order whichever subset is asked for:
+  gray        hand tesseract 8-bit grayscale instead of the page's own colours
+  binarize    Otsu threshold to pure black/white
+  deskew      rotate by the angle that makes text rows sharpest (projection profile)
+  crop        drop dark scan borders and blank margins
+  skip-blank  report near-empty pages so they are not OCRed at all
+
+Thresholds, skew and borders are always measured on a grayscale copy, but
+only 'gray' (or 'binarize') changes the image that is returned. Everything
+works on NumPy arrays of the whole page; the only Python loop is over the
+handful of candidate deskew angles.
+"""
+
+from typing import Optional, Tuple, Iterable
+
+import numpy as np
+from PIL import Image
+
+PREPROCESS_STEPS = ("gray", "binarize", "deskew", "crop", "skip-blank")
+
+MAX_SKEW_DEG = 5.0
+SKEW_STEP_DEG = 0.25
+SKEW_SAMPLE_WIDTH = 800    # deskew angle is estimated on a copy about this wide
+BORDER_INK = 0.5           # edge rows/cols darker than this share are scan borders
+MARGIN_PAD = 0.01          # of page size, kept around the cropped content
+BLANK_INK = 0.0005         # share of ink pixels below which a page counts as blank
+MIN_CONTRAST = 32          # max - min gray level below which a page is blank
+
+
+def parse_steps(spec: str) -> Tuple[str, ...]:
+    """'all' or a comma list of PREPROCESS_STEPS -> steps in canonical order."""
+    if not spec:
+        return ()
+    names = {s.strip().lower() for s in spec.split(",") if s.strip()}
+    if "all" in names:
+        return PREPROCESS_STEPS
+    unknown = names - set(PREPROCESS_STEPS)
+    if unknown:
+        raise ValueError(f"unknown preprocess step(s): {', '.join(sorted(unknown))}")
+    return tuple(s for s in PREPROCESS_STEPS if s in names)
+
+
+def otsu_threshold(gray: np.ndarray) -> int:
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    p = hist / hist.sum()
+    omega = np.cumsum(p)
+    mu = np.cumsum(p * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma_b = (mu[-1] * omega - mu) ** 2 / (omega * (1.0 - omega))
+    sigma_b[~np.isfinite(sigma_b)] = 0.0
+    return int(np.argmax(sigma_b))
+
+
+def estimate_skew(ink: np.ndarray) -> float:
+    """Skew of the text rows in degrees, counter-clockwise (undo with rotate(-angle))."""
+    step = max(1, ink.shape[1] // SKEW_SAMPLE_WIDTH)
+    ys, xs = np.nonzero(ink[::step, ::step])
+    if len(ys) < 100:
+        return 0.0
+    ys = ys.astype(np.float64)
+    xs = xs.astype(np.float64)
+    best, best_score = 0.0, -1.0
+    for deg in np.arange(-MAX_SKEW_DEG, MAX_SKEW_DEG + SKEW_STEP_DEG / 2, SKEW_STEP_DEG):
+        t = np.deg2rad(deg)
+        rows = np.round(ys * np.cos(t) + xs * np.sin(t)).astype(np.int64)
+        hist = np.bincount(rows - rows.min()).astype(np.float64)
+        score = float(np.sum(np.diff(hist) ** 2))
+        if score > best_score:
+            best, best_score = float(deg), score
+    return best
+
+
+def _border_span(frac: np.ndarray) -> Tuple[int, int]:
+    """[lo, hi) of the rows/cols left after stripping dark runs at both ends."""
+    dark = frac > BORDER_INK
+    lo = int(np.argmin(dark)) if not dark.all() else len(frac)
+    hi = len(frac) - int(np.argmin(dark[::-1])) if not dark.all() else len(frac)
+    return lo, max(lo, hi)
+
+
+def content_box(ink: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """(left, top, right, bottom) of the inked area inside any scan border, padded."""
+    h, w = ink.shape
+    r0, r1 = _border_span(ink.mean(axis=1))
+    c0, c1 = _border_span(ink.mean(axis=0))
+    inner = ink[r0:r1, c0:c1]
+    if inner.size == 0 or inner.mean() < BLANK_INK:
+        return None
+    rows = np.flatnonzero(inner.any(axis=1))
+    cols = np.flatnonzero(inner.any(axis=0))
+    pad_y, pad_x = int(h * MARGIN_PAD), int(w * MARGIN_PAD)
+    return (max(0, c0 + cols[0] - pad_x), max(0, r0 + rows[0] - pad_y),
+            min(w, c0 + cols[-1] + 1 + pad_x), min(h, r0 + rows[-1] + 1 + pad_y))
+
+
+def preprocess_image(img: Image.Image, steps: Iterable[str]) -> Optional[Image.Image]:
+    """
+    Return a new, cleaned image for tesseract, or None if the page is blank
+    and 'skip-blank' is on. The input image is left untouched.
+    """
+    steps = set(steps)
+    gray = np.asarray(img.convert("L"))
+    if int(gray.max()) - int(gray.min()) < MIN_CONTRAST:
+        if "skip-blank" in steps:
+            return None
+        ink = np.zeros(gray.shape, dtype=bool)
+    else:
+        ink = gray <= otsu_threshold(gray)
+
+    if "binarize" in steps:
+        out = Image.fromarray(np.where(ink, 0, 255).astype(np.uint8))
+    elif "gray" in steps:
+        out = Image.fromarray(gray)
+    else:
+        out = img.copy() if img.mode in ("RGB", "L") else img.convert("RGB")
+
+    if "deskew" in steps:
+        angle = estimate_skew(ink)
+        if angle:
+            resample = Image.NEAREST if "binarize" in steps else Image.BILINEAR
+            out = out.rotate(-angle, resample=resample, fillcolor="white")
+            rotated = np.asarray(out.convert("L"))
+            ink = rotated <= (127 if "binarize" in steps else otsu_threshold(rotated))
+
+    box = content_box(ink) if ("crop" in steps or "skip-blank" in steps) else (0, 0, out.width, out.height)
+    if box is None:
+        if "skip-blank" in steps:
+            return None
+        box = (0, 0, out.width, out.height)
+    if "crop" in steps:
+        out = out.crop(box)
+    return out
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Local stand-in for the well search site, so web_scraping.py can be tested
+and benchmarked offline. Pages are generated deterministically from the API
+number and copy the markup the scrapers rely on:
+
+  /search?well_name=..&api_no=..   results list linking to /wells/<api>/<slug>
+                                   (API numbers ending in 0 have no results)
+  /wells/<api>/<slug>              "Well Details" table (th/td) and the
+                                   p.block_stat oil/gas badges; API numbers
+                                   ending in 7 render their fields from
+                                   JavaScript, so only the browser finds them
+  /static/*                        a stylesheet, font and image to block
+
+expected_row(well_name, api) is the row a correct scraper returns.
+
+Usage:
+  python scrape_fixture.py --port 8765 --delay 50
+  python web_scraping.py --base-url http://127.0.0.1:8765
+"""
+
+import argparse, html, json, random, re, threading, time, zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, quote, urlsplit
+
+STATUSES = ["Active", "Inactive", "Plugged & Abandoned", "Temporarily Abandoned", "Members Only"]
+TYPES    = ["Oil & Gas", "Gas", "Injection", "Members Only"]
+CITIES   = ["Williston", "Watford City", "Tioga", "Alexander", "Killdeer", "Stanley"]
+
+
+def _rng(api: str) -> random.Random:
+    return random.Random(zlib.crc32(api.encode()))
+
+
+def has_results(api: str) -> bool:
+    return not api.endswith("0")
+
+
+def needs_browser(api: str) -> bool:
+    return api.endswith("7")
+
+
+def _badge(rng: random.Random) -> str:
+    n = rng.choice([rng.randint(0, 999), rng.randint(1000, 999999)])
+    return f"{n / 1000:.1f}k" if n >= 1000 else str(n)
+
+
+def well_fields(api: str) -> dict:
+    rng = _rng(api)
+    return {
+        "well_status":  rng.choice(STATUSES),
+        "well_type":    rng.choice(TYPES),
+        "closest_city": rng.choice(CITIES),
+        "oil_badge":    _badge(rng),
+        "gas_badge":    _badge(rng),
+    }
+
+
+def expected_row(well_name: str, api: str) -> dict:
+    row = {"well_name": well_name, "api": api}
+    if not has_results(api):
+        return dict(row, well_status="N/A", well_type="N/A", closest_city="N/A", oil_badge="N/A", gas_badge="N/A")
+    f = well_fields(api)
+    row.update({k: "N/A" if v == "Members Only" else v for k, v in f.items()})
+    return row
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "well"
+
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<link rel="stylesheet" href="/static/site.css">
+<link rel="preload" href="/static/site.woff2" as="font" crossorigin>
+</head><body>
+<nav><a href="/">Home</a> <a href="/wells">Wells</a> <a href="/search">Search</a></nav>
+<div class="cookie"><button>Accept</button></div>
+<img src="/static/logo.png" alt="logo">
+{body}
+</body></html>
+"""
+
+
+def search_page(well_name: str, api: str) -> str:
+    if not api or not has_results(api):
+        body = "<h1>Search Results</h1><p>No wells found.</p>"
+    else:
+        body = (f'<h1>Search Results</h1><ul class="search-results">'
+                f'<li><a href="/wells/{quote(api)}/{_slug(well_name)}">{html.escape(well_name)}</a> '
+                f'<span>{html.escape(api)}</span></li></ul>')
+    return PAGE.format(title="Search", body=body)
+
+
+def detail_page(api: str) -> str:
+    f = well_fields(api)
+    table = "".join(f"<tr><th>{html.escape(label)}</th><td>{html.escape(f[key])}</td></tr>"
+                    for key, label in (("well_status", "Well Status"), ("well_type", "Well Type"),
+                                       ("closest_city", "Closest City")))
+    table = f'<table class="skinny"><tr><th>API No.</th><td>{html.escape(api)}</td></tr>{table}</table>'
+    stats = (f'<p class="block_stat"><span class="dropcap">{f["oil_badge"]}</span> Barrels of Oil Produced in Jan 2024</p>'
+             f'<p class="block_stat"><span class="dropcap">{f["gas_badge"]}</span> MCF of Gas Produced in Jan 2024</p>')
+    if needs_browser(api):
+        content = json.dumps(table + stats)
+        body = f'<h2>Well Details</h2><div id="app"></div><script>document.getElementById("app").innerHTML = {content};</script>'
+    else:
+        body = f"<h2>Well Details</h2>{table}<section>{stats}</section>"
+    return PAGE.format(title=f"Well {api}", body=body)
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"     # keep-alive, like the real site
+    delay = 0.0                       # seconds added to every response
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+        u = urlsplit(self.path)
+        m = re.match(r"^/wells/([^/]+)/", u.path)
+        if u.path == "/search":
+            q = parse_qs(u.query)
+            self._send(200, search_page(q.get("well_name", [""])[0], q.get("api_no", [""])[0]))
+        elif m and has_results(m.group(1)):
+            self._send(200, detail_page(m.group(1)))
+        elif u.path.startswith("/static/"):
+            ctype = {"css": "text/css", "png": "image/png", "woff2": "font/woff2"}.get(u.path.rsplit(".", 1)[-1],
+                                                                                     "application/octet-stream")
+            self._send(200, "body{}" if ctype == "text/css" else "\0" * 64, ctype)
+        elif u.path == "/":
+            self._send(200, PAGE.format(title="Home", body="<h1>Wells</h1>"))
+        else:
+            self._send(404, PAGE.format(title="Not found", body="<h1>Not found</h1>"))
+
+    def _send(self, status: int, text: str, ctype: str = "text/html; charset=utf-8") -> None:
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class FixtureServer:
+    """Serve the fixture site from a background thread: `with FixtureServer() as srv: srv.base_url`."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay_ms: float = 0.0):
+        handler = type("Handler", (FixtureHandler,), {"delay": delay_ms / 1000})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline fixture of the well search site")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--delay", type=float, default=0.0, help="milliseconds added to every response")
+    args = ap.parse_args()
+    srv = FixtureServer(args.host, args.port, args.delay)
+    print(f"[FIXTURE] serving on {srv.base_url} (Ctrl+C to stop)")
+    try:
+        srv.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Output sinks for pdf_extraction.py. process_folder hands every parsed PDF to
+each sink as a (header, stim) pair of row dicts:
+
+  CsvSink  well_header.csv / well_stimulation.csv, as before
+  DbSink   batched upserts straight into well_header / well_stimulation,
+           with the same key and ON DUPLICATE KEY UPDATE rules as pdf_to_db.py
+
+flush() means "everything written so far is durable"; the incremental
+manifest only records a PDF after every sink has flushed it. When the run
+is unwinding on an error, sinks are closed with flush=False: buffered rows
+are dropped (they are not in the manifest, so the next run redoes them)
+rather than written behind the failure.
+"""
+
+import csv, time
+from pathlib import Path
+from typing import Dict, List
+
+
+class Sink:
+    name = "sink"
+    batch_size = 1          # rows a sink would like to buffer between flushes
+
+    def open(self, append: bool = False) -> None:
+        pass
+
+    def write(self, header: dict, stim: dict) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def compact(self, order: Dict[str, int]) -> None:
+        """Drop rows whose pdf_name is not in `order` and restore that order (incremental runs)."""
+
+    def close(self, flush: bool = True) -> None:
+        if flush:
+            self.flush()
+
+    def describe(self) -> List[str]:
+        return []
+
+
+# ============================== CSV ==============================
+
+def compact_csv(path: Path, fields: List[str], order: Dict[str, int]) -> None:
+    """
+    Rewrite `path` keeping only rows whose pdf_name is in `order` (last
+    occurrence wins), sorted by that order. Used by --incremental to drop
+    rows of changed/removed/half-written PDFs and restore sorted output.
+    """
+    rows: Dict[str, dict] = {}
+    if path.exists():
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = row.get("pdf_name")
+                if name in order:
+                    rows[name] = row
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        w.writeheader()
+        for name in sorted(rows, key=order.__getitem__):
+            w.writerow(rows[name])
+    tmp.replace(path)
+
+
+class CsvSink(Sink):
+    name = "csv"
+
+    def __init__(self, out_header: Path, out_stim: Path, header_fields: List[str], stim_fields: List[str]):
+        self.out_header, self.out_stim = Path(out_header), Path(out_stim)
+        self.header_fields, self.stim_fields = header_fields, stim_fields
+        self._fh = self._fs = None
+
+    def open(self, append: bool = False) -> None:
+        mode = "a" if append else "w"
+        self._fh = open(self.out_header, mode, newline="", encoding="utf-8")
+        self._fs = open(self.out_stim, mode, newline="", encoding="utf-8")
+        self._wh = csv.DictWriter(self._fh, fieldnames=self.header_fields)
+        self._ws = csv.DictWriter(self._fs, fieldnames=self.stim_fields)
+        if not append:
+            self._wh.writeheader()
+            self._ws.writeheader()
+
+    def write(self, header: dict, stim: dict) -> None:
+        self._wh.writerow(header)
+        self._ws.writerow(stim)
+
+    def flush(self) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+            self._fs.flush()
+
+    def compact(self, order: Dict[str, int]) -> None:
+        compact_csv(self.out_header, self.header_fields, order)
+        compact_csv(self.out_stim, self.stim_fields, order)
+
+    def close(self, flush: bool = True) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fs.close()
+            self._fh = self._fs = None
+
+    def describe(self) -> List[str]:
+        return [f"  - well_header CSV:      {self.out_header}",
+                f"  - well_stimulation CSV: {self.out_stim}"]
+
+
+# ============================== Database ==============================
+
+class DbSink(Sink):
+    """
+    Buffers rows and upserts them `batch_size` at a time in one transaction,
+    headers before stimulation rows (the stim table has a foreign key on
+    well_header). Each batch goes through pdf_to_db's column-wise normalizers
+    at flush time, so lat/lon and stim numerics land exactly as they do on the
+    CSV route.
+    """
+    name = "db"
+
+    def __init__(self, batch_size: int = 500, storage=None):
+        import pdf_to_db   # pulls in dotenv (and the DB driver) only when the DB sink is used
+        self.db = pdf_to_db
+        self.storage = storage or pdf_to_db.STORAGE
+        self.batch_size = max(1, batch_size)
+        self.conn = None
+        self._headers: List[dict] = []
+        self._stims: List[dict] = []
+        self.stats = {"rows": 0, "lat_none": 0, "lon_none": 0, "lat_bad": 0, "lon_bad": 0}
+        self.stim_stats = {"rows": 0}
+        self.bad_rows: List[dict] = []
+        self.bad_stim_rows: List[dict] = []
+        self.written = {"header": 0, "stim": 0}
+        self.seconds = 0.0
+
+    def open(self, append: bool = False) -> None:
+        self.conn = self.storage.connect()
+
+    def write(self, header: dict, stim: dict) -> None:
+        self._headers.append(header)
+        self._stims.append(stim)
+        if len(self._headers) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.conn is None or not (self._headers or self._stims):
+            return
+        headers = self.db.normalize_header_rows(self._headers, stats=self.stats, bad_rows=self.bad_rows,
+                                                start=self.stats["rows"] + 2)
+        stims = self.db.normalize_stim_rows(self._stims, stats=self.stim_stats, bad_rows=self.bad_stim_rows)
+        t0 = time.perf_counter()
+        try:
+            self.storage.upsert_many(self.conn, "well_header", headers)
+            self.storage.upsert_many(self.conn, "well_stimulation", stims)
+            self.conn.commit()
+        except Exception:
+            # the batch was rolled back as a whole; drop it so nothing retries it half-way
+            self._headers, self._stims = [], []
+            self.conn.rollback()
+            raise
+        self.seconds += time.perf_counter() - t0
+        self.written["header"] += len(headers)
+        self.written["stim"] += len(stims)
+        self._headers, self._stims = [], []
+
+    def close(self, flush: bool = True) -> None:
+        if self.conn is None:
+            return
+        try:
+            if flush:
+                self.flush()
+        finally:
+            self.conn.close()
+            self.conn = None
+        self.db.write_bad_rows("bad_rows_header.csv", self.bad_rows)
+        self.db.write_bad_rows("bad_rows_stim.csv", self.bad_stim_rows)
+
+    def describe(self) -> List[str]:
+        s = self.stats
+        stim_bad = self.db.stim_bad_summary(self.stim_stats)
+        return [f"  - database {self.storage.describe()}: header={self.written['header']}, stim={self.written['stim']} "
+                f"({self.seconds:.2f}s in upserts; lat_bad={s['lat_bad']}, lon_bad={s['lon_bad']}"
+                f"{', ' + stim_bad if stim_bad else ''})"]
+
+
+SINKS = ("csv", "db")
+
+
+def make_sinks(names: List[str], out_header: Path, out_stim: Path, header_fields: List[str],
+               stim_fields: List[str], db_batch: int = 500, storage=None) -> List[Sink]:
+    sinks: List[Sink] = []
+    for name in names:
+        if name == "csv":
+            sinks.append(CsvSink(out_header, out_stim, header_fields, stim_fields))
+        elif name == "db":
+            sinks.append(DbSink(batch_size=db_batch, storage=storage))
+        else:
+            raise ValueError(f"unknown sink: {name}")
+    return sinks
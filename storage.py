@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Storage backends shared by pdf_to_db.py, pdf_extraction.py --sink db,
+web_scraping.py and app.py.
+
+  mysql   the MySQL server configured by DB_HOST / DB_PORT / DB_USER / DB_PASS / DB_NAME
+  sqlite  a single file (SQLITE_PATH, default oilwells.db next to this file) in
+          WAL mode, so the whole pipeline runs on one box or without a server
+
+Pick one with DB_BACKEND=mysql|sqlite (default mysql) or the --backend flag of
+the scripts. Both backends expose the same handful of operations: connect
+(with the schema in place), upsert rows keyed on pdf_name, bulk-load rows
+through a staging table, replace a table, CREATE TABLE ... AS SELECT, and run
+a query returning dicts.
+
+The schema is versioned (table schema_version). Version 2 stores the
+stimulation numerics as DECIMAL/INT and date_simulated as DATE, indexes the
+join and filter keys, and on MySQL adds a spatial POINT column to
+well_header. New databases start at the latest version; older ones are
+upgraded in place with migrate_db.py.
+
+Every well_header / well_stimulation row carries row_hash, a SHA-1 of its
+values, so loaders can tell unchanged rows apart and skip writing them.
+"""
+
+import os, sqlite3, tempfile, time, hashlib, queue, threading
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+
+from dotenv import load_dotenv
+load_dotenv()
+
+DB_HOST = os.getenv("DB_HOST", "127.0.0.1")
+DB_PORT = int(os.getenv("DB_PORT", 3306))
+DB_USER = os.getenv("DB_USER", "phpmyadmin")
+DB_PASS = os.getenv("DB_PASS", "root")
+DB_NAME = os.getenv("DB_NAME", "oilwell_pdf_extraction")
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql")
+SQLITE_PATH = os.getenv("SQLITE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "oilwells.db"))
+
+BACKENDS = ("mysql", "sqlite")
+
+HEADER_COLS = ["pdf_name", "operator", "well_name", "api", "enseco_job", "job_type",
+               "county_state", "shl", "latitude", "longitude", "datum"]
+STIM_COLS = ["pdf_name", "date_simulated", "stimulated_formation", "type_treatment", "acid_pct",
+             "lbs_proppant", "top_ft", "bottom_ft", "stimulation_stages",
+             "volume", "volume_units", "max_pressure_psi", "max_treatment_rate_bbls_min", "details"]
+TABLE_COLS = {"well_header": HEADER_COLS, "well_stimulation": STIM_COLS}
+SCHEMA_VERSION = 2
+# stim columns that schema version 2 turned from text into DATE/numeric types
+TYPED_STIM_COLS = ("date_simulated", "acid_pct", "lbs_proppant", "top_ft", "bottom_ft",
+                   "stimulation_stages", "volume", "max_pressure_psi", "max_treatment_rate_bbls_min")
+HASH_COL = "row_hash"
+MAX_IN_PARAMS = 900      # per IN (...) lookup; older SQLite builds allow 999 bound parameters
+WRITE_COLS = {t: cols + [HASH_COL] for t, cols in TABLE_COLS.items()}
+
+# sqlite3 cannot bind Decimal; lat/lon are stored as REAL there
+sqlite3.register_adapter(Decimal, float)
+
+
+def row_hash(table: str, row: Dict[str, Any]) -> str:
+    """SHA-1 over the table's columns of `row` (None and '' hash differently)."""
+    h = hashlib.sha1()
+    for c in TABLE_COLS[table]:
+        v = row.get(c)
+        h.update(b"\x00" if v is None else str(v).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def with_hash(table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    return row if HASH_COL in row else dict(row, **{HASH_COL: row_hash(table, row)})
+
+
+class Storage:
+    name = "base"
+    param = "%s"                      # positional placeholder
+    max_writers = 64                  # concurrent writing connections worth opening
+
+    def connect(self, init: bool = True):
+        """
+        DB-API connection with the database selected. With `init` the schema
+        is created / checked first (loaders, migrate_db.py); readers such as
+        app.py pass init=False and need no DDL privileges.
+        """
+        raise NotImplementedError
+
+    def init_schema(self, conn) -> None:
+        raise NotImplementedError
+
+    # stim column types of schema version 2, used by CREATE TABLE and migrate_db.py
+    STIM_TYPES: Dict[str, str] = {}
+
+    def table_columns(self, conn, table: str) -> List[str]:
+        raise NotImplementedError
+
+    def ensure_v2_extras(self, conn) -> None:
+        """Version-2 indexes (and MySQL's location column) that are missing; idempotent."""
+        raise NotImplementedError
+
+    def upsert_sql(self, table: str) -> str:
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        return self.name
+
+    def pool(self, size: int) -> "ConnectionPool":
+        return ConnectionPool(self, size)
+
+    # ---------- shared operations ----------
+    def upsert_many(self, conn, table: str, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            cur = conn.cursor()
+            cur.executemany(self.upsert_sql(table), [with_hash(table, r) for r in rows])
+            cur.close()
+
+    def existing_hashes(self, conn, table: str, names: Sequence[str]) -> Dict[str, Optional[str]]:
+        """pdf_name -> stored row_hash for the `names` already in `table`, MAX_IN_PARAMS names per query."""
+        names = list(names)
+        found: Dict[str, Optional[str]] = {}
+        if not names:
+            return found
+        cur = conn.cursor()
+        for i in range(0, len(names), MAX_IN_PARAMS):
+            chunk = names[i:i + MAX_IN_PARAMS]
+            cur.execute(f"SELECT pdf_name, {HASH_COL} FROM {table} WHERE pdf_name IN "
+                        f"({', '.join([self.param] * len(chunk))})", chunk)
+            found.update(cur.fetchall())
+        cur.close()
+        return found
+
+    def bulk_load(self, conn, table: str, rows: Iterable[Dict[str, Any]], skip_unchanged: bool = True,
+                  counts: Optional[Dict[str, int]] = None) -> Dict[str, float]:
+        """
+        Upsert `rows` (any iterable, consumed once) into `table` through a
+        staging table with one set-based merge, then commit. Staged rows whose
+        row_hash matches the stored one are dropped before the merge unless
+        `skip_unchanged` is off; inserted/updated/unchanged are added to
+        `counts`. Returns seconds per phase (write, load, merge).
+        """
+        raise NotImplementedError
+
+    def _stage_counts(self, cur, table: str, stage: str, skip_unchanged: bool,
+                      delete_unchanged_sql: str, counts: Optional[Dict[str, int]]) -> None:
+        cur.execute(f"SELECT COUNT(*) FROM {stage}")
+        staged = cur.fetchall()[0][0]
+        cur.execute(f"SELECT COUNT(*) FROM {stage} s JOIN {table} t ON t.pdf_name = s.pdf_name")
+        existing = cur.fetchall()[0][0]
+        unchanged = 0
+        if skip_unchanged:
+            cur.execute(delete_unchanged_sql)
+            unchanged = cur.rowcount
+        if counts is not None:
+            counts["inserted"] = counts.get("inserted", 0) + staged - existing
+            counts["updated"] = counts.get("updated", 0) + existing - unchanged
+            counts["unchanged"] = counts.get("unchanged", 0) + unchanged
+
+    # ---------- schema version ----------
+    def _init_version(self, conn, existed: bool) -> int:
+        """Create schema_version if needed; tables that predate it are version 1."""
+        cur = conn.cursor()
+        cur.execute("CREATE TABLE IF NOT EXISTS schema_version (version INT NOT NULL)")
+        cur.execute("SELECT version FROM schema_version")
+        rows = cur.fetchall()
+        if not rows:
+            version = 1 if existed else SCHEMA_VERSION
+            cur.execute(f"INSERT INTO schema_version (version) VALUES ({self.param})", (version,))
+        else:
+            version = rows[0][0]
+        cur.close()
+        return version
+
+    def schema_version(self, conn) -> int:
+        return self.query(conn, "SELECT version FROM schema_version")[0]["version"]
+
+    def set_schema_version(self, conn, version: int) -> None:
+        cur = conn.cursor()
+        cur.execute(f"UPDATE schema_version SET version = {self.param}", (version,))
+        cur.close()
+        conn.commit()
+
+    def replace_table(self, conn, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+        """DROP + CREATE `table` with TEXT columns, then insert `rows` (tuples in column order)."""
+        q = self.quote
+        cur = conn.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {table}")
+        cur.execute(f"CREATE TABLE {table} ({', '.join(f'{q(c)} TEXT' for c in columns)})")
+        if rows:
+            cols = ", ".join(q(c) for c in columns)
+            marks = ", ".join([self.param] * len(columns))
+            cur.executemany(f"INSERT INTO {table} ({cols}) VALUES ({marks})", rows)
+        cur.close()
+        conn.commit()
+
+    def create_table_as(self, conn, table: str, select_sql: str) -> None:
+        cur = conn.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {table}")
+        cur.execute(f"CREATE TABLE {table} AS {select_sql}")
+        cur.close()
+        conn.commit()
+
+    def query(self, conn, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        cols = [d[0] for d in cur.description]
+        rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+        cur.close()
+        return rows
+
+    @staticmethod
+    def quote(name: str) -> str:
+        return f"`{name}`"
+
+
+# ============================== MySQL ==============================
+
+class MySQLStorage(Storage):
+    name = "mysql"
+
+    def __init__(self, host: str = DB_HOST, port: int = DB_PORT, user: str = DB_USER,
+                 password: str = DB_PASS, database: str = DB_NAME):
+        self.host, self.port, self.user, self.password, self.database = host, port, user, password, database
+
+    def connect(self, init: bool = True):
+        import mysql.connector
+        if not init:
+            return mysql.connector.connect(host=self.host, port=self.port, user=self.user, password=self.password,
+                                           database=self.database, allow_local_infile=True)
+        conn = mysql.connector.connect(host=self.host, port=self.port, user=self.user, password=self.password,
+                                       allow_local_infile=True)
+        self.init_schema(conn)
+        conn.database = self.database
+        return conn
+
+    STIM_TYPES = {
+        "date_simulated": "DATE",
+        "acid_pct": "DECIMAL(7,3)",
+        "lbs_proppant": "DECIMAL(16,3)",
+        "top_ft": "DECIMAL(10,2)",
+        "bottom_ft": "DECIMAL(10,2)",
+        "stimulation_stages": "INT",
+        "volume": "DECIMAL(16,3)",
+        "max_pressure_psi": "DECIMAL(12,2)",
+        "max_treatment_rate_bbls_min": "DECIMAL(12,3)",
+    }
+    # (table, index name, kind, columns) added by schema version 2
+    V2_INDEXES = [
+        ("well_header", "idx_well_header_name_api", "INDEX", "(well_name, api)"),
+        ("well_header", "idx_well_header_api", "INDEX", "(api)"),
+        ("well_header", "idx_well_header_operator", "INDEX", "(operator)"),
+        ("well_header", "idx_well_header_latlon", "INDEX", "(latitude, longitude)"),
+        ("well_header", "idx_well_header_location", "SPATIAL INDEX", "(location)"),
+        ("well_stimulation", "idx_stim_date", "INDEX", "(date_simulated)"),
+        ("well_stimulation", "idx_stim_formation", "INDEX", "(stimulated_formation)"),
+        ("well_stimulation", "idx_stim_treatment", "INDEX", "(type_treatment)"),
+    ]
+    # lat/lon outside the valid range (or missing) map to POINT(0 0): a SPATIAL index needs NOT NULL
+    LOCATION_DDL = ("location POINT SRID 4326 GENERATED ALWAYS AS (IF("
+                    "latitude BETWEEN -90 AND 90 AND longitude BETWEEN -180 AND 180, "
+                    "ST_SRID(POINT(longitude, latitude), 4326), ST_SRID(POINT(0, 0), 4326))) STORED NOT NULL")
+
+    def init_schema(self, conn) -> None:
+        cur = conn.cursor()
+        cur.execute(
+            f"CREATE DATABASE IF NOT EXISTS {self.database} "
+            f"CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"
+        )
+        cur.execute(f"USE {self.database}")
+        existed = self.table_exists(conn, "well_stimulation")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS well_header (
+                pdf_name   VARCHAR(255) PRIMARY KEY,
+                operator   VARCHAR(255),
+                well_name  VARCHAR(255),
+                api        VARCHAR(32),
+                enseco_job VARCHAR(64),
+                job_type   VARCHAR(128),
+                county_state VARCHAR(256),
+                shl        TEXT,
+                latitude   DECIMAL(12,9),
+                longitude  DECIMAL(12,9),
+                datum      VARCHAR(128),
+                row_hash   CHAR(40),
+                KEY idx_well_header_name_api (well_name, api),
+                KEY idx_well_header_api (api)
+            )
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS well_stimulation (
+                pdf_name VARCHAR(255) PRIMARY KEY,
+                date_simulated DATE,
+                stimulated_formation VARCHAR(128),
+                type_treatment VARCHAR(128),
+                acid_pct DECIMAL(7,3),
+                lbs_proppant DECIMAL(16,3),
+                top_ft DECIMAL(10,2),
+                bottom_ft DECIMAL(10,2),
+                stimulation_stages INT,
+                volume DECIMAL(16,3),
+                volume_units VARCHAR(32),
+                max_pressure_psi DECIMAL(12,2),
+                max_treatment_rate_bbls_min DECIMAL(12,3),
+                details TEXT,
+                row_hash CHAR(40),
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                CONSTRAINT fk_stim_pdf FOREIGN KEY (pdf_name) REFERENCES well_header(pdf_name)
+                    ON DELETE CASCADE ON UPDATE CASCADE
+            )
+        """)
+        # tables created before row_hash existed
+        for table in TABLE_COLS:
+            if HASH_COL not in self.table_columns(conn, table):
+                cur.execute(f"ALTER TABLE {table} ADD COLUMN {HASH_COL} CHAR(40)")
+        if self._init_version(conn, existed) >= 2:
+            self.ensure_v2_extras(conn)
+        cur.close()
+        conn.commit()
+
+    def table_exists(self, conn, table: str) -> bool:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+                    (self.database, table))
+        found = cur.fetchall()[0][0] > 0
+        cur.close()
+        return found
+
+    def table_columns(self, conn, table: str) -> List[str]:
+        cur = conn.cursor()
+        cur.execute("SELECT COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s "
+                    "ORDER BY ORDINAL_POSITION", (self.database, table))
+        cols = [r[0] for r in cur.fetchall()]
+        cur.close()
+        return cols
+
+    def ensure_v2_extras(self, conn) -> None:
+        cur = conn.cursor()
+        if "location" not in self.table_columns(conn, "well_header"):
+            cur.execute(f"ALTER TABLE well_header ADD COLUMN {self.LOCATION_DDL}")
+        cur.execute("SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = %s",
+                    (self.database,))
+        have = {r[0] for r in cur.fetchall()}
+        for table, name, kind, cols in self.V2_INDEXES:
+            if name not in have:
+                cur.execute(f"ALTER TABLE {table} ADD {kind} {name} {cols}")
+        cur.close()
+        conn.commit()
+
+    def upsert_sql(self, table: str) -> str:
+        cols = WRITE_COLS[table]
+        updates = ", ".join(f"{c}=VALUES({c})" for c in cols if c != "pdf_name")
+        return (f"INSERT INTO {table} ({', '.join(cols)}) "
+                f"VALUES ({', '.join(f'%({c})s' for c in cols)}) "
+                f"ON DUPLICATE KEY UPDATE {updates}")
+
+    def bulk_load(self, conn, table: str, rows: Iterable[Dict[str, Any]], skip_unchanged: bool = True,
+                  counts: Optional[Dict[str, int]] = None) -> Dict[str, float]:
+        """
+        Normalized rows -> temporary TSV -> LOAD DATA LOCAL INFILE into a
+        TEMPORARY staging copy of `table` -> INSERT ... SELECT ... ON DUPLICATE
+        KEY UPDATE. The staging table has no foreign key, so load the parent
+        (well_header) before its children.
+        """
+        cols = WRITE_COLS[table]
+        stage = f"stage_{table}"
+        phases = {}
+        t0 = time.perf_counter()
+        fd, path = tempfile.mkstemp(prefix=f"{table}_", suffix=".tsv")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                for row in rows:
+                    row = with_hash(table, row)
+                    f.write("\t".join(tsv_field(row.get(c)) for c in cols) + "\n")
+            phases["write"] = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            cur = conn.cursor()
+            cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {stage}")
+            # plain copy of the write columns: no FK, generated or spatial columns
+            cur.execute(f"CREATE TEMPORARY TABLE {stage} (PRIMARY KEY (pdf_name)) "
+                        f"SELECT {', '.join(cols)} FROM {table} LIMIT 0")
+            # REPLACE: a pdf_name repeated in the file keeps its last row, as the upserts do
+            cur.execute(
+                f"LOAD DATA LOCAL INFILE %s REPLACE INTO TABLE {stage} CHARACTER SET utf8mb4 "
+                f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                f"({', '.join(cols)})", (path,))
+            phases["load"] = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            self._stage_counts(cur, table, stage, skip_unchanged,
+                               f"DELETE s FROM {stage} s JOIN {table} t ON t.pdf_name = s.pdf_name "
+                               f"WHERE t.{HASH_COL} = s.{HASH_COL}", counts)
+            updates = ", ".join(f"{c}=VALUES({c})" for c in cols if c != "pdf_name")
+            cur.execute(f"INSERT INTO {table} ({', '.join(cols)}) SELECT {', '.join(cols)} FROM {stage} "
+                        f"ON DUPLICATE KEY UPDATE {updates}")
+            cur.execute(f"DROP TEMPORARY TABLE {stage}")
+            cur.close()
+            conn.commit()
+            phases["merge"] = time.perf_counter() - t0
+        finally:
+            os.unlink(path)
+        return phases
+
+    def describe(self) -> str:
+        return f"mysql {self.user}@{self.host}:{self.port}/{self.database}"
+
+
+# ============================== SQLite ==============================
+
+class SQLiteStorage(Storage):
+    name = "sqlite"
+    param = "?"
+    max_writers = 1                   # one WAL writer at a time; more only contend for the lock
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+
+    def connect(self, init: bool = True):
+        # pooled connections move between threads, one user at a time
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        if init:
+            self.init_schema(conn)
+        return conn
+
+    STIM_TYPES = {
+        "date_simulated": "DATE",          # ISO text; NUMERIC affinity leaves it as text
+        "acid_pct": "REAL",
+        "lbs_proppant": "REAL",
+        "top_ft": "REAL",
+        "bottom_ft": "REAL",
+        "stimulation_stages": "INTEGER",
+        "volume": "REAL",
+        "max_pressure_psi": "REAL",
+        "max_treatment_rate_bbls_min": "REAL",
+    }
+    # no POINT type without SpatiaLite: the (latitude, longitude) index serves map queries
+    V2_INDEX_SQL = """
+        CREATE INDEX IF NOT EXISTS idx_well_header_operator ON well_header (operator);
+        CREATE INDEX IF NOT EXISTS idx_stim_date ON well_stimulation (date_simulated);
+        CREATE INDEX IF NOT EXISTS idx_stim_formation ON well_stimulation (stimulated_formation);
+        CREATE INDEX IF NOT EXISTS idx_stim_treatment ON well_stimulation (type_treatment);
+    """
+
+    def init_schema(self, conn) -> None:
+        existed = self.table_exists(conn, "well_stimulation")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS well_header (
+                pdf_name     TEXT PRIMARY KEY,
+                operator     TEXT,
+                well_name    TEXT,
+                api          TEXT,
+                enseco_job   TEXT,
+                job_type     TEXT,
+                county_state TEXT,
+                shl          TEXT,
+                latitude     REAL,
+                longitude    REAL,
+                datum        TEXT,
+                row_hash     TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_well_header_name_api ON well_header (well_name, api);
+            CREATE INDEX IF NOT EXISTS idx_well_header_api ON well_header (api);
+            CREATE INDEX IF NOT EXISTS idx_well_header_latlon ON well_header (latitude, longitude);
+
+            CREATE TABLE IF NOT EXISTS well_stimulation (
+                pdf_name TEXT PRIMARY KEY
+                    REFERENCES well_header(pdf_name) ON DELETE CASCADE ON UPDATE CASCADE,
+                date_simulated DATE,
+                stimulated_formation TEXT,
+                type_treatment TEXT,
+                acid_pct REAL,
+                lbs_proppant REAL,
+                top_ft REAL,
+                bottom_ft REAL,
+                stimulation_stages INTEGER,
+                volume REAL,
+                volume_units TEXT,
+                max_pressure_psi REAL,
+                max_treatment_rate_bbls_min REAL,
+                details TEXT,
+                row_hash TEXT,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        # tables created before row_hash existed
+        for table in TABLE_COLS:
+            if HASH_COL not in self.table_columns(conn, table):
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {HASH_COL} TEXT")
+        if self._init_version(conn, existed) >= 2:
+            self.ensure_v2_extras(conn)
+        conn.commit()
+
+    def table_exists(self, conn, table: str) -> bool:
+        return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone() is not None
+
+    def table_columns(self, conn, table: str) -> List[str]:
+        return [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+
+    def ensure_v2_extras(self, conn) -> None:
+        conn.executescript(self.V2_INDEX_SQL)
+
+    def upsert_sql(self, table: str) -> str:
+        cols = WRITE_COLS[table]
+        updates = ", ".join(f"{c}=excluded.{c}" for c in cols if c != "pdf_name")
+        if table == "well_stimulation":
+            updates += ", updated_at=CURRENT_TIMESTAMP"
+        return (f"INSERT INTO {table} ({', '.join(cols)}) "
+                f"VALUES ({', '.join(f':{c}' for c in cols)}) "
+                f"ON CONFLICT(pdf_name) DO UPDATE SET {updates}")
+
+    def bulk_load(self, conn, table: str, rows: Iterable[Dict[str, Any]], skip_unchanged: bool = True,
+                  counts: Optional[Dict[str, int]] = None) -> Dict[str, float]:
+        """
+        SQLite has no LOAD DATA: rows go into a TEMP staging table with plain
+        INSERTs, then one INSERT ... SELECT ... ON CONFLICT merge.
+        """
+        cols = WRITE_COLS[table]
+        stage = f"stage_{table}"
+        phases = {"write": 0.0}
+        t0 = time.perf_counter()
+        conn.execute(f"DROP TABLE IF EXISTS temp.{stage}")
+        conn.execute(f"CREATE TEMP TABLE {stage} ({', '.join(cols)}, PRIMARY KEY (pdf_name))")
+        # OR REPLACE: a pdf_name repeated in the batch keeps its last row, as the upserts do
+        conn.executemany(f"INSERT OR REPLACE INTO {stage} VALUES ({', '.join(f':{c}' for c in cols)})",
+                         ({c: r.get(c) for c in cols} for r in (with_hash(table, row) for row in rows)))
+        phases["load"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        cur = conn.cursor()
+        self._stage_counts(cur, table, stage, skip_unchanged,
+                           f"DELETE FROM {stage} WHERE pdf_name IN (SELECT s.pdf_name FROM {stage} s "
+                           f"JOIN {table} t ON t.pdf_name = s.pdf_name WHERE t.{HASH_COL} = s.{HASH_COL})", counts)
+        updates = self.upsert_sql(table).split(" DO UPDATE SET ", 1)[1]
+        cur.execute(f"INSERT INTO {table} ({', '.join(cols)}) SELECT {', '.join(cols)} FROM {stage} "
+                    f"WHERE true ON CONFLICT(pdf_name) DO UPDATE SET {updates}")
+        cur.execute(f"DROP TABLE temp.{stage}")
+        cur.close()
+        conn.commit()
+        phases["merge"] = time.perf_counter() - t0
+        return phases
+
+    def replace_table(self, conn, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+        super().replace_table(conn, table, columns, rows)
+        if {"well_name", "api"} <= set(columns):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_name_api ON {table} (well_name, api)")
+            conn.commit()
+
+    def create_table_as(self, conn, table: str, select_sql: str) -> None:
+        super().create_table_as(conn, table, select_sql)
+        cols = set(self.table_columns(conn, table))
+        if "pdf_name" in cols:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_pdf ON {table} (pdf_name)")
+        if {"latitude", "longitude"} <= cols:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_latlon ON {table} (latitude, longitude)")
+        conn.commit()
+
+    @staticmethod
+    def quote(name: str) -> str:
+        return f'"{name}"'
+
+    def describe(self) -> str:
+        return f"sqlite {os.path.abspath(self.path)}"
+
+
+class ConnectionPool:
+    """
+    Up to `size` connections from storage.connect(), opened on first use and
+    reused. A connection that raised is closed instead of going back to the
+    pool. The caller has already initialized the schema on its own
+    connection, so pooled ones skip init_schema.
+    """
+
+    def __init__(self, storage: Storage, size: int):
+        self.storage = storage
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self.storage.connect(init=False)
+            try:
+                yield conn
+            except Exception:
+                try:
+                    conn.rollback()
+                finally:
+                    conn.close()
+                raise
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def tsv_field(v: Any) -> str:
+    """One LOAD DATA field: NULL as \\N, backslash/tab/newline escaped."""
+    if v is None:
+        return "\\N"
+    return (str(v).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def get_storage(backend: Optional[str] = None, sqlite_path: Optional[str] = None) -> Storage:
+    backend = (backend or DB_BACKEND).lower()
+    if backend == "mysql":
+        return MySQLStorage()
+    if backend == "sqlite":
+        return SQLiteStorage(sqlite_path or SQLITE_PATH)
+    raise ValueError(f"unknown storage backend: {backend} (choose from {', '.join(BACKENDS)})")
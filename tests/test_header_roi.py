@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pdf_extraction as pe
+
+HEADER = "\n".join([
+    "Well Operator: RIM OPERATING, INC.",
+    "Well Name: LEWIS FEDERAL 5-12",
+    "API #: 33-053-01234",
+    "Latitude: 48.12345",
+    "Longitude: -103.54321",
+    "Datum: NAD83",
+])
+STIM = "\n".join([
+    "Date Stimulated  Stimulated Formation  Top (Ft)  Bottom (Ft)  Stimulation Stages  Volume  Volume Units",
+    "5/12/2014  Bakken  10500  20100  30  120,000  Barrels",
+    "Type Treatment  Sand Frac",
+])
+
+
+def fake_ocr(monkeypatch, full_pages):
+    """Scanned PDF with no text layer: ROI OCR returns only the header band, full OCR the whole page."""
+    calls = {"roi": [], "full": []}
+
+    def ocr_header_roi(pdf_path, page_numbers, dpi=300, timer=None, preprocess=()):
+        calls["roi"] += list(page_numbers)
+        return {n: HEADER for n in page_numbers if n == 1}
+
+    def ocr_pages(pdf_path, page_numbers, dpi=300, timer=None, low_dpi=None, min_conf=0, preprocess=()):
+        calls["full"] += list(page_numbers)
+        return {n: full_pages[n - 1] for n in page_numbers}
+
+    monkeypatch.setattr(pe, "pdfplumber", None)
+    monkeypatch.setattr(pe, "convert_from_path", object())
+    monkeypatch.setattr(pe, "pytesseract", object())
+    monkeypatch.setattr(pe, "page_count", lambda path: len(full_pages))
+    monkeypatch.setattr(pe, "ocr_header_roi", ocr_header_roi)
+    monkeypatch.setattr(pe, "ocr_pages", ocr_pages)
+    return calls
+
+
+def test_two_page_document_keeps_stimulation_fields(monkeypatch):
+    full = [HEADER + "\n" + STIM, "Details\n40/70 white sand"]
+    calls = fake_ocr(monkeypatch, full)
+
+    pages = pe.extract_pages_text(Path("W2.pdf"), header_roi=True)
+
+    assert calls["roi"] == []                 # no band shortcut on a 2-page document
+    header = pe.parse_header(pages, "W2.pdf")
+    stim = pe.parse_stimulation(pages, "W2.pdf")
+    assert header.api is not None
+    assert stim.stimulated_formation == "Bakken"
+    assert stim.volume is not None
+
+
+def test_band_only_header_pages_reocred_when_later_pages_blank(monkeypatch):
+    full = [HEADER + "\n" + STIM, "", "", ""]
+    calls = fake_ocr(monkeypatch, full)
+
+    pages = pe.extract_pages_text(Path("W4.pdf"), header_roi=True)
+
+    assert calls["roi"] == [1, 2]
+    assert pe.parse_stimulation(pages, "W4.pdf").stimulated_formation == "Bakken"
+
+
+def test_band_shortcut_used_when_stimulation_is_on_later_pages(monkeypatch):
+    full = [HEADER + "\nfiller", "filler", STIM, "filler"]
+    calls = fake_ocr(monkeypatch, full)
+
+    pages = pe.extract_pages_text(Path("W4.pdf"), header_roi=True)
+
+    assert sorted(calls["full"]) == [3, 4]   # header pages read from the band only
+    assert pe.parse_stimulation(pages, "W4.pdf").stimulated_formation == "Bakken"
@@ -0,0 +1,37 @@
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pdf_extraction as pe
+
+CULPRIT = "W007.pdf"
+
+
+def crashing_extract(pdf, opts, timeout=None, cache=None, hash_pdf=False):
+    # runs in the worker process: the culprit takes its whole process down
+    if pdf.name == CULPRIT:
+        time.sleep(0.05)
+        os._exit(1)
+    time.sleep(0.02)
+    return pe.ExtractResult(pdf.name, "ok", header={"pdf_name": pdf.name})
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="workers must inherit the patched extract_one (fork start method)")
+def test_worker_crash_only_fails_the_culprit(monkeypatch):
+    monkeypatch.setattr(pe, "extract_one", crashing_extract)
+    pdfs = [Path(f"W{i:03d}.pdf") for i in range(20)]
+
+    results = list(pe.iter_extract(pdfs, pe.OcrOptions(), workers=3))
+
+    assert [r.pdf_name for r in results] == [p.name for p in pdfs]
+    by_name = {r.pdf_name: r for r in results}
+    assert by_name[CULPRIT].status == "error"
+    assert "crashed" in by_name[CULPRIT].error
+    assert all(r.status == "ok" for r in results if r.pdf_name != CULPRIT)
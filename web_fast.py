@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Browserless fast path for web_scraping.py. The fields we keep (Well Status,
+Well Type, Closest City and the oil/gas block_stat badges) are plain table
+cells and spans in the served HTML, so one search request, one detail
+request and an HTML parse are enough for most wells:
+
+  HttpPool       keep-alive http.client connections per host, thread-safe,
+                 follows redirects, gzip-aware
+  fetch_fast     search -> first matching result link -> detail page -> row
+
+Standard library only. Anything the fast path cannot resolve (no result
+link, an HTTP error, a detail page without the expected fields) raises
+FastPathMiss and web_scraping falls back to Playwright for that well.
+"""
+
+import gzip, queue, re, threading, zlib
+import http.client
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, quote_plus, urljoin, urlsplit
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/122.0.0.0 Safari/537.36")
+HTTP_TIMEOUT = 6.0       # seconds per request (same budget as FAST_NAV_TIMEOUT)
+MAX_REDIRECTS = 5
+
+TABLE_LABELS = {"well_status": "Well Status", "well_type": "Well Type", "closest_city": "Closest City"}
+BADGE_LABELS = {"oil_badge": "Barrels of Oil Produced", "gas_badge": "MCF of Gas Produced"}
+
+MEMBERS_ONLY = re.compile(r"^\s*Members?\s+Only\s*$", re.I)
+
+
+class FastPathMiss(Exception):
+    """The page could not be resolved without a browser."""
+
+
+def _norm(s: Optional[str]) -> str:
+    s = " ".join((s or "").split())
+    return "N/A" if (not s or MEMBERS_ONLY.match(s)) else s
+
+
+def search_url(base_url: str, well_name: str, api_num: str) -> str:
+    q = {
+        "type": "wells", "operator_name": "", "well_name": well_name, "api_no": api_num,
+        "lease_key": "", "state": "", "county": "", "section": "", "township": "", "range": "",
+        "min_boe": "", "max_boe": "", "min_depth": "", "max_depth": "", "field_formation": "",
+    }
+    return base_url + "/search?" + urlencode(q, quote_via=quote_plus)
+
+
+# ============================== HTTP ==============================
+
+class HttpPool:
+    """
+    Idle keep-alive connections per (scheme, host, port). A connection is
+    used by one thread at a time and goes back to the pool unless the server
+    asked to close it; a request on a reused connection that turns out to be
+    stale is retried once on a fresh one.
+    """
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT, per_host: int = 8):
+        self.timeout = timeout
+        self.per_host = per_host
+        self._idle: Dict[Tuple[str, str, int], queue.LifoQueue] = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "connections": 0}
+
+    def _queue(self, key) -> queue.LifoQueue:
+        with self._lock:
+            return self._idle.setdefault(key, queue.LifoQueue(maxsize=self.per_host))
+
+    def _connect(self, scheme: str, host: str, port: int) -> http.client.HTTPConnection:
+        self.stats["connections"] += 1
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout)
+
+    def _request(self, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        u = urlsplit(url)
+        scheme = u.scheme or "http"
+        key = (scheme, u.hostname or "", u.port or (443 if scheme == "https" else 80))
+        path = (u.path or "/") + ("?" + u.query if u.query else "")
+        idle = self._queue(key)
+        headers = {"User-Agent": USER_AGENT, "Accept": "text/html", "Accept-Encoding": "gzip",
+                   "Connection": "keep-alive"}
+        for fresh in (False, True):
+            try:
+                conn = idle.get_nowait() if not fresh else None
+            except queue.Empty:
+                conn = None
+            reused = conn is not None
+            conn = conn or self._connect(*key)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, ConnectionError) as e:
+                conn.close()
+                if reused:
+                    continue          # stale keep-alive connection: retry once on a new one
+                if isinstance(e, http.client.HTTPException):
+                    raise FastPathMiss(f"bad HTTP response from {key[1]}: {e!r}") from e
+                raise
+            except (LookupError, ValueError) as e:     # InvalidURL and friends
+                conn.close()
+                raise FastPathMiss(f"cannot request {url}: {e}") from e
+            except Exception:
+                conn.close()
+                raise
+            self.stats["requests"] += 1
+            if resp.will_close:
+                conn.close()
+            else:
+                try:
+                    idle.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            hdrs = {k.lower(): v for k, v in resp.getheaders()}
+            if hdrs.get("content-encoding") == "gzip":
+                try:
+                    body = gzip.decompress(body)
+                except (OSError, EOFError, zlib.error) as e:
+                    raise FastPathMiss(f"corrupt gzip body from {url}") from e
+            return resp.status, hdrs, body
+        raise FastPathMiss(f"no usable connection to {key[1]}")
+
+    def get(self, url: str) -> Tuple[str, str]:
+        """GET `url`, following redirects. Returns (final url, decoded html)."""
+        for _ in range(MAX_REDIRECTS + 1):
+            try:
+                status, hdrs, body = self._request(url)
+            except (http.client.HTTPException, LookupError, ValueError) as e:   # e.g. InvalidURL, bad port
+                raise FastPathMiss(f"cannot fetch {url}: {e!r}") from e
+            if status in (301, 302, 303, 307, 308) and "location" in hdrs:
+                url = urljoin(url, hdrs["location"])
+                continue
+            if status != 200:
+                raise FastPathMiss(f"HTTP {status} for {url}")
+            m = re.search(r"charset=([\w-]+)", hdrs.get("content-type", ""))
+            try:
+                return url, body.decode(m.group(1) if m else "utf-8", errors="replace")
+            except LookupError as e:
+                raise FastPathMiss(f"unknown charset {m.group(1)!r} for {url}") from e
+        raise FastPathMiss(f"too many redirects for {url}")
+
+    def close(self) -> None:
+        with self._lock:
+            for idle in self._idle.values():
+                while not idle.empty():
+                    idle.get_nowait().close()
+            self._idle.clear()
+
+
+# ============================== HTML ==============================
+
+class LinkParser(HTMLParser):
+    """Every <a href> on the page with its text, in document order."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: List[Tuple[str, str]] = []
+        self._href: Optional[str] = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href is not None:
+            self.links.append((self._href, " ".join("".join(self._text).split())))
+            self._href = None
+
+
+class DetailParser(HTMLParser):
+    """
+    <th>label</th><td>value</td> pairs (first td after each th in a row) and
+    <p class="block_stat"> paragraphs with their first span.dropcap number.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.cells: List[Tuple[str, str]] = []
+        self.stats: List[Tuple[str, str]] = []
+        self._cell: Optional[str] = None      # "th" / "td" while inside one
+        self._buf: List[str] = []
+        self._label: Optional[str] = None     # last th in the current row, waiting for its td
+        self._p: Optional[List[str]] = None   # text of the open block_stat paragraph
+        self._drop: Optional[List[str]] = None
+        self._in_drop = False
+
+    @staticmethod
+    def _text(parts: List[str]) -> str:
+        return " ".join("".join(parts).split())
+
+    def handle_starttag(self, tag, attrs):
+        cls = (dict(attrs).get("class") or "").split()
+        if tag == "tr":
+            self._label = None
+        elif tag in ("th", "td"):
+            self._cell, self._buf = tag, []
+        elif tag == "p" and "block_stat" in cls:
+            self._p, self._drop = [], None
+        elif tag == "span" and self._p is not None and "dropcap" in cls and self._drop is None:
+            self._drop, self._in_drop = [], True
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._buf.append(data)
+        if self._p is not None:
+            self._p.append(data)
+        if self._in_drop:
+            self._drop.append(data)
+
+    def handle_endtag(self, tag):
+        if tag in ("th", "td") and self._cell == tag:
+            if tag == "th":
+                self._label = self._text(self._buf)
+            elif self._label is not None:
+                self.cells.append((self._label, self._text(self._buf)))
+                self._label = None
+            self._cell = None
+        elif tag == "span" and self._in_drop:
+            self._in_drop = False
+        elif tag == "p" and self._p is not None:
+            self.stats.append((self._text(self._p), self._text(self._drop or [])))
+            self._p = self._drop = None
+            self._in_drop = False
+
+    def table_value(self, label: str) -> Optional[str]:
+        for th, td in self.cells:
+            if th == label:
+                return td
+        for th, td in self.cells:
+            if label in th:
+                return td
+        return None
+
+    def badge(self, label: str) -> Optional[str]:
+        for text, drop in self.stats:
+            if label in text:
+                return drop
+        return None
+
+
+def pick_result(html: str, page_url: str, well_name: str, api_num: str) -> Optional[str]:
+    """First result link, tried in the same order as the browser path's selectors."""
+    p = LinkParser()
+    p.feed(html)
+    links = [(urljoin(page_url, href), text) for href, text in p.links if href and not href.startswith("#")]
+    name = well_name.lower()
+    rules = [
+        lambda h, t: api_num and f"/{api_num}" in urlsplit(h).path,
+        lambda h, t: "/wells/" in urlsplit(h).path,
+        lambda h, t: name and name in t.lower(),
+        lambda h, t: api_num and api_num in t,
+    ]
+    for rule in rules:
+        for href, text in links:
+            if rule(href, text):
+                return href
+    return None
+
+
+def parse_detail(html: str) -> dict:
+    p = DetailParser()
+    p.feed(html)
+    found = {k: p.table_value(label) for k, label in TABLE_LABELS.items()}
+    found.update({k: p.badge(label) for k, label in BADGE_LABELS.items()})
+    if all(v is None for v in found.values()):
+        raise FastPathMiss("detail page has none of the expected fields")
+    return {k: _norm(v) for k, v in found.items()}
+
+
+def fetch_fast(pool: HttpPool, well_name: str, api_num: str, base_url: str) -> dict:
+    """Field dict for one well (blank_row keys minus well_name/api), or FastPathMiss."""
+    url, html = pool.get(search_url(base_url, well_name, api_num))
+    link = pick_result(html, url, well_name, api_num)
+    if link is None:
+        raise FastPathMiss("no matching search result")
+    _, html = pool.get(link)
+    return parse_detail(html)
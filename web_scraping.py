@@ -1,56 +1,40 @@
 import re
 import pandas as pd
 import asyncio
+import argparse
 from playwright.async_api import async_playwright, TimeoutError as PWTimeoutError, Error as PWError
-import mysql.connector
-from dotenv import load_dotenv
-import os
-import math
-from sqlalchemy import create_engine
+import math, random, time
+from contextlib import asynccontextmanager
 from typing import List, Tuple, Optional
-from urllib.parse import urlencode, quote_plus
+from urllib.parse import urlsplit
 
+import web_fast
+from storage import get_storage, BACKENDS, Storage, HEADER_COLS
 
-load_dotenv()
-
-DB_HOST = os.getenv("DB_HOST", "127.0.0.1")
-DB_PORT = int(os.getenv("DB_PORT", 3306))
-DB_USER = os.getenv("DB_USER", "phpmyadmin")
-DB_PASS = os.getenv("DB_PASS", "root")
-DB_NAME = os.getenv("DB_NAME", "oilwell_pdf_extraction")
 
 # read well information table from database containing information extracted from PDF
-def read_table():
-    conn = mysql.connector.connect(host=DB_HOST, port=DB_PORT, user=DB_USER, password=DB_PASS)
-    cur = conn.cursor()
-    cur.execute(f"USE {DB_NAME}")
-    
-    sql = """
-        SELECT well_name, api FROM well_header;
-    """
-
-    df = pd.read_sql(sql, conn)
-
-    conn.commit()
-    cur.close()
-    conn.close()
-
-    return df
-
-df = read_table()
-
-# create a list contains all well name and API
-well_list = []
-for i in range(len(df)):
-    well_name = df.iloc[i, 0]
-    well_api = df.iloc[i, 1]
-    well_list.append((well_name, well_api))
+def read_table(storage: Storage) -> pd.DataFrame:
+    conn = storage.connect(init=False)
+    try:
+        rows = storage.query(conn, "SELECT well_name, api FROM well_header")
+    finally:
+        conn.close()
+    return pd.DataFrame(rows, columns=["well_name", "api"])
 
 # extract well_status, well_type, closest_city, oil_badge, gas_badge from web and store in a pandas DataFrame
 # if the field value is not exist, it will use N/A to represent the missing value
 FAST_NAV_TIMEOUT   = 6000  
 FAST_CLICK_TIMEOUT = 1500  
 PER_WELL_TIMEOUT   = 18.0  
+RECYCLE_AFTER      = 50     # wells served by one browser context before it is replaced
+CONCURRENCY        = 4      # wells scraped at once (one browser context each)
+RATE_PER_HOST      = 2.0    # page loads per second allowed against one host
+RETRIES            = 2      # extra attempts for a well that timed out
+BACKOFF_BASE       = 2.0    # seconds; doubled per retry and jittered
+PAGES_PER_WELL     = 2      # search page + detail page
+FETCH_MODES        = ("auto", "http", "browser")   # auto: plain HTTP first, Playwright when that misses
+
+BASE_URL = "https://www.drillingedge.com"
 
 # regex for number tokens like 2.1k
 NUM_TOKEN = r"[0-9][0-9.,]*\s*[kKmMbB]?"
@@ -129,26 +113,9 @@ async def extract_required_fields(page) -> dict:
 
 # open search results page by changing the URL of the pages with prefilled parameters (well_name  and api)
 # click the first matching link to open the detail page
-async def search_and_open_detail(page, well_name: str, api_num: str) -> bool:
+async def search_and_open_detail(page, well_name: str, api_num: str, base_url: Optional[str] = None) -> bool:
     page.set_default_timeout(FAST_NAV_TIMEOUT)
-    q = {
-        "type": "wells",
-        "operator_name": "",
-        "well_name": well_name,
-        "api_no": api_num,
-        "lease_key": "",
-        "state": "",
-        "county": "",
-        "section": "",
-        "township": "",
-        "range": "",
-        "min_boe": "",
-        "max_boe": "",
-        "min_depth": "",
-        "max_depth": "",
-        "field_formation": "",
-    }
-    url = "https://www.drillingedge.com/search?" + urlencode(q, quote_via=quote_plus)
+    url = web_fast.search_url(base_url or BASE_URL, well_name, api_num)
     await page.goto(url, wait_until="domcontentloaded")
 
     for sel in ("button:has-text('Accept')", "button:has-text('Agree')", "button:has-text('Close')"):
@@ -186,121 +153,382 @@ async def search_and_open_detail(page, well_name: str, api_num: str) -> bool:
 
     return False
 
-# organize and call functions above to execute launch the browser, navigate through search URL, extract required fields, return a dictionary containing values
-async def fetch_one(well_name: str, api_num: str, per_well_timeout: float = PER_WELL_TIMEOUT) -> dict:
-    safe_prefix = re.sub(r"[^A-Za-z0-9_-]+", "_", well_name)[:40]
+# one Chromium for the whole run; contexts (each with one page) are handed out
+# from a pool and reused across wells. A context is replaced after
+# `recycle_after` wells or as soon as a well fails on it, so cookies, leaked
+# listeners or a wedged page never carry over for long.
+BLOCKED_RESOURCES = {"image", "media", "font", "stylesheet"}
+
+def _same_site(url: str, host: str) -> bool:
+    h = urlsplit(url).hostname or ""
+    site = host.split(".", 1)[1] if host.startswith("www.") else host
+    return h == site or h.endswith("." + site)
+
+class BrowserPool:
+    def __init__(self, size: int = 1, recycle_after: int = RECYCLE_AFTER, base_url: Optional[str] = None):
+        self.size = max(1, size)
+        self.recycle_after = max(1, recycle_after)
+        self.host = urlsplit(base_url or BASE_URL).hostname or ""
+        self._pw = self._browser = None
+        self._idle: asyncio.Queue = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(self.size)
+        self._starting = asyncio.Lock()
+        self.stats = {"contexts": 0, "recycled": 0, "failed": 0, "blocked": 0, "relaunched": 0}
+
+    # Chromium is launched by the first page() call, so a run served entirely
+    # by the HTTP fast path never starts a browser
+    async def start(self) -> "BrowserPool":
+        async with self._starting:
+            if self._browser is None:
+                self._pw = await async_playwright().start()
+                self._browser = await self._pw.chromium.launch(
+                    headless=True,
+                    args=["--disable-blink-features=AutomationControlled"]
+                )
+        return self
+
+    @property
+    def started(self) -> bool:
+        return self._browser is not None
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
+        if self._browser is not None: await self._browser.close()
+        if self._pw is not None: await self._pw.stop()
+        self._browser = self._pw = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _route(self, route) -> None:
+        req = route.request
+        if req.resource_type in BLOCKED_RESOURCES or not _same_site(req.url, self.host):
+            self.stats["blocked"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _new_slot(self) -> list:
+        ctx = await self._browser.new_context(
+            viewport={"width": 1366, "height": 900},
+            java_script_enabled=True,
+            bypass_csp=True,
+            user_agent=("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                        "AppleWebKit/537.36 (KHTML, like Gecko) "
+                        "Chrome/122.0.0.0 Safari/537.36"),
+            ignore_https_errors=True,
+        )
+        await ctx.route("**/*", self._route)
+        self.stats["contexts"] += 1
+        return [ctx, await ctx.new_page(), 0]     # context, page, wells served
+
+    async def _discard(self, slot: list) -> None:
+        try:
+            await slot[0].close()
+        except PWError:
+            pass
 
-    async def _inner():
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=["--disable-blink-features=AutomationControlled"]
-            )
-            ctx = await browser.new_context(
-                viewport={"width": 1366, "height": 900},
-                java_script_enabled=True,
-                bypass_csp=True,
-                user_agent=("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                            "AppleWebKit/537.36 (KHTML, like Gecko) "
-                            "Chrome/122.0.0.0 Safari/537.36"),
-                ignore_https_errors=True,
-            )
-            page = await ctx.new_page()
+    async def _relaunch(self) -> None:
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
+        try:
+            if self._browser is not None: await self._browser.close()
+        except PWError:
+            pass
+        self._browser = None
+        self.stats["relaunched"] += 1
+        await self.start()
+
+    async def _checkout(self) -> list:
+        await self.start()
+        if not self._idle.empty():
+            return self._idle.get_nowait()
+        try:
+            return await self._new_slot()
+        except PWTimeoutError:
+            raise
+        except PWError:
+            # new_context fails once Chromium has crashed or disconnected: start a new one
+            await self._relaunch()
+            return await self._new_slot()
+
+    @asynccontextmanager
+    async def page(self):
+        """Lend a page for one well. Any exception (including a timeout
+        cancelling the caller) retires its context instead of returning it."""
+        async with self._slots:
+            slot = await self._checkout()
             try:
-                base = blank_row(well_name, api_num)  # default row with all lowercase keys
+                yield slot[1]
+            except BaseException:
+                self.stats["failed"] += 1
+                await asyncio.shield(self._discard(slot))
+                raise
+            slot[2] += 1
+            if slot[2] >= self.recycle_after or slot[1].is_closed():
+                self.stats["recycled"] += 1
+                await self._discard(slot)
+            else:
+                self._idle.put_nowait(slot)
+
+# navigate through search URL on a pooled page, extract required fields, return a dictionary containing values
+async def scrape_on_page(page, well_name: str, api_num: str, base_url: Optional[str] = None) -> dict:
+    base = blank_row(well_name, api_num)  # default row with all lowercase keys
+
+    ok = await search_and_open_detail(page, well_name, api_num, base_url)
+    if not ok:
+        return base
+
+    try:
+        await page.wait_for_selector("text=Well Details", timeout=1800)
+    except Exception:
+        pass
 
-                ok = await search_and_open_detail(page, well_name, api_num)
-                if not ok:
-                    return base
+    data = await extract_required_fields(page)
+    base.update(data)  # merge into the lowercase template
+    return base
 
-                try:
-                    await page.wait_for_selector("text=Well Details", timeout=1800)
-                except Exception:
-                    pass
+async def save_failure(page, safe_prefix: str) -> None:
+    try:
+        await page.screenshot(path=f"fail_{safe_prefix}.png", full_page=True)
+        html = await page.content()
+        with open(f"fail_{safe_prefix}.html", "w", encoding="utf-8") as f:
+            f.write(html)
+    except Exception:
+        pass
 
-                data = await extract_required_fields(page)
-                base.update(data)  # merge into the lowercase template
-                return base
+class WellFailed(Exception):
+    """Raised inside BrowserPool.page() so the context that failed is retired."""
 
+# scrape one well on a page borrowed from `pool`; without a pool a one-off browser is started (slow: tests/debugging only)
+async def fetch_one(well_name: str, api_num: str, per_well_timeout: float = PER_WELL_TIMEOUT,
+                    pool: Optional[BrowserPool] = None, base_url: Optional[str] = None) -> dict:
+    if pool is None:
+        async with BrowserPool(size=1, base_url=base_url) as own:
+            return await fetch_one(well_name, api_num, per_well_timeout, pool=own, base_url=base_url)
+
+    safe_prefix = re.sub(r"[^A-Za-z0-9_-]+", "_", well_name)[:40]
+
+    # timeouts and network errors go up unchanged so fetch_with_retry can retry
+    # them; anything else is a page problem and the well is left as N/A
+    async def _inner():
+        async with pool.page() as page:
+            try:
+                return await scrape_on_page(page, well_name, api_num, base_url)
+            except (PWTimeoutError, asyncio.TimeoutError, OSError):
+                await save_failure(page, safe_prefix)
+                raise
             except Exception as e:
+                await save_failure(page, safe_prefix)
+                raise WellFailed(str(e)) from e
+
+    try:
+        return await asyncio.wait_for(_inner(), timeout=per_well_timeout)
+    except WellFailed:
+        return blank_row(well_name, api_num)
+    except PWTimeoutError:
+        raise
+    except PWError as e:      # no page could be opened, even on a relaunched browser
+        print(f"[WARN] {well_name} ({api_num}): browser unavailable: {e}")
+        return blank_row(well_name, api_num)
+
+# token bucket per host: `rate` tokens/sec refill up to `burst`; a well takes
+# PAGES_PER_WELL tokens before each attempt, so concurrency never turns into
+# a burst of page loads against the site
+class HostRateLimiter:
+    def __init__(self, rate: float = RATE_PER_HOST, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = max(float(PAGES_PER_WELL), burst if burst is not None else rate)
+        self._buckets = {}    # host -> [tokens, last refill, lock]
+
+    async def acquire(self, url: str, cost: float = 1.0) -> None:
+        if self.rate <= 0:
+            return
+        host = urlsplit(url).hostname or url
+        b = self._buckets.setdefault(host, [self.burst, time.monotonic(), asyncio.Lock()])
+        cost = min(cost, self.burst)
+        async with b[2]:
+            while True:
+                now = time.monotonic()
+                b[0] = min(self.burst, b[0] + (now - b[1]) * self.rate)
+                b[1] = now
+                if b[0] >= cost:
+                    b[0] -= cost
+                    return
+                await asyncio.sleep((cost - b[0]) / self.rate)
+
+# plain HTTP + HTML parser (web_fast); None when the page needs a browser
+async def fetch_http(http: web_fast.HttpPool, well_name: str, api_num: str, base_url: str,
+                     per_well_timeout: float = PER_WELL_TIMEOUT) -> Optional[dict]:
+    try:
+        data = await asyncio.wait_for(asyncio.to_thread(web_fast.fetch_fast, http, well_name, api_num, base_url),
+                                      timeout=per_well_timeout)
+    except web_fast.FastPathMiss:
+        return None
+    row = blank_row(well_name, api_num)
+    row.update(data)
+    return row
+
+# retry a well that timed out, with exponential backoff and +/-50% jitter;
+# after the last attempt it is recorded with N/A fields like any other failure.
+# In "auto" mode each attempt tries plain HTTP first and only falls back to
+# the browser when that misses or errors.
+async def fetch_with_retry(pool: BrowserPool, limiter: HostRateLimiter, well_name: str, api_num: str,
+                           per_well_timeout: float = PER_WELL_TIMEOUT, retries: int = RETRIES,
+                           counts: Optional[dict] = None, http: Optional[web_fast.HttpPool] = None,
+                           fetch: str = "browser", base_url: Optional[str] = None) -> dict:
+    counts = counts if counts is not None else {}
+    base_url = base_url or BASE_URL
+    for attempt in range(retries + 1):
+        await limiter.acquire(base_url, PAGES_PER_WELL)
+        try:
+            if fetch != "browser":
                 try:
-                    await page.screenshot(path=f"fail_{safe_prefix}.png", full_page=True)
-                    html = await page.content()
-                    with open(f"fail_{safe_prefix}.html", "w", encoding="utf-8") as f:
-                        f.write(html)
-                except Exception:
-                    pass
+                    row = await fetch_http(http, well_name, api_num, base_url, per_well_timeout)
+                except (asyncio.TimeoutError, OSError):
+                    if fetch == "http":
+                        raise
+                    row = None
+                if row is not None:
+                    counts["http"] = counts.get("http", 0) + 1
+                    return row
+                if fetch == "http":
+                    return blank_row(well_name, api_num)
+                counts["fallback"] = counts.get("fallback", 0) + 1
+                await limiter.acquire(base_url, PAGES_PER_WELL)
+            row = await fetch_one(well_name, api_num, per_well_timeout=per_well_timeout, pool=pool, base_url=base_url)
+            counts["browser"] = counts.get("browser", 0) + 1
+            return row
+        except (asyncio.TimeoutError, PWTimeoutError, OSError):
+            if attempt == retries:
+                counts["timed_out"] = counts.get("timed_out", 0) + 1
+                print(f"[WARN] {well_name} ({api_num}): timed out or unreachable {retries + 1} times, left as N/A")
                 return blank_row(well_name, api_num)
-            finally:
-                if not page.is_closed(): await page.close()
-                await ctx.close(); await browser.close()
-
-    return await asyncio.wait_for(_inner(), timeout=per_well_timeout)
-
-# iterate through the dataframe for each pair of well name and api and repeat above process
-async def run_to_dataframe(wells: List[Tuple[str, str]], per_well_timeout: float = PER_WELL_TIMEOUT) -> pd.DataFrame:
-    rows = []
-    for name, api in wells:
-        rows.append(await fetch_one(name, api, per_well_timeout=per_well_timeout))
-        
+            counts["retries"] = counts.get("retries", 0) + 1
+            await asyncio.sleep(BACKOFF_BASE * 2 ** attempt * random.uniform(0.5, 1.5))
+
+def _clock(secs: float) -> str:
+    m, s = divmod(int(secs), 60)
+    return f"{m // 60}:{m % 60:02d}:{s:02d}" if m >= 60 else f"{m}:{s:02d}"
+
+# scrape every (well_name, api) pair with `concurrency` workers sharing one
+# browser pool and one rate limiter; rows come back in input order
+async def run_to_dataframe(wells: List[Tuple[str, str]], per_well_timeout: float = PER_WELL_TIMEOUT,
+                           recycle_after: int = RECYCLE_AFTER, concurrency: int = CONCURRENCY,
+                           rate: float = RATE_PER_HOST, retries: int = RETRIES,
+                           progress_every: float = 10.0, fetch: str = "auto",
+                           base_url: Optional[str] = None) -> pd.DataFrame:
+    total = len(wells)
+    rows: List[Optional[dict]] = [None] * total
+    todo: asyncio.Queue = asyncio.Queue()
+    for i, (name, api) in enumerate(wells):
+        todo.put_nowait((i, name, api))
+    limiter = HostRateLimiter(rate)
+    counts = {"done": 0, "retries": 0, "timed_out": 0, "http": 0, "browser": 0, "fallback": 0}
+    http = web_fast.HttpPool(timeout=FAST_NAV_TIMEOUT / 1000, per_host=max(1, concurrency)) if fetch != "browser" else None
+    t0 = last = time.perf_counter()
+
+    def report(final: bool = False) -> None:
+        el = time.perf_counter() - t0
+        per_min = counts["done"] / el * 60 if el > 0 else 0.0
+        eta = (total - counts["done"]) / (per_min / 60) if per_min else 0.0
+        tag = "DONE" if final else "PROGRESS"
+        print(f"[{tag}] {counts['done']}/{total} wells in {_clock(el)} ({per_min:.1f} wells/min"
+              f"{'' if final else ', ETA ' + _clock(eta)}; retries={counts['retries']}, "
+              f"timed_out={counts['timed_out']})")
+
+    async def worker(pool: BrowserPool) -> None:
+        nonlocal last
+        while not todo.empty():
+            i, name, api = todo.get_nowait()
+            rows[i] = await fetch_with_retry(pool, limiter, name, api, per_well_timeout, retries, counts,
+                                             http=http, fetch=fetch, base_url=base_url)
+            counts["done"] += 1
+            if time.perf_counter() - last >= progress_every:
+                last = time.perf_counter()
+                report()
+
+    workers = max(1, min(concurrency, total))
+    try:
+        async with BrowserPool(size=workers, recycle_after=recycle_after, base_url=base_url) as pool:
+            await asyncio.gather(*(worker(pool) for _ in range(workers)))
+            st = pool.stats
+            if pool.started:
+                print(f"[BROWSER] contexts={st['contexts']}, recycled={st['recycled']}, failed={st['failed']}, "
+                      f"relaunched={st['relaunched']}, requests_blocked={st['blocked']}")
+    finally:
+        if http is not None:
+            http.close()
+    if fetch != "browser":
+        print(f"[FETCH] http={counts['http']}, browser={counts['browser']} (fallbacks={counts['fallback']}), "
+              f"http_requests={http.stats['requests']} over {http.stats['connections']} connections")
+    report(final=True)
+
     df = pd.DataFrame(rows)
     return df.reindex(columns=OUT_COLS)
 
-# final table contains well information from the webl
-web_df = asyncio.run(run_to_dataframe(well_list))
-web_df = web_df.replace("N/A", pd.NA)
-print(web_df.head())
-
-# convert this dataframe to a sql table
-cols_def = ", ".join(f"`{c}` TEXT" for c in web_df.columns)
-
-def to_str(x):
-    if x is None: return ""
-    if isinstance(x, float) and math.isnan(x): return ""
-    return str(x)
-
-rows = [tuple(to_str(v) for v in rec) for rec in web_df.itertuples(index=False, name=None)]
-
-placeholders = ", ".join(["%s"] * len(web_df.columns))
-colnames = ", ".join(f"`{c}`" for c in web_df.columns)
-insert_sql = f"INSERT INTO web_table ({colnames}) VALUES ({placeholders})"
-
-conn = mysql.connector.connect(
-    host=DB_HOST, port=DB_PORT, user=DB_USER, password=DB_PASS, database=DB_NAME
-)
-cur1 = conn.cursor(buffered=True)
-cur1.execute("DROP TABLE IF EXISTS web_table")
-cur1.execute(f"CREATE TABLE web_table ({cols_def})")
-conn.commit()
-cur1.close()
-       
-if rows:
-    cur2 = conn.cursor(buffered=True) 
-    cur2.executemany(insert_sql, rows)
-    conn.commit()
-cur2.close()
-
-
-# join the table of pdf information with the table of web information and store it as a new table
-cur3 = conn.cursor(buffered=True)
-cur3.execute("DROP TABLE IF EXISTS well_info") 
-sql = """
-    CREATE TABLE well_info AS
-    SELECT a.*, b.well_status, b.well_type, b.closest_city, b.oil_badge, b.gas_badge
+# convert the web dataframe to a sql table, then join the table of pdf information
+# with the table of web information and store it as a new table
+# (header columns listed explicitly: row_hash and MySQL's POINT location stay out)
+WELL_INFO_SQL = f"""
+    SELECT {', '.join('a.' + c for c in HEADER_COLS)},
+           b.well_status, b.well_type, b.closest_city, b.oil_badge, b.gas_badge
     FROM well_header AS a
     LEFT JOIN web_table AS b
         ON a.well_name = b.well_name AND a.api = b.api
 """
-cur3.execute(sql)
-conn.commit()
-cur3.close()
-
-cur4 = conn.cursor(buffered=True) 
-cur4.execute("SELECT * FROM well_info")
-for r in cur4:
-    print(r)
-cur4.close()
-conn.close()
-
 
+def to_str(x):
+    if x is None: return ""
+    if isinstance(x, float) and math.isnan(x): return ""
+    return str(x)
 
+def save_results(storage: Storage, web_df: pd.DataFrame) -> None:
+    rows = [tuple(to_str(v) for v in rec) for rec in web_df.itertuples(index=False, name=None)]
+    conn = storage.connect(init=False)
+    try:
+        storage.replace_table(conn, "web_table", list(web_df.columns), rows)
+        storage.create_table_as(conn, "well_info", WELL_INFO_SQL)
+        for r in storage.query(conn, "SELECT * FROM well_info"):
+            print(tuple(r.values()))
+    finally:
+        conn.close()
+
+def main():
+    ap = argparse.ArgumentParser("Scrape well status/type/production for every well_header row")
+    ap.add_argument("--backend", choices=BACKENDS, default=None, help="storage backend (default: $DB_BACKEND or mysql)")
+    ap.add_argument("--sqlite-path", default=None, help="database file for --backend sqlite (default: $SQLITE_PATH)")
+    ap.add_argument("--recycle-after", type=int, default=RECYCLE_AFTER,
+                    help=f"wells per browser context before it is replaced (default {RECYCLE_AFTER})")
+    ap.add_argument("--concurrency", type=int, default=CONCURRENCY,
+                    help=f"wells scraped at the same time (default {CONCURRENCY})")
+    ap.add_argument("--rate", type=float, default=RATE_PER_HOST,
+                    help=f"page loads per second per host, 0 = unlimited (default {RATE_PER_HOST})")
+    ap.add_argument("--retries", type=int, default=RETRIES,
+                    help=f"extra attempts for a well that timed out (default {RETRIES})")
+    ap.add_argument("--fetch", choices=FETCH_MODES, default="auto",
+                    help="auto: plain HTTP first, browser when it misses; http/browser: only that path (default auto)")
+    ap.add_argument("--base-url", default=BASE_URL,
+                    help="site to scrape, e.g. a scrape_fixture.py server (default %(default)s)")
+    args = ap.parse_args()
+    storage = get_storage(args.backend, args.sqlite_path)
+
+    # create a list contains all well name and API
+    df = read_table(storage)
+    well_list = list(zip(df["well_name"], df["api"]))
+
+    # final table contains well information from the web
+    web_df = asyncio.run(run_to_dataframe(well_list, recycle_after=args.recycle_after, concurrency=args.concurrency,
+                                          rate=args.rate, retries=max(0, args.retries), fetch=args.fetch,
+                                          base_url=args.base_url.rstrip("/")))
+    web_df = web_df.replace("N/A", pd.NA)
+    print(web_df.head())
+
+    save_results(storage, web_df)
+
+if __name__ == "__main__":
+    main()